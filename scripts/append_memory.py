@@ -9,6 +9,8 @@ Updates the memory JSON with:
 - Used jokes/phrases (extracted from content)
 - Content fingerprint (SHA256)
 
+Also records the post in the cross-workflow global index.
+
 Usage:
     python append_memory.py <workflow-name> <date> <title-slug> <markdown-file>
 
@@ -19,6 +21,7 @@ Example:
 import sys
 from pathlib import Path
 from memory_manager import BlogMemory
+from global_index import GlobalContentIndex
 
 
 def main():
@@ -53,6 +56,7 @@ def main():
     # Update memory
     memory = BlogMemory(workflow)
     memory.add_post(date, title_slug, content)
+    GlobalContentIndex().record(workflow, date, content)
     
     print(f"\n✅ Memory updated successfully!")
     print(f"\n📊 Current Memory Status:")
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Content Fingerprinting for GrumpiBlogged
+
+Locality-sensitive fingerprints for near-duplicate detection:
+- SimHash (64-bit) over normalized word shingles
+- Banded LSH index for sub-millisecond similarity lookups
+- Bloom filter for "ever used?" checks over years of history
+
+Unlike SHA256, two posts that differ only by a regenerated timestamp
+or a swapped opening line produce SimHashes a few bits apart.
+"""
+
+import base64
+import hashlib
+import math
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3
+
+# Numbers (dates, times, counts) are collapsed so regenerated
+# timestamps don't move the fingerprint
+_NUMBER_RE = re.compile(r'\d+(?:[.:,/-]\d+)*')
+_WORD_RE = re.compile(r'\w+')
+
+
+def _hash64(token: str) -> int:
+    """Stable 64-bit hash (Python's hash() is salted per process)"""
+    return int.from_bytes(
+        hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(),
+        'big'
+    )
+
+
+def normalize_text(text: str) -> List[str]:
+    """
+    Normalize text into a list of comparable words
+
+    Args:
+        text: Raw markdown content
+
+    Returns:
+        Lowercased words with numbers collapsed to '0'
+    """
+    return _WORD_RE.findall(_NUMBER_RE.sub('0', text.lower()))
+
+
+def shingles(words: List[str], size: int = SHINGLE_SIZE) -> Dict[str, int]:
+    """
+    Build word shingles with their frequencies
+
+    Args:
+        words: Normalized words
+        size: Words per shingle
+
+    Returns:
+        Mapping of shingle -> count
+    """
+    counts: Dict[str, int] = {}
+    if len(words) < size:
+        if words:
+            counts[' '.join(words)] = 1
+        return counts
+
+    for i in range(len(words) - size + 1):
+        shingle = ' '.join(words[i:i + size])
+        counts[shingle] = counts.get(shingle, 0) + 1
+    return counts
+
+
+def simhash(text: str) -> int:
+    """
+    Compute the 64-bit SimHash of text
+
+    Args:
+        text: Raw markdown content
+
+    Returns:
+        SimHash as an unsigned 64-bit integer
+    """
+    vector = [0] * SIMHASH_BITS
+
+    for shingle, weight in shingles(normalize_text(text)).items():
+        h = _hash64(shingle)
+        for bit in range(SIMHASH_BITS):
+            if h >> bit & 1:
+                vector[bit] += weight
+            else:
+                vector[bit] -= weight
+
+    value = 0
+    for bit, total in enumerate(vector):
+        if total > 0:
+            value |= 1 << bit
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return (a ^ b).bit_count()
+
+
+def similarity(a: int, b: int) -> float:
+    """SimHash similarity in [0, 1] (1.0 = identical fingerprints)"""
+    return 1.0 - hamming_distance(a, b) / SIMHASH_BITS
+
+
+def to_hex(value: int) -> str:
+    """Serialize a fingerprint for JSON storage"""
+    return f"{value:016x}"
+
+
+def from_hex(value: str) -> int:
+    """Parse a fingerprint stored with to_hex()"""
+    return int(value, 16)
+
+
+class SimHashIndex:
+    """
+    Banded LSH index over SimHash fingerprints.
+
+    The 64 bits are split into `bands` equal bands. Any two fingerprints
+    within (bands - 1) bits of each other agree on at least one band
+    (pigeonhole), so candidates are found with `bands` dict lookups
+    instead of a scan over the full history. Queries with a larger
+    distance budget are rejected; size the index with bands_for().
+    """
+
+    def __init__(self, bands: int = 8):
+        if SIMHASH_BITS % bands:
+            raise ValueError(f"bands must divide {SIMHASH_BITS}")
+
+        self.bands = bands
+        self.band_bits = SIMHASH_BITS // bands
+        self.band_mask = (1 << self.band_bits) - 1
+        self.buckets: Dict[Tuple[int, int], List[int]] = {}
+        self.keys: List[str] = []
+        self.values: List[int] = []
+
+    def _band_keys(self, value: int) -> Iterable[Tuple[int, int]]:
+        for band in range(self.bands):
+            yield band, (value >> (band * self.band_bits)) & self.band_mask
+
+    def add(self, key: str, value: int):
+        """
+        Add a fingerprint to the index
+
+        Args:
+            key: Identifier returned by query() (e.g. post date)
+            value: SimHash fingerprint
+        """
+        slot = len(self.values)
+        self.keys.append(key)
+        self.values.append(value)
+        for band_key in self._band_keys(value):
+            self.buckets.setdefault(band_key, []).append(slot)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def query(self, value: int, max_distance: int) -> List[Tuple[str, int]]:
+        """
+        Find indexed fingerprints within max_distance bits
+
+        Args:
+            value: SimHash fingerprint to look up
+            max_distance: Maximum Hamming distance to report
+
+        Returns:
+            List of (key, distance), closest first
+
+        Raises:
+            ValueError: If max_distance is beyond what the bands guarantee
+        """
+        if max_distance >= self.bands:
+            raise ValueError(
+                f"{self.bands} bands only guarantee recall within {self.bands - 1} bits, "
+                f"not {max_distance}; build the index with bands_for({max_distance})"
+            )
+
+        seen = set()
+        matches = []
+
+        for band_key in self._band_keys(value):
+            for slot in self.buckets.get(band_key, ()):
+                if slot in seen:
+                    continue
+                seen.add(slot)
+                distance = hamming_distance(value, self.values[slot])
+                if distance <= max_distance:
+                    matches.append((self.keys[slot], distance))
+
+        matches.sort(key=lambda m: m[1])
+        return matches
+
+    def nearest(self, value: int, max_distance: int) -> Optional[Tuple[str, int]]:
+        """Closest indexed fingerprint within max_distance bits, if any"""
+        matches = self.query(value, max_distance)
+        return matches[0] if matches else None
+
+
+def max_distance_for(threshold: float) -> int:
+    """
+    Convert a similarity threshold into a Hamming distance budget
+
+    Args:
+        threshold: Minimum similarity (0-1) that counts as a duplicate
+
+    Returns:
+        Largest Hamming distance still at or above the threshold
+    """
+    return int((1.0 - threshold) * SIMHASH_BITS)
+
+
+def bands_for(max_distance: int) -> int:
+    """
+    Fewest LSH bands that still find every pair within max_distance bits
+
+    Args:
+        max_distance: Hamming distance budget (see max_distance_for)
+
+    Returns:
+        Smallest divisor of SIMHASH_BITS greater than max_distance
+    """
+    for bands in range(max_distance + 1, SIMHASH_BITS + 1):
+        if SIMHASH_BITS % bands == 0:
+            return bands
+    raise ValueError(f"No band count covers {max_distance} bits")
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter with JSON-friendly serialization.
+
+    Answers "have we ever seen this?" for every fingerprint and joke
+    without keeping the items themselves. False positives happen at
+    roughly `error_rate` once `capacity` items are stored; false
+    negatives never do.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 20000,
+        error_rate: float = 0.01,
+        bits: Optional[bytes] = None,
+        count: int = 0
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray(bits) if bits else bytearray((self.num_bits + 7) // 8)
+        self.count = count
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str):
+        """Add an item to the filter"""
+        new = False
+        for pos in self._positions(item):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        for pos in self._positions(item):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                return False
+        return True
+
+    @property
+    def is_saturated(self) -> bool:
+        """True once more items are stored than the filter was sized for"""
+        return self.count > self.capacity
+
+    def to_dict(self) -> Dict:
+        """Serialize for JSON storage"""
+        return {
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "count": self.count,
+            "bits": base64.b64encode(zlib.compress(bytes(self.bits))).decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'BloomFilter':
+        """Load a filter saved with to_dict()"""
+        return cls(
+            capacity=data["capacity"],
+            error_rate=data["error_rate"],
+            bits=zlib.decompress(base64.b64decode(data["bits"])),
+            count=data.get("count", 0)
+        )
@@ -20,20 +20,36 @@ Pipeline:
 This is the culmination of everything we've built.
 """
 
+import argparse
 import asyncio
 import os
 import sys
+import tempfile
+import time
+from collections import Counter
 from datetime import datetime
 import pytz
 from pathlib import Path
+from typing import AsyncIterator, List, Optional
 
 # Add intelligence module to path
 sys.path.insert(0, str(Path(__file__).parent / 'intelligence'))
 
+from cassette import Cassette
+from crawl_store import CrawlStore, DEFAULT_STORE
+from embedding_cache import EmbeddingCache
+from graph_merge import merge_topic_graphs, merge_user_graphs
+from runtime import CrawlerRuntime
+from signal_stream import SignalPipeline
+from stage_graph import StageGraph
+from story_matcher import match_stories
+from trend_engine import TrendEngine
 from searxng_crawler import SearXNGCrawler
 from reddit_crawler import RedditGraphCrawler
 from hackernews_crawler import HackerNewsGraphCrawler
 from synthesis_engine import SynthesisEngine, IntelligenceReport
+from topic_clusters import TopicClusterer
+from vector_index import VectorIndex
 from visualization import IntelligenceVisualizer
 
 
@@ -42,8 +58,19 @@ class IntelligenceBlogGenerator:
     Master orchestrator for the complete intelligence blog pipeline.
     """
     
-    def __init__(self, ollama_api_key: str):
+    def __init__(
+        self,
+        ollama_api_key: str,
+        cassette: Optional[Cassette] = None,
+        store_path: Path = DEFAULT_STORE,
+        output_root: Path = Path("docs"),
+        link_identities: bool = False
+    ):
         self.ollama_api_key = ollama_api_key
+        self.store_path = store_path
+        self.output_root = output_root
+        # Same username on HN and Reddit = same person in the merged graph
+        self.link_identities = link_identities
         
         # Initialize components
         self.searxng_instances = [
@@ -61,6 +88,10 @@ class IntelligenceBlogGenerator:
             "ArtificialIntelligence",
             "learnmachinelearning"
         ]
+        
+        # One HTTP runtime (pooled connections, retries, circuit breakers,
+        # timings) shared by every crawler and the Ollama client
+        self.runtime = CrawlerRuntime(limit_per_host=20, cassette=cassette)
     
     async def run_full_pipeline(self) -> IntelligenceReport:
         """
@@ -73,35 +104,31 @@ class IntelligenceBlogGenerator:
         print("🚀 INTELLIGENCE PIPELINE STARTING")
         print("=" * 80)
         
-        # Phase 1: Parallel crawling
-        print("\n📡 PHASE 1: DISTRIBUTED CRAWLING")
-        print("-" * 80)
-        
-        intelligence_data = await self._crawl_all_sources()
-        
-        # Phase 2: Synthesis
-        print("\n✨ PHASE 2: INTELLIGENCE SYNTHESIS")
-        print("-" * 80)
-        
-        report = await self._synthesize_intelligence(intelligence_data)
-        
-        # Phase 3: Visualization
-        print("\n📊 PHASE 3: VISUALIZATION GENERATION")
-        print("-" * 80)
-        
-        visualizations = await self._create_visualizations(intelligence_data)
-        
-        # Phase 4: Blog post generation
-        print("\n📝 PHASE 4: BLOG POST GENERATION")
-        print("-" * 80)
-        
-        blog_post = await self._generate_blog_post(report, visualizations)
+        # Visualization only needs the crawl, so it runs alongside synthesis
+        graph = StageGraph(announce="\n{}\n" + "-" * 80)
+        graph.add('crawl', self._crawl_all_sources,
+                  description="📡 PHASE 1: DISTRIBUTED CRAWLING")
+        graph.add('report', lambda crawl: self._synthesize_intelligence(crawl),
+                  deps=('crawl',), description="✨ PHASE 2: INTELLIGENCE SYNTHESIS")
+        graph.add('visualizations', lambda crawl: self._create_visualizations(crawl),
+                  deps=('crawl',), description="📊 PHASE 3: VISUALIZATION GENERATION")
+        graph.add('blog_post', lambda report, visualizations: self._generate_blog_post(report, visualizations),
+                  deps=('report', 'visualizations'), description="📝 PHASE 4: BLOG POST GENERATION")
+        
+        async with self.runtime:
+            results = await graph.run()
+            
+            print("\n⏱️  HTTP timings:")
+            self.runtime.print_metrics()
+        
+        print("\n⏱️  Pipeline stages (* = critical path):")
+        graph.print_timings()
         
         print("\n" + "=" * 80)
         print("✅ PIPELINE COMPLETE!")
-        print(f"   Blog post: {blog_post}")
+        print(f"   Blog post: {results['blog_post']}")
         
-        return report
+        return results['report']
     
     async def _crawl_all_sources(self) -> dict:
         """
@@ -113,40 +140,42 @@ class IntelligenceBlogGenerator:
         - Ensures we always have data to analyze
         """
 
-        # Create crawlers
-        searxng = SearXNGCrawler(self.searxng_instances)
-        reddit = RedditGraphCrawler(self.ai_subreddits)
-        hackernews = HackerNewsGraphCrawler()
+        # Create crawlers (sharing one on-disk cache so reruns only fetch
+        # what changed and interrupted runs resume)
+        store = CrawlStore(self.store_path)
+        searxng = SearXNGCrawler(self.searxng_instances, store=store, runtime=self.runtime)
+        reddit = RedditGraphCrawler(self.ai_subreddits, store=store, runtime=self.runtime)
+        hackernews = HackerNewsGraphCrawler(store=store, runtime=self.runtime)
 
-        # Parallel crawling
+        # Streaming crawl: every source feeds one bounded queue and
+        # signals are normalized, deduplicated, tagged and counted
+        # while the slower sources are still crawling
         print("🕷️  Launching parallel crawlers...")
 
-        results = await asyncio.gather(
-            self._crawl_searxng(searxng),
-            self._crawl_reddit(reddit),
-            self._crawl_hackernews(hackernews),
-            return_exceptions=True
-        )
+        pipeline = SignalPipeline()
+        pipeline.add_source('searxng', self._stream_searxng(searxng))
+        pipeline.add_source('reddit', self._stream_reddit(reddit))
+        pipeline.add_source('hackernews', self._stream_hackernews(hackernews))
 
-        # Combine results
-        all_signals = []
+        with store:
+            all_signals = await pipeline.run()
+            print(f"   💾 Crawl store: {store.hits} cache hits, {store.misses} misses")
+            store.prune()
+        pipeline.print_summary()
+
+        # Union every source's graphs (weights summed, topics normalized)
         graphs = {
-            'user_graph': None,
-            'topic_graph': None
+            'user_graph': merge_user_graphs(
+                {'reddit': reddit.user_graph, 'hackernews': hackernews.user_graph},
+                link_identities=self.link_identities
+            ),
+            'topic_graph': merge_topic_graphs([reddit.topic_graph, hackernews.topic_graph])
         }
-
-        for result in results:
-            if isinstance(result, Exception):
-                print(f"   ⚠️  Crawler failed: {result}")
-                continue
-
-            all_signals.extend(result.get('signals', []))
-
-            # Merge graphs (simplified - in production, use proper graph merging)
-            if result.get('user_graph'):
-                graphs['user_graph'] = result['user_graph']
-            if result.get('topic_graph'):
-                graphs['topic_graph'] = result['topic_graph']
+        print(
+            f"   🕸️  Merged graphs: {graphs['user_graph'].number_of_nodes()} users, "
+            f"{graphs['user_graph'].number_of_interactions()} interactions, "
+            f"{graphs['topic_graph'].number_of_nodes()} topics"
+        )
 
         print(f"\n✅ Crawling complete: {len(all_signals)} total signals")
 
@@ -154,116 +183,115 @@ class IntelligenceBlogGenerator:
         if len(all_signals) < 10:
             print(f"\n⚠️  Only {len(all_signals)} signals - using Ollama web search fallback...")
             fallback_signals = await self._web_search_fallback()
-            all_signals.extend(fallback_signals)
-            print(f"   ✅ Added {len(fallback_signals)} signals from web search")
+            added = [s for s in map(pipeline.process, fallback_signals) if s]
+            print(f"   ✅ Added {len(added)} signals from web search")
+
+        # Windowed trend detection against baselines from earlier runs
+        with CrawlStore(self.store_path) as trend_store:
+            emerging_trends = TrendEngine(trend_store).detect(all_signals)
+        print(f"   📈 {len(emerging_trends)} emerging trends")
+
+        cross_platform_stories = match_stories(all_signals)
+        print(f"   🔗 {len(cross_platform_stories)} cross-platform stories")
 
         return {
             'signals': all_signals,
             'total_signals': len(all_signals),
+            'topic_counts': pipeline.trends.top(),
+            'emerging_trends': emerging_trends,
+            'cross_platform_stories': cross_platform_stories,
             **graphs
         }
     
-    async def _crawl_searxng(self, crawler: SearXNGCrawler) -> dict:
-        """Crawl SearXNG for social media signals"""
+    async def _stream_searxng(self, crawler: SearXNGCrawler) -> AsyncIterator[dict]:
+        """Stream SearXNG social media signals"""
         
         print("   🔍 SearXNG: Searching social media...")
         
+        platforms = ['twitter', 'reddit', 'mastodon']
+        max_results = 100  # Per platform
+        per_platform = Counter()
+        
         async with crawler:
-            results = await crawler.search_social_media(
-                query="AI OR machine learning OR LLM OR local models",
-                platforms=['twitter', 'reddit', 'mastodon'],
+            async for post in crawler.stream_social_media(
+                topics=["AI", "machine learning", "LLM", "local models"],
+                platforms=platforms,
                 time_range="day",
-                max_results=100
-            )
-        
-        # Convert to signals
-        signals = []
-        for platform, posts in results.items():
-            for post in posts:
-                signals.append({
+                max_results=max_results
+            ):
+                platform = post['platform'] if post['platform'] in platforms else 'other'
+                if per_platform[platform] >= max_results:
+                    continue
+                per_platform[platform] += 1
+                
+                yield {
                     'source': platform,
                     'title': post['title'],
                     'url': post['url'],
                     'content': post['content'],
                     'engagement': post['engagement'],
-                    'timestamp': post.get('publishedDate', datetime.now())
-                })
+                    'timestamp': post.get('publishedDate') or datetime.now()
+                }
         
-        print(f"      ✅ Found {len(signals)} social media signals")
-        
-        return {'signals': signals}
+        print(f"      ✅ Found {sum(per_platform.values())} social media signals")
     
-    async def _crawl_reddit(self, crawler: RedditGraphCrawler) -> dict:
-        """Crawl Reddit for discussions"""
+    async def _stream_reddit(self, crawler: RedditGraphCrawler) -> AsyncIterator[dict]:
+        """Stream Reddit discussions as their comments arrive"""
         
         print("   🤖 Reddit: Crawling AI/ML subreddits...")
         
+        count = 0
         async with crawler:
-            posts = await crawler.crawl(
+            async for post in crawler.stream(
                 lookback_hours=24,
                 min_score=50,
                 include_comments=True,
                 max_posts_per_subreddit=50
-            )
-        
-        # Convert to signals
-        signals = []
-        for post in posts:
-            signals.append({
-                'source': 'reddit',
-                'title': post.title,
-                'url': post.permalink,
-                'content': post.selftext,
-                'engagement': {
-                    'upvotes': post.score,
-                    'comments': post.num_comments
-                },
-                'timestamp': post.created_utc
-            })
-        
-        print(f"      ✅ Found {len(signals)} Reddit posts")
-        
-        return {
-            'signals': signals,
-            'user_graph': crawler.user_graph,
-            'topic_graph': crawler.topic_graph
-        }
+            ):
+                count += 1
+                yield {
+                    'source': 'reddit',
+                    'title': post.title,
+                    'url': post.permalink,
+                    'link': None if post.is_self else post.url,
+                    'content': post.selftext,
+                    'engagement': {
+                        'upvotes': post.score,
+                        'comments': post.num_comments
+                    },
+                    'timestamp': post.created_utc
+                }
+        
+        print(f"      ✅ Found {count} Reddit posts")
     
-    async def _crawl_hackernews(self, crawler: HackerNewsGraphCrawler) -> dict:
-        """Crawl Hacker News for tech discussions"""
+    async def _stream_hackernews(self, crawler: HackerNewsGraphCrawler) -> AsyncIterator[dict]:
+        """Stream Hacker News stories as their comments arrive"""
         
         print("   📰 Hacker News: Searching AI/ML stories...")
         
+        count = 0
         async with crawler:
-            stories = await crawler.crawl(
+            async for story in crawler.stream(
                 lookback_hours=24,
                 min_points=50,
                 include_comments=True,
                 max_stories=50
-            )
-        
-        # Convert to signals
-        signals = []
-        for story in stories:
-            signals.append({
-                'source': 'hackernews',
-                'title': story.title,
-                'url': story.hn_url,
-                'content': story.text or '',
-                'engagement': {
-                    'points': story.points,
-                    'comments': story.num_comments
-                },
-                'timestamp': story.created_at
-            })
-        
-        print(f"      ✅ Found {len(signals)} HN stories")
-        
-        return {
-            'signals': signals,
-            'user_graph': crawler.user_graph,
-            'topic_graph': crawler.topic_graph
-        }
+            ):
+                count += 1
+                yield {
+                    'source': 'hackernews',
+                    'title': story.title,
+                    'url': story.hn_url,
+                    'link': story.url,
+                    'content': story.text or '',
+                    'engagement': {
+                        'points': story.points,
+                        'comments': story.num_comments
+                    },
+                    'timestamp': story.created_at
+                }
+        
+        print(f"      ✅ Found {count} HN stories")
     
     async def _web_search_fallback(self) -> List[dict]:
         """
@@ -279,7 +307,7 @@ class IntelligenceBlogGenerator:
 
         signals = []
 
-        async with OllamaCloudClient(self.ollama_api_key) as client:
+        async with OllamaCloudClient(self.ollama_api_key, runtime=self.runtime) as client:
             queries = [
                 "Latest AI and machine learning developments today",
                 "New LLM releases and local AI models",
@@ -316,26 +344,45 @@ class IntelligenceBlogGenerator:
 
         print("🧠 Synthesizing intelligence...")
 
-        engine = SynthesisEngine(self.ollama_api_key)
+        # Embeddings live next to the crawl store, so replays stay isolated
+        engine = SynthesisEngine(
+            self.ollama_api_key,
+            runtime=self.runtime,
+            embedding_cache=EmbeddingCache(self.store_path.parent / "embeddings"),
+            topic_clusterer=TopicClusterer(self.store_path.parent / "topic_clusters.npz"),
+            signal_index=VectorIndex(self.store_path.parent / "vector_index")
+        )
         report = await engine.synthesize(data)
 
         print(f"   ✅ Generated intelligence report")
         print(f"      Headline: {report.headline}")
         print(f"      Confidence: {report.confidence_score:.2%}")
+        print(f"   ⏱️  LLM calls:")
+        engine.ollama.print_metrics()
 
         return report
     
     async def _create_visualizations(self, data: dict) -> dict:
-        """Phase 3: Create interactive visualizations"""
+        """
+        Phase 3: Create interactive visualizations
+
+        Charts are optional: a failure here is reported and the post
+        goes out without them, rather than cancelling synthesis.
+        """
 
         print("📊 Creating visualizations...")
 
         visualizer = IntelligenceVisualizer(dark_mode=True)
 
         # Save to docs/assets/visualizations for Jekyll
-        output_dir = Path("docs/assets/visualizations")
+        output_dir = self.output_root / "assets" / "visualizations"
         output_dir.mkdir(parents=True, exist_ok=True)
-        saved_files = visualizer.save_all_visualizations(data, str(output_dir))
+        try:
+            # Plotting is CPU-bound; a thread keeps synthesis calls moving
+            saved_files = await asyncio.to_thread(visualizer.save_all_visualizations, data, str(output_dir))
+        except Exception as e:
+            print(f"   ⚠️  Visualization failed, posting without charts: {e}")
+            return {}
         
         print(f"   ✅ Created {len(saved_files)} visualizations")
         for viz_type, path in saved_files.items():
@@ -353,7 +400,7 @@ class IntelligenceBlogGenerator:
 
         # Save to docs/_posts for Jekyll
         timestamp = datetime.now().strftime("%Y-%m-%d")
-        posts_dir = Path("docs/_posts")
+        posts_dir = self.output_root / "_posts"
         posts_dir.mkdir(parents=True, exist_ok=True)
         filename = posts_dir / f"{timestamp}-intelligence-report.md"
 
@@ -411,6 +458,9 @@ description: "{report.summary[:160]}"
         # Cross-platform stories
         cross_platform_section = "## 🌐 Cross-Platform Stories\n\n"
         for story in report.cross_platform_stories[:5]:
+            # Signals are dicts; HN/Reddit link posts point at the story via 'link'
+            lead = story['signals'][0] if story['signals'] else {}
+            link = lead.get('link') or lead.get('url') or '#'
             cross_platform_section += f"""### {story['title']}
 
 **Platforms**: {', '.join(story['platforms'])}  
@@ -418,12 +468,20 @@ description: "{report.summary[:160]}"
 
 {story['synthesis']}
 
-[Read more]({story['signals'][0].url if story['signals'] else '#'})
+[Read more]({link})
 
 ---
 
 """
         
+        # Returning stories
+        recurring_section = ""
+        if report.recurring_stories:
+            recurring_section = "## 🔁 Back Again\n\n"
+            for story in report.recurring_stories[:5]:
+                recurring_section += f"- **{story['title']}** ({story['source']}) - first seen {story['first_seen']}\n"
+            recurring_section += "\n---\n\n"
+        
         # Predictions
         predictions_section = "## 🔮 Predictions\n\n"
         for pred in report.predictions:
@@ -439,9 +497,11 @@ description: "{report.summary[:160]}"
 """
         
         # Visualizations
-        viz_section = "## 📊 Interactive Visualizations\n\n"
-        for viz_type, path in visualizations.items():
-            viz_section += f"- [{viz_type.replace('_', ' ').title()}]({path})\n"
+        viz_section = ""
+        if visualizations:
+            viz_section = "## 📊 Interactive Visualizations\n\n"
+            for viz_type, path in visualizations.items():
+                viz_section += f"- [{viz_type.replace('_', ' ').title()}]({path})\n"
         
         # Combine all sections
         return (
@@ -449,6 +509,7 @@ description: "{report.summary[:160]}"
             summary_section +
             trends_section +
             cross_platform_section +
+            recurring_section +
             predictions_section +
             viz_section
         )
@@ -457,8 +518,47 @@ description: "{report.summary[:160]}"
 async def main():
     """Main entry point"""
 
+    parser = argparse.ArgumentParser(description="Run the intelligence blog pipeline")
+    parser.add_argument("--record", metavar="CASSETTE", help="Record all HTTP traffic to a cassette (.json.gz)")
+    parser.add_argument("--replay", metavar="CASSETTE", help="Run offline from a recorded cassette")
+    parser.add_argument("--latency", type=float, default=None,
+                        help="Replay: fixed latency per response in seconds (default: as recorded)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Replay: extra random latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Replay: fraction of requests that fail")
+    parser.add_argument("--seed", type=int, default=0, help="Replay: RNG seed for jitter and errors")
+    parser.add_argument("--link-identities", action="store_true",
+                        help="Treat the same username on HN and Reddit as one person in the user graph")
+    parser.add_argument("--output-root", help="Where posts/visualizations go (default: docs, or a temp dir when replaying)")
+    args = parser.parse_args()
+
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+
+    cassette = None
+    store_path = DEFAULT_STORE
+    output_root = Path(args.output_root) if args.output_root else Path("docs")
+
+    if args.replay:
+        cassette = Cassette(
+            args.replay,
+            mode='replay',
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            seed=args.seed
+        )
+        # Fresh crawl store and output dir so every replay is repeatable
+        scratch = Path(tempfile.mkdtemp(prefix="intelligence-replay-"))
+        store_path = scratch / "crawl_store.sqlite"
+        if not args.output_root:
+            output_root = scratch / "docs"
+    elif args.record:
+        cassette = Cassette(args.record, mode='record')
+
     # Get API key from environment (Ollama Cloud API for GitHub Actions)
     api_key = os.getenv('OLLAMA_CLOUD_API_KEY')
+    if args.replay:
+        api_key = api_key or 'replay'
 
     if not api_key:
         print("❌ Error: OLLAMA_CLOUD_API_KEY environment variable not set")
@@ -466,11 +566,21 @@ async def main():
         return 1
     
     # Run pipeline
-    generator = IntelligenceBlogGenerator(api_key)
+    generator = IntelligenceBlogGenerator(
+        api_key,
+        cassette=cassette,
+        store_path=store_path,
+        output_root=output_root,
+        link_identities=args.link_identities
+    )
     
     try:
+        started = time.perf_counter()
         report = await generator.run_full_pipeline()
         print("\n🎉 SUCCESS! Intelligence blog generated.")
+        print(f"   ⏱️  Wall time: {time.perf_counter() - started:.2f}s")
+        if args.replay:
+            print(f"   📼 Cassette: {cassette.stats}")
         return 0
     
     except Exception as e:
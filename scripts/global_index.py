@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Global Content Index - Cross-workflow duplicate and phrase guard
+
+Each workflow keeps its own memory file, so nothing stops the same
+phrase or a near-identical section from going out in two feeds on the
+same day. This index is shared by every workflow:
+- Post SimHashes (near-duplicate posts across feeds)
+- Section SimHashes (near-duplicate "## " sections across feeds)
+- Jokes/quoted phrases with the workflow and date that used them
+
+append_memory.py records published posts; should_post.py checks drafts
+against every other workflow in one lookup. Thresholds come from
+config/content_guard.json and can be overridden per workflow.
+
+Concurrency: record() takes an flock, which only serializes writers on
+one machine. The workflows run on separate runners and each commits
+and pushes the index file, so cross-runner writes are reconciled by
+git instead: .gitattributes routes global_index.json through
+merge_global_index.py (a three-way union of entries) when a push is
+rebased onto another feed's. No entry is lost, but a draft is only
+checked against the index as of its runner's checkout - two feeds
+posting in the same few minutes don't see each other.
+"""
+
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows - fall back to atomic rename only
+    fcntl = None
+
+from fingerprints import SimHashIndex, bands_for, simhash, to_hex, from_hex, max_distance_for
+from memory_manager import CONTENT_SCANNER, MEMORY_DIR, PROJECT_ROOT
+
+GLOBAL_INDEX_FILE = MEMORY_DIR / "global_index.json"
+GUARD_CONFIG_FILE = PROJECT_ROOT / "config" / "content_guard.json"
+
+# Sections shorter than this are boilerplate (headers, sign-offs)
+MIN_SECTION_CHARS = 300
+
+_SECTION_RE = re.compile(r'^##+\s+(.*)$', re.MULTILINE)
+
+DEFAULT_GUARD_CONFIG = {
+    "near_duplicate_threshold": 0.9,
+    "cross_workflow_threshold": 0.85,
+    "section_threshold": 0.9,
+    "phrase_window_days": 1,
+    "global_window_days": 30
+}
+
+
+def load_guard_config(workflow: str, config_file: Path = GUARD_CONFIG_FILE) -> Dict:
+    """
+    Load content guard thresholds for a workflow
+
+    Args:
+        workflow: Workflow name (e.g. 'ollama-pulse')
+        config_file: Path to content_guard.json
+
+    Returns:
+        Defaults merged with the workflow's overrides
+    """
+    config = dict(DEFAULT_GUARD_CONFIG)
+
+    if config_file.exists():
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            config.update(data.get("defaults", {}))
+            config.update(data.get("workflows", {}).get(workflow, {}))
+        except Exception as e:
+            print(f"⚠️  Error loading guard config: {e}")
+
+    return config
+
+
+def split_sections(content: str) -> List[Tuple[str, str]]:
+    """
+    Split markdown into (heading, body) sections on '##' headings
+
+    Args:
+        content: Markdown content
+
+    Returns:
+        Sections long enough to be worth fingerprinting
+    """
+    sections = []
+    matches = list(_SECTION_RE.finditer(content))
+
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        body = content[match.end():end].strip()
+        if len(body) >= MIN_SECTION_CHARS:
+            sections.append((match.group(1).strip(), body))
+
+    return sections
+
+
+class GlobalContentIndex:
+    """Shared fingerprint and phrase index across all blog workflows"""
+
+    def __init__(self, index_file: Path = GLOBAL_INDEX_FILE):
+        self.index_file = index_file
+        self.lock_file = index_file.with_suffix('.lock')
+        self.index = self._load_index()
+        # LSH indexes by (entry kind, workflow, max distance), reset
+        # whenever self.index is reloaded
+        self._lsh: Dict[Tuple[str, str, int], SimHashIndex] = {}
+
+    def _load_index(self) -> Dict:
+        """Load index from JSON file"""
+        empty = {"updated": None, "posts": [], "sections": [], "phrases": {}}
+
+        if not self.index_file.exists():
+            return empty
+
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return {**empty, **json.load(f)}
+        except Exception as e:
+            print(f"⚠️  Error loading global index: {e}")
+            return empty
+
+    @contextmanager
+    def _locked(self):
+        """Serialize writers on the same machine"""
+        if fcntl is None:
+            yield
+            return
+
+        with open(self.lock_file, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _save_index(self):
+        """Write index via temp file + rename so readers never see a partial file"""
+        self.index["updated"] = datetime.now().isoformat()
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.index_file.parent,
+            prefix=self.index_file.name,
+            suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, indent=2)
+            os.replace(tmp_path, self.index_file)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def _build_index(self, kind: str, workflow: str, max_distance: int) -> SimHashIndex:
+        """
+        LSH index over other workflows' entries, banded for max_distance
+
+        Built once per (kind, workflow, distance) for the life of the
+        object, so a long-lived guard doesn't rebuild it on every check.
+
+        Args:
+            kind: 'posts' or 'sections'
+            workflow: Workflow whose own entries are left out
+            max_distance: Distance budget the bands must cover
+        """
+        key = (kind, workflow, max_distance)
+        if key not in self._lsh:
+            index = SimHashIndex(bands_for(max_distance))
+            for entry in self.index[kind]:
+                if entry["workflow"] != workflow:
+                    index.add(f"{entry['workflow']} {entry['date']}", from_hex(entry["simhash"]))
+            self._lsh[key] = index
+        return self._lsh[key]
+
+    def check(
+        self,
+        content: str,
+        workflow: str,
+        date: Optional[str] = None,
+        config: Optional[Dict] = None
+    ) -> Tuple[bool, str]:
+        """
+        Check a draft against every other workflow
+
+        Args:
+            content: Markdown content to check
+            workflow: Workflow the draft belongs to (its own posts are skipped)
+            date: Draft date (YYYY-MM-DD), defaults to today
+            config: Guard thresholds (defaults to load_guard_config(workflow))
+
+        Returns:
+            (is_unique, reason)
+        """
+        config = config or load_guard_config(workflow)
+        date = date or datetime.now().strftime("%Y-%m-%d")
+
+        # Whole-post near-duplicates
+        post_distance = max_distance_for(config["cross_workflow_threshold"])
+        posts = self._build_index("posts", workflow, post_distance)
+        match = posts.nearest(simhash(content), post_distance)
+        if match:
+            return False, f"Near-duplicate of {match[0]} post"
+
+        # Section-level near-duplicates
+        section_distance = max_distance_for(config["section_threshold"])
+        sections = self._build_index("sections", workflow, section_distance)
+        for heading, body in split_sections(content):
+            match = sections.nearest(simhash(body), section_distance)
+            if match:
+                return False, f"Section '{heading}' duplicates a section from {match[0]}"
+
+        # Phrases used by another feed inside the window
+        cutoff = datetime.fromisoformat(date) - timedelta(days=config["phrase_window_days"])
+        for phrase in CONTENT_SCANNER.scan(content).jokes:
+            for other, used_on in self.index["phrases"].get(phrase, []):
+                if other != workflow and datetime.fromisoformat(used_on) > cutoff:
+                    return False, f"Phrase '{phrase}' already used by {other} on {used_on}"
+
+        return True, "No overlap with other workflows"
+
+    def record(
+        self,
+        workflow: str,
+        date: str,
+        content: str,
+        config: Optional[Dict] = None
+    ):
+        """
+        Record a published post and prune entries outside the window
+
+        Re-reads the index under a lock so concurrent appenders on the
+        same machine don't drop each other's entries (other runners'
+        entries are merged by git - see the module docstring).
+
+        Args:
+            workflow: Workflow name
+            date: Post date (YYYY-MM-DD)
+            content: Full markdown content
+            config: Guard thresholds (defaults to load_guard_config(workflow))
+        """
+        config = config or load_guard_config(workflow)
+
+        with self._locked():
+            self.index = self._load_index()
+
+            self.index["posts"].append({
+                "workflow": workflow,
+                "date": date,
+                "simhash": to_hex(simhash(content))
+            })
+            for heading, body in split_sections(content):
+                self.index["sections"].append({
+                    "workflow": workflow,
+                    "date": date,
+                    "heading": heading,
+                    "simhash": to_hex(simhash(body))
+                })
+            for phrase in CONTENT_SCANNER.scan(content).jokes:
+                self.index["phrases"].setdefault(phrase, []).append([workflow, date])
+
+            self._prune(date, config["global_window_days"])
+            self._save_index()
+            self._lsh = {}
+
+        print(f"✅ Global index updated for {workflow} ({len(self.index['posts'])} posts indexed)")
+
+    def _prune(self, date: str, window_days: int):
+        """Drop entries older than the retention window"""
+        cutoff = (datetime.fromisoformat(date) - timedelta(days=window_days)).strftime("%Y-%m-%d")
+
+        self.index["posts"] = [e for e in self.index["posts"] if e["date"] >= cutoff]
+        self.index["sections"] = [e for e in self.index["sections"] if e["date"] >= cutoff]
+
+        phrases = {}
+        for phrase, uses in self.index["phrases"].items():
+            uses = [use for use in uses if use[1] >= cutoff]
+            if uses:
+                phrases[phrase] = uses
+        self.index["phrases"] = phrases
+
+
+def _entry_key(entry: Dict) -> Tuple:
+    return (entry["workflow"], entry["date"], entry.get("heading"), entry["simhash"])
+
+
+def merge_indexes(base: Dict, ours: Dict, theirs: Dict) -> Dict:
+    """
+    Three-way merge of two index versions that diverged from base
+
+    Entries either side added are kept; entries either side removed
+    (pruned) since base stay removed. Order follows ours, then the
+    entries only theirs has.
+
+    Args:
+        base: Common ancestor (empty dict if there is none)
+        ours: Local version
+        theirs: Incoming version
+
+    Returns:
+        Merged index
+    """
+    merged = {"updated": max(filter(None, [ours.get("updated"), theirs.get("updated")]), default=None)}
+
+    for kind in ("posts", "sections"):
+        base_keys = {_entry_key(e) for e in base.get(kind, [])}
+        our_keys = {_entry_key(e) for e in ours.get(kind, [])}
+        their_keys = {_entry_key(e) for e in theirs.get(kind, [])}
+        removed = (base_keys - our_keys) | (base_keys - their_keys)
+
+        entries, seen = [], set()
+        for entry in ours.get(kind, []) + theirs.get(kind, []):
+            key = _entry_key(entry)
+            if key not in seen and key not in removed:
+                seen.add(key)
+                entries.append(entry)
+        merged[kind] = entries
+
+    phrases = {}
+    base_phrases, our_phrases, their_phrases = (
+        {phrase: {tuple(use) for use in uses} for phrase, uses in version.get("phrases", {}).items()}
+        for version in (base, ours, theirs)
+    )
+    for phrase in list(our_phrases) + [p for p in their_phrases if p not in our_phrases]:
+        base_uses = base_phrases.get(phrase, set())
+        ours_uses, theirs_uses = our_phrases.get(phrase, set()), their_phrases.get(phrase, set())
+        removed = (base_uses - ours_uses) | (base_uses - theirs_uses)
+        uses = sorted((ours_uses | theirs_uses) - removed, key=lambda use: (use[1], use[0]))
+        if uses:
+            phrases[phrase] = [list(use) for use in uses]
+    merged["phrases"] = phrases
+
+    return merged
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Content Guard CLI - Validate, check, record and publish in one process
+
+Replaces the should_post.py -> append_memory.py -> post_to_nostr.py chain
+(three interpreter cold starts, three memory JSON parses) with a single
+entry point that prints a machine-readable JSON result on stdout.
+Progress messages go to stderr.
+
+Usage:
+    python guard.py <markdown-file> <workflow-name> [options]
+    python guard.py --serve [--socket PATH]
+
+Options:
+    --commit            Record the post in memory + global index if it passes
+    --date YYYY-MM-DD   Post date the draft is checked and recorded for (default: today)
+    --slug SLUG         Title slug for --commit (default: <workflow>-<date>)
+    --publish           Broadcast to Nostr after committing (needs --pubkey
+                        and NOSTR_PRIVATE_KEY)
+    --pubkey KEY        Nostr public key
+    --serve             Run as a daemon on a Unix socket (one JSON request per line)
+    --socket PATH       Socket path (default: /tmp/grumpiblogged-guard.sock)
+
+Exit codes:
+    0 = Should post (and committed/published if requested)
+    1 = Should NOT post, publishing reached no relay, or an error occurred
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from memory_manager import BlogMemory
+from global_index import GlobalContentIndex, load_guard_config
+from should_post import validate_content
+
+DEFAULT_SOCKET = "/tmp/grumpiblogged-guard.sock"
+
+
+class ContentGuard:
+    """
+    Runs the full posting guard against cached memory state.
+
+    Memory and the global index are parsed once and reused until their
+    files change on disk, so a long-lived daemon only pays for JSON
+    parsing when another process has written to them.
+    """
+
+    def __init__(self):
+        self._memories: Dict[str, Tuple[int, BlogMemory]] = {}
+        self._global: Optional[Tuple[int, GlobalContentIndex]] = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _mtime(path: Path) -> int:
+        return path.stat().st_mtime_ns if path.exists() else 0
+
+    def _memory(self, workflow: str) -> BlogMemory:
+        """Cached BlogMemory, reloaded if the file changed"""
+        cached = self._memories.get(workflow)
+        if cached:
+            mtime, memory = cached
+            if mtime == self._mtime(memory.memory_file):
+                return memory
+
+        memory = BlogMemory(workflow)
+        self._memories[workflow] = (self._mtime(memory.memory_file), memory)
+        return memory
+
+    def _global_index(self) -> GlobalContentIndex:
+        """Cached GlobalContentIndex, reloaded if the file changed"""
+        if self._global:
+            mtime, index = self._global
+            if mtime == self._mtime(index.index_file):
+                return index
+
+        index = GlobalContentIndex()
+        self._global = (self._mtime(index.index_file), index)
+        return index
+
+    async def handle(self, request: Dict) -> Dict:
+        """
+        Run one guard request
+
+        Args:
+            request: {"file", "workflow", and optionally "commit", "date",
+                      "slug", "publish", "pubkey", "private_key"}
+
+        Returns:
+            Result dict with should_post, reason, committed, published
+            (ok, counts and per-relay outcomes) and per-stage timings
+            in milliseconds
+        """
+        async with self._lock:
+            with redirect_stdout(sys.stderr):
+                return await self._handle(request)
+
+    async def _handle(self, request: Dict) -> Dict:
+        timings = {}
+        started = time.perf_counter()
+
+        def lap(stage: str):
+            nonlocal started
+            now = time.perf_counter()
+            timings[stage] = round((now - started) * 1000, 2)
+            started = now
+
+        workflow = request["workflow"]
+        md_file = Path(request["file"])
+        date = request.get("date") or datetime.now().strftime("%Y-%m-%d")
+
+        result = {
+            "workflow": workflow,
+            "file": str(md_file),
+            "should_post": False,
+            "reason": "",
+            "committed": False,
+            "published": None,
+            "timings_ms": timings
+        }
+
+        # Refuse before committing anything: events signed without a
+        # real key are rejected by every relay
+        if request.get("publish") and not request.get("private_key"):
+            result["reason"] = "Publishing needs a private key (set NOSTR_PRIVATE_KEY)"
+            return result
+
+        try:
+            content = md_file.read_text(encoding='utf-8')
+        except Exception as e:
+            result["reason"] = f"Error reading file: {e}"
+            return result
+
+        # 1. Validation
+        is_valid, reason = validate_content(content)
+        lap("validate")
+        if not is_valid:
+            result["reason"] = f"Content validation failed: {reason}"
+            return result
+
+        # 2. Duplicate checks (own history, then other workflows)
+        config = load_guard_config(workflow)
+        memory = self._memory(workflow)
+        should_post, reason = memory.should_post(
+            content,
+            similarity_threshold=config["near_duplicate_threshold"],
+            date=date
+        )
+        if should_post:
+            should_post, reason = self._global_index().check(
+                content, workflow, date=date, config=config
+            )
+        lap("check")
+
+        result["should_post"] = should_post
+        result["reason"] = reason
+        if not should_post:
+            return result
+
+        # 3. Memory append
+        if request.get("commit"):
+            slug = request.get("slug") or f"{workflow}-{date}"
+            memory.add_post(date, slug, content)
+            self._memories[workflow] = (self._mtime(memory.memory_file), memory)
+
+            index = self._global_index()
+            index.record(workflow, date, content, config=config)
+            self._global = (self._mtime(index.index_file), index)
+
+            result["committed"] = True
+            lap("commit")
+
+        # 4. Optional publish
+        if request.get("publish"):
+            from post_to_nostr import publish_content
+
+            try:
+                published = await publish_content(
+                    content,
+                    workflow,
+                    request["pubkey"],
+                    request["private_key"]
+                )
+                relays = published["relay_results"]
+                result["published"] = {
+                    # Published = the article itself reached a relay
+                    "ok": any(events.get("article") == "success" for events in relays.values()),
+                    "successful": published["successful"],
+                    "failed": published["failed"],
+                    "relays": relays
+                }
+            except Exception as e:
+                result["published"] = {"ok": False, "error": str(e)}
+            lap("publish")
+
+        return result
+
+    async def serve(self, socket_path: str):
+        """
+        Serve guard requests on a Unix socket, one JSON object per line
+
+        Args:
+            socket_path: Filesystem path for the socket
+        """
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+        server = await asyncio.start_unix_server(self._serve_client, path=socket_path)
+        print(f"🛡️  Guard daemon listening on {socket_path}", file=sys.stderr)
+
+        async with server:
+            await server.serve_forever()
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.handle(json.loads(line))
+                except Exception as e:
+                    response = {"should_post": False, "reason": f"Error: {e}"}
+                writer.write((json.dumps(response) + "\n").encode('utf-8'))
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate, check, record and publish a blog post")
+    parser.add_argument("file", nargs="?", help="Path to generated markdown")
+    parser.add_argument("workflow", nargs="?", help="'ollama-pulse', 'ai-research-daily' or 'idea-vault'")
+    parser.add_argument("--commit", action="store_true", help="Record the post in memory if it passes")
+    parser.add_argument("--date", help="Post date (YYYY-MM-DD)")
+    parser.add_argument("--slug", help="URL-friendly title")
+    parser.add_argument("--publish", action="store_true", help="Broadcast to Nostr after committing (needs NOSTR_PRIVATE_KEY)")
+    parser.add_argument("--pubkey", help="Nostr public key")
+    parser.add_argument("--serve", action="store_true", help="Run as a Unix socket daemon")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Daemon socket path")
+    args = parser.parse_args()
+
+    guard = ContentGuard()
+
+    if args.serve:
+        asyncio.run(guard.serve(args.socket))
+        return
+
+    if not args.file or not args.workflow:
+        parser.print_usage(sys.stderr)
+        sys.exit(1)
+    if args.publish and not args.pubkey:
+        parser.error("--publish requires --pubkey")
+
+    result = asyncio.run(guard.handle({
+        "file": args.file,
+        "workflow": args.workflow,
+        "commit": args.commit,
+        "date": args.date,
+        "slug": args.slug,
+        "publish": args.publish,
+        "pubkey": args.pubkey,
+        "private_key": os.getenv("NOSTR_PRIVATE_KEY")
+    }))
+
+    print(json.dumps(result, indent=2))
+    published = result["published"]
+    sys.exit(0 if result["should_post"] and (published is None or published["ok"]) else 1)
+
+
+if __name__ == "__main__":
+    main()
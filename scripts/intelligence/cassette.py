@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+HTTP Cassettes - Record once, replay the intelligence pipeline offline
+
+Nothing in the pipeline runs without live HN, Reddit, SearXNG and Ollama
+Cloud, which makes performance work impossible to measure reliably.
+A cassette sits at the aiohttp session level (inside CrawlerRuntime):
+
+- record: real requests go out, and every response (status, headers,
+  body, elapsed time) is saved to a gzipped JSON file
+- replay: no network at all - responses are served from the file, with
+  configurable injected latency, jitter and error rate (seeded, so two
+  benchmark runs see the same failures)
+
+Requests are matched on method + URL + params + JSON body; if nothing
+matches exactly (e.g. a prompt containing today's date) the next
+recording for the same method + URL is served instead.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import random
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+
+def _request_key(method: str, url: str, params: Optional[Dict], body) -> str:
+    canonical = json.dumps(
+        [method.upper(), url, sorted((params or {}).items()), body],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _loose_key(method: str, url: str) -> str:
+    return f"{method.upper()} {url}"
+
+
+def _recorded_headers(headers) -> List[List[str]]:
+    """
+    Response headers as [name, value] pairs, keeping repeated headers
+    (Set-Cookie, Link) and dropping Content-Encoding: read() has already
+    decompressed the body
+    """
+    return [[k, v] for k, v in headers.items() if k.lower() != 'content-encoding']
+
+
+class CassetteResponse:
+    """Stand-in for aiohttp.ClientResponse built from a recording"""
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: Union[Dict[str, str], Iterable[Tuple[str, str]]],
+        body: bytes
+    ):
+        self.method = method
+        self.url = URL(url)
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: str = 'utf-8') -> str:
+        return self._body.decode(encoding)
+
+    async def json(self, **kwargs):
+        return json.loads(self._body) if self._body else None
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                request_info=aiohttp.RequestInfo(self.url, self.method, CIMultiDictProxy(CIMultiDict()), self.url),
+                history=(),
+                status=self.status,
+                message=f"Cassette response {self.status}",
+                headers=self.headers
+            )
+
+    def release(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class Cassette:
+    """
+    Recorded HTTP interactions plus replay settings.
+
+    Args:
+        path: Cassette file (.json.gz)
+        mode: 'record' or 'replay'
+        latency: Seconds added to every replayed response; None replays
+            the latency that was recorded
+        jitter: Extra random latency (0..jitter seconds) per response
+        error_rate: Fraction of replayed requests that fail
+        seed: RNG seed for jitter and injected errors
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        mode: str = 'replay',
+        latency: Optional[float] = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0
+    ):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.interactions: List[Dict] = []
+        self.stats = {'served': 0, 'loose_matches': 0, 'misses': 0, 'injected_errors': 0}
+
+        if mode == 'replay':
+            self._load()
+
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            self.interactions = json.load(f)['interactions']
+
+        # Each key replays its recordings in order, then keeps serving the last
+        self._exact = defaultdict(deque)
+        self._loose = defaultdict(deque)
+        for interaction in self.interactions:
+            self._exact[interaction['key']].append(interaction)
+            self._loose[interaction['loose_key']].append(interaction)
+
+    def save(self):
+        """Write recorded interactions (record mode)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            json.dump({
+                'recorded_at': datetime.now().isoformat(),
+                'interactions': self.interactions
+            }, f)
+        print(f"📼 Recorded {len(self.interactions)} interactions to {self.path}")
+
+    def wrap(self, session: aiohttp.ClientSession) -> 'CassetteSession':
+        """Wrap a real session so its requests go through the cassette"""
+        return CassetteSession(session, self)
+
+    @staticmethod
+    def _next(queue: deque) -> Dict:
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def lookup(self, method: str, url: str, params: Optional[Dict], body) -> Optional[Dict]:
+        """Find the recording to replay for a request"""
+        queue = self._exact.get(_request_key(method, url, params, body))
+        if queue:
+            return self._next(queue)
+
+        queue = self._loose.get(_loose_key(method, url))
+        if queue:
+            self.stats['loose_matches'] += 1
+            return self._next(queue)
+
+        return None
+
+
+class CassetteSession:
+    """
+    Session wrapper used by CrawlerRuntime when a cassette is active.
+
+    Only request() goes through the cassette; the wrapped session is
+    used for real traffic while recording.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, cassette: Cassette):
+        self.session = session
+        self.cassette = cassette
+
+    @property
+    def closed(self) -> bool:
+        return self.session.closed
+
+    async def close(self):
+        if self.cassette.mode == 'record':
+            self.cassette.save()
+        await self.session.close()
+
+    async def request(self, method: str, url: str, **kwargs):
+        if self.cassette.mode == 'record':
+            return await self._record(method, url, **kwargs)
+        return await self._replay(method, url, kwargs.get('params'), kwargs.get('json'))
+
+    async def _record(self, method: str, url: str, **kwargs) -> CassetteResponse:
+        params = kwargs.get('params')
+        body = kwargs.get('json')
+        started = time.monotonic()
+        async with self.session.request(method, url, **kwargs) as response:
+            content = await response.read()
+            status = response.status
+            headers = _recorded_headers(response.headers)
+
+        self.cassette.interactions.append({
+            'key': _request_key(method, url, params, body),
+            'loose_key': _loose_key(method, url),
+            'status': status,
+            'headers': headers,
+            'body': content.decode('utf-8', errors='replace'),
+            'elapsed': round(time.monotonic() - started, 4)
+        })
+        return CassetteResponse(method, url, status, headers, content)
+
+    async def _replay(self, method: str, url: str, params, body) -> CassetteResponse:
+        cassette = self.cassette
+        interaction = cassette.lookup(method, url, params, body)
+
+        delay = interaction['elapsed'] if interaction and cassette.latency is None else (cassette.latency or 0.0)
+        if cassette.jitter:
+            delay += cassette.random.uniform(0, cassette.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if cassette.error_rate and cassette.random.random() < cassette.error_rate:
+            cassette.stats['injected_errors'] += 1
+            raise aiohttp.ClientConnectionError(f"Injected cassette error for {method} {url}")
+
+        if interaction is None:
+            cassette.stats['misses'] += 1
+            return CassetteResponse(method, url, 404, {}, b'')
+
+        cassette.stats['served'] += 1
+        # Older cassettes stored headers as a dict; CIMultiDict takes either
+        return CassetteResponse(
+            method, url, interaction['status'], interaction['headers'],
+            interaction['body'].encode('utf-8')
+        )
+
+    def ws_connect(self, *args, **kwargs):
+        raise aiohttp.ClientConnectionError("WebSockets are not supported by cassettes")
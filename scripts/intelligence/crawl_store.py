@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Crawl Store - Persistent item cache and checkpoints for the crawlers
+
+Every nightly run used to start from nothing and re-download the same
+stories, posts and comment trees as the night before. The store keeps
+what was fetched in SQLite, keyed by (platform, item id) with a
+fetched-at timestamp, plus a small cursor table per source:
+
+- Crawlers write each item through as soon as it arrives, so an
+  interrupted crawl resumes from what it already has
+- Immutable items (comment trees whose comment count hasn't moved)
+  are reused; volatile fields (points, comment counts) are refreshed
+  once they are older than their refresh interval
+- Cursors record per-source progress (last completed crawl, current
+  run); items finished in the current run are checkpointed as one
+  row each rather than by rewriting the cursor
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_STORE = PROJECT_ROOT / "data" / "intelligence" / "crawl_store.sqlite"
+
+# Volatile fields (points, scores, comment counts) are refreshed after this
+REFRESH_AFTER = 6 * 3600
+
+# Cached comment trees are never trusted past this age
+MAX_ITEM_AGE = 7 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    platform   TEXT NOT NULL,
+    item_id    TEXT NOT NULL,
+    data       TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (platform, item_id)
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    source     TEXT PRIMARY KEY,
+    value      TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_items (
+    source  TEXT NOT NULL,
+    run_id  TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    PRIMARY KEY (source, run_id, item_id)
+);
+"""
+
+
+class CrawlStore:
+    """
+    SQLite-backed item cache shared by the crawlers.
+
+    Writes are committed immediately - the whole point is that a crawl
+    killed halfway through keeps everything it fetched.
+    """
+
+    def __init__(self, path: Path = DEFAULT_STORE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        # WAL + relaxed sync: per-item commits stay cheap, and a crash
+        # loses at most the last few items rather than corrupting the file
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self._runs: Dict[str, str] = {}  # Source -> run id begun by this process
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    def get(self, platform: str, item_id: Any, max_age: Optional[float] = None) -> Optional[Dict]:
+        """
+        Look up a cached item
+
+        Args:
+            platform: Namespace (e.g. 'hackernews-item', 'reddit-comments')
+            item_id: Platform item id
+            max_age: Treat items older than this many seconds as missing
+
+        Returns:
+            Stored data, or None if missing/stale
+        """
+        row = self.conn.execute(
+            "SELECT data, fetched_at FROM items WHERE platform = ? AND item_id = ?",
+            (platform, str(item_id))
+        ).fetchone()
+
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, platform: str, item_id: Any, data: Dict):
+        """Insert or replace an item, stamped with the current time"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO items (platform, item_id, data, fetched_at) VALUES (?, ?, ?, ?)",
+                (platform, str(item_id), json.dumps(data), time.time())
+            )
+
+    def get_cursor(self, source: str) -> Dict:
+        """Per-source cursor/checkpoint ({} if none yet)"""
+        row = self.conn.execute(
+            "SELECT value FROM cursors WHERE source = ?", (source,)
+        ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def set_cursor(self, source: str, value: Dict):
+        """Replace a source's cursor/checkpoint"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cursors (source, value, updated_at) VALUES (?, ?, ?)",
+                (source, json.dumps(value), time.time())
+            )
+
+    def prune(self, max_age: float = MAX_ITEM_AGE):
+        """Drop items nobody will trust again"""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM items WHERE fetched_at < ?", (time.time() - max_age,)
+            )
+
+    def begin_run(self, source: str, run_id: str) -> set:
+        """
+        Start (or resume) a crawl run
+
+        Args:
+            source: Crawler name
+            run_id: Identifies the run (e.g. the report date)
+
+        Returns:
+            Item ids already completed by an interrupted run with the same id
+        """
+        cursor = self.get_cursor(source)
+        self._runs[source] = run_id
+        if cursor.get("run_id") == run_id and not cursor.get("complete"):
+            rows = self.conn.execute(
+                "SELECT item_id FROM run_items WHERE source = ? AND run_id = ?", (source, run_id)
+            ).fetchall()
+            # Cursors written before run_items existed kept ids inline
+            done = {row[0] for row in rows} | set(cursor.get("done", []))
+            if done:
+                print(f"      ↩️  Resuming {source} run {run_id} ({len(done)} items done)")
+            return done
+
+        with self.conn:
+            self.conn.execute("DELETE FROM run_items WHERE source = ?", (source,))
+        self.set_cursor(source, {
+            "run_id": run_id,
+            "complete": False,
+            "last_complete": cursor.get("last_complete")
+        })
+        return set()
+
+    def mark_done(self, source: str, item_id: Any):
+        """Checkpoint one finished item in the current run (one row insert)"""
+        run_id = self._runs.get(source) or self.get_cursor(source).get("run_id")
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO run_items (source, run_id, item_id) VALUES (?, ?, ?)",
+                (source, run_id, str(item_id))
+            )
+
+    def end_run(self, source: str):
+        """Mark the current run complete"""
+        cursor = self.get_cursor(source)
+        cursor.pop("done", None)
+        cursor["complete"] = True
+        cursor["last_complete"] = time.time()
+        with self.conn:
+            self.conn.execute("DELETE FROM run_items WHERE source = ?", (source,))
+        self.set_cursor(source, cursor)
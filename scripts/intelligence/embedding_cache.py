@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Embedding Cache - Persistent, compact vector store for embeddings
+
+Most of what the pipeline embeds tonight (story titles, long-running
+threads) was embedded last night too. The cache keeps every vector,
+keyed by (model, text hash), so only new text goes to the API:
+
+- One .npz file per model: 16-byte blake2b text digests plus a
+  vector matrix
+- Vectors are stored as float16 (half the size of float32, ~3
+  significant digits) or int8 with a per-row scale (a quarter of the
+  size; cosine similarity to the original stays within ~1e-4)
+- New vectors accumulate in memory and are appended on save(); files
+  are replaced atomically so a crashed run can't corrupt them
+"""
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from crawl_store import DEFAULT_STORE
+
+DEFAULT_CACHE_DIR = DEFAULT_STORE.parent / "embeddings"
+
+DTYPES = ('float16', 'int8')
+
+
+def text_key(text: str) -> bytes:
+    """16-byte digest identifying a text"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class _ModelVectors:
+    """Vectors for one model: digests, stored rows and pending rows"""
+
+    def __init__(self, path: Path, dtype: str):
+        self.path = path
+        self.dtype = dtype
+        self.index: Dict[bytes, int] = {}
+        self.vectors: Optional[np.ndarray] = None  # Stored dtype
+        self.scales: Optional[np.ndarray] = None   # int8 only
+        self.pending: Dict[bytes, np.ndarray] = {}
+
+        if path.exists():
+            with np.load(path) as data:
+                keys = data['keys']
+                self.vectors = data['vectors']
+                self.scales = data['scales'] if 'scales' in data.files else None
+            self.index = {key.tobytes(): i for i, key in enumerate(keys)}
+
+    def _encode(self, matrix: np.ndarray):
+        if self.dtype == 'int8':
+            scales = np.abs(matrix).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            return np.round(matrix / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+        return matrix.astype(np.float16), None
+
+    def _decode(self, rows: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+        if scales is not None:
+            return rows.astype(np.float32) * scales[:, None]
+        return rows.astype(np.float32)
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        if key in self.pending:
+            return self.pending[key]
+        row = self.index.get(key)
+        if row is None:
+            return None
+        scales = self.scales[row:row + 1] if self.scales is not None else None
+        return self._decode(self.vectors[row:row + 1], scales)[0]
+
+    def put(self, keys: List[bytes], matrix: np.ndarray) -> np.ndarray:
+        """Add vectors; returns them as they will be read back"""
+        rows, scales = self._encode(np.asarray(matrix, dtype=np.float32))
+        decoded = self._decode(rows, scales)
+        for key, vector in zip(keys, decoded):
+            self.pending[key] = vector
+        return decoded
+
+    def save(self):
+        if not self.pending:
+            return
+
+        keys = list(self.pending)
+        rows, scales = self._encode(np.stack([self.pending[key] for key in keys]))
+        # (n, 16) uint8 rather than 'S16', which drops trailing NUL bytes
+        new_keys = np.frombuffer(b''.join(keys), dtype=np.uint8).reshape(-1, 16)
+
+        if self.vectors is not None and len(self.vectors):
+            old_keys = np.frombuffer(b''.join(self.index), dtype=np.uint8).reshape(-1, 16)
+            new_keys = np.concatenate([old_keys, new_keys])
+            rows = np.concatenate([self.vectors, rows])
+            if scales is not None:
+                scales = np.concatenate([self.scales, scales])
+
+        arrays = {'keys': new_keys, 'vectors': rows}
+        if scales is not None:
+            arrays['scales'] = scales
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp.npz')
+        np.savez(tmp, **arrays)
+        os.replace(tmp, self.path)
+
+        self.vectors, self.scales = rows, scales
+        self.index = {key.tobytes(): i for i, key in enumerate(new_keys)}
+        self.pending = {}
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache keyed by (model, text hash).
+
+    Args:
+        root: Directory holding one .npz file per model
+        dtype: 'float16' or 'int8' storage
+    """
+
+    def __init__(self, root: Path = DEFAULT_CACHE_DIR, dtype: str = 'float16'):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown embedding dtype: {dtype}")
+        self.root = Path(root)
+        self.dtype = dtype
+        self.models: Dict[str, _ModelVectors] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _model(self, model: str) -> _ModelVectors:
+        if model not in self.models:
+            slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', model)
+            self.models[model] = _ModelVectors(self.root / f"{slug}.{self.dtype}.npz", self.dtype)
+        return self.models[model]
+
+    def get(self, model: str, key: bytes) -> Optional[np.ndarray]:
+        """Cached float32 vector for a text digest, or None"""
+        vector = self._model(model).get(key)
+        if vector is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return vector
+
+    def put(self, model: str, keys: List[bytes], matrix: np.ndarray) -> np.ndarray:
+        """
+        Cache new vectors (persisted on save())
+
+        Returns:
+            The vectors as stored (float16/int8 rounding applied), so
+            a cold run and a warm run see identical values
+        """
+        return self._model(model).put(keys, matrix)
+
+    def save(self):
+        """Append pending vectors to each model's file"""
+        for vectors in self.models.values():
+            vectors.save()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Graph Merge - Combine per-source graphs into one intelligence picture
+
+Each crawler builds its own user interaction graph and topic graph.
+The pipeline used to keep whichever graph arrived last, discarding the
+rest. These helpers union them instead:
+- User graphs: usernames are namespaced per platform ('hackernews:pg')
+  unless identities are linked, and interaction weights are summed
+- Topic graphs: labels are normalized ('Stable Diffusion',
+  'stable-diffusion' and 'stable_diffusion' are one topic), node
+  counts and edge weights are summed
+
+Both run in time linear in the combined node + edge count.
+"""
+
+import re
+from typing import Dict, Iterable, Optional
+
+import networkx as nx
+
+from interaction_graph import InteractionGraph
+
+# Abbreviations folded into their long form
+TOPIC_ALIASES = {
+    'ml': 'machine-learning',
+    'rl': 'reinforcement-learning',
+    'llms': 'llm',
+    'embeddings': 'embedding',
+    'agents': 'agent',
+    'sd': 'stable-diffusion',
+    'nn': 'neural-network'
+}
+
+_SEPARATORS_RE = re.compile(r'[\s_/]+')
+
+
+def normalize_topic(label: str) -> str:
+    """
+    Canonical form of a topic label
+
+    Args:
+        label: Raw topic (e.g. 'Stable Diffusion', 'fine_tuning', 'ML')
+
+    Returns:
+        Lowercase, hyphen-separated label with aliases resolved
+    """
+    topic = _SEPARATORS_RE.sub('-', label.strip().lower()).strip('-')
+    return TOPIC_ALIASES.get(topic, topic)
+
+
+def merge_user_graphs(
+    graphs: Dict[str, InteractionGraph],
+    link_identities: bool = False,
+    identities: Optional[Dict[str, str]] = None
+) -> InteractionGraph:
+    """
+    Union user interaction graphs from several platforms
+
+    Args:
+        graphs: Platform name -> that platform's InteractionGraph
+        link_identities: Treat the same (case-insensitive) username on
+            different platforms as one person
+        identities: Explicit links, '<platform>:<username>' -> identity
+            (applied before link_identities)
+
+    Returns:
+        One InteractionGraph with summed edge weights
+    """
+    identities = identities or {}
+    merged = InteractionGraph()
+
+    for platform, graph in graphs.items():
+        def rename(name: str, platform=platform) -> str:
+            key = f"{platform}:{name}"
+            if key in identities:
+                return identities[key]
+            return name.lower() if link_identities else key
+
+        merged.absorb(graph, rename=rename)
+
+    return merged
+
+
+def merge_topic_graphs(graphs: Iterable[nx.Graph]) -> nx.Graph:
+    """
+    Union topic co-occurrence graphs with normalized labels
+
+    Args:
+        graphs: Topic graphs with 'count' node and 'weight' edge attributes
+
+    Returns:
+        Merged graph with counts and weights summed
+    """
+    merged = nx.Graph()
+
+    for graph in graphs:
+        for topic, data in graph.nodes(data=True):
+            label = normalize_topic(topic)
+            if label in merged:
+                merged.nodes[label]['count'] += data.get('count', 1)
+            else:
+                merged.add_node(label, count=data.get('count', 1))
+
+        for a, b, data in graph.edges(data=True):
+            a, b = normalize_topic(a), normalize_topic(b)
+            if a == b:
+                continue  # e.g. 'ml' and 'machine learning' on one post
+            weight = data.get('weight', 1)
+            if merged.has_edge(a, b):
+                merged[a][b]['weight'] += weight
+            else:
+                merged.add_edge(a, b, weight=weight)
+
+    return merged
@@ -11,16 +11,22 @@ discussion graph including:
 5. Cross-reference detection (same story on multiple platforms)
 
 Uses HN Algolia API for search + Firebase API for real-time data.
+Comment trees come from either Firebase (one request per comment, live)
+or Algolia's /items endpoint (whole tree in one request).
 """
 
 import asyncio
-import aiohttp
-from typing import List, Dict, Optional, Set
+from typing import AsyncIterator, List, Dict, Optional, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict
 import networkx as nx
 
+from crawl_store import CrawlStore, MAX_ITEM_AGE
+from interaction_graph import InteractionGraph
+from rate_limit import RateLimiter
+from runtime import CrawlerRuntime
+
 
 @dataclass
 class HNStory:
@@ -76,6 +82,16 @@ class HNComment:
     replies: List['HNComment'] = field(default_factory=list)
 
 
+@dataclass
+class CommentBudget:
+    """Per-story limits for comment tree crawling"""
+    max_depth: int = 3          # Deepest reply level (0 = top-level only)
+    max_nodes: int = 500        # Total comments fetched per story
+    max_seconds: float = 20.0   # Wall-clock budget per story
+    max_top_level: int = 50     # Top-level comments per story
+    max_replies: int = 10       # Replies followed per comment
+
+
 class HackerNewsGraphCrawler:
     """
     Advanced Hacker News crawler using both Algolia API (search)
@@ -85,11 +101,36 @@ class HackerNewsGraphCrawler:
     ALGOLIA_API = "https://hn.algolia.com/api/v1"
     FIREBASE_API = "https://hacker-news.firebaseio.com/v0"
     
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
+    def __init__(
+        self,
+        max_concurrency: int = 20,
+        max_parallel_stories: int = 10,
+        comment_budget: Optional[CommentBudget] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        comment_source: str = 'firebase',
+        store: Optional[CrawlStore] = None,
+        runtime: Optional[CrawlerRuntime] = None
+    ):
+        # Shared HTTP runtime (pooled connector, retries, circuit breakers,
+        # timings); a private one is created when none is passed in
+        self.runtime = runtime or CrawlerRuntime(limit_per_host=max_concurrency)
+        self.headers = {'User-Agent': 'GrumpiBlogged-Intelligence/2.0'}
+        
+        # Bounded worker pool for Firebase item requests, shared by all
+        # stories so max_concurrency is a global in-flight cap
+        self.max_concurrency = max_concurrency
+        self.max_parallel_stories = max_parallel_stories
+        self.comment_budget = comment_budget or CommentBudget()
+        self.rate_limiter = rate_limiter
+        self.comment_source = comment_source  # 'firebase' or 'algolia'
+        self._fetch_semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # Optional persistent cache - comment trees whose comment count
+        # hasn't changed since the last crawl are served from disk
+        self.store = store
         
         # Graph structures
-        self.user_graph = nx.DiGraph()  # User interaction graph
+        self.user_graph = InteractionGraph()  # User interaction graph
         self.topic_graph = nx.Graph()   # Topic co-occurrence
         
         # Caches
@@ -114,23 +155,20 @@ class HackerNewsGraphCrawler:
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers={'User-Agent': 'GrumpiBlogged-Intelligence/2.0'}
-        )
+        await self.runtime.__aenter__()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        await self.runtime.__aexit__(exc_type, exc_val, exc_tb)
     
     async def crawl(
         self,
         lookback_hours: int = 24,
         min_points: int = 50,
         include_comments: bool = True,
-        max_stories: int = 100
+        max_stories: int = 100,
+        comment_source: Optional[str] = None
     ) -> List[HNStory]:
         """
         Crawl Hacker News for AI/ML stories.
@@ -140,11 +178,43 @@ class HackerNewsGraphCrawler:
             min_points: Minimum story points
             include_comments: Whether to fetch comments
             max_stories: Maximum stories to return
+            comment_source: 'firebase' (per-item, live) or 'algolia'
+                (one request per story); defaults to self.comment_source
         
         Returns:
             List of HNStory objects
         """
         
+        stories = [
+            story async for story in self.stream(
+                lookback_hours=lookback_hours,
+                min_points=min_points,
+                include_comments=include_comments,
+                max_stories=max_stories,
+                comment_source=comment_source
+            )
+        ]
+        
+        # Sort by engagement score
+        stories.sort(key=lambda s: s.engagement_score, reverse=True)
+        
+        return stories
+    
+    async def stream(
+        self,
+        lookback_hours: int = 24,
+        min_points: int = 50,
+        include_comments: bool = True,
+        max_stories: int = 100,
+        comment_source: Optional[str] = None
+    ) -> AsyncIterator[HNStory]:
+        """
+        Yield AI/ML stories as soon as their comments are in.
+        
+        Takes the same arguments as crawl(). Stories are yielded in
+        completion order; the user and topic graphs grow as they go.
+        """
+        
         print("   🔄 Searching Hacker News for AI/ML stories...")
         
         # Search using Algolia API
@@ -156,26 +226,65 @@ class HackerNewsGraphCrawler:
         
         print(f"      ✅ Found {len(stories)} stories")
         
-        # Fetch comments if requested
-        if include_comments:
-            print("   🔄 Fetching comments...")
-            for story in stories[:max_stories]:  # Limit to avoid rate limits
+        # Keep the most engaging stories; they get their comments first
+        stories.sort(key=lambda s: s.engagement_score, reverse=True)
+        stories = stories[:max_stories]
+        
+        if not include_comments:
+            for story in stories:
+                self._build_topic_graph([story])
+                yield story
+            return
+        
+        comment_source = comment_source or self.comment_source
+        fetch_comments = {
+            'firebase': self._fetch_comments,
+            'algolia': self._fetch_comments_algolia
+        }[comment_source]
+        
+        print(f"   🔄 Fetching comments ({comment_source})...")
+        story_slots = asyncio.Semaphore(self.max_parallel_stories)
+        done_ids = set()
+        if self.store:
+            done_ids = self.store.begin_run('hackernews', datetime.now().strftime('%Y-%m-%d'))
+        
+        async def fetch_story_comments(story: HNStory):
+            cached = self._comments_unchanged(story, comment_source, done_ids)
+            async with story_slots:
                 try:
-                    comments = await self._fetch_comments(story.id)
-                    story.comments = comments
-                    
-                    # Build user graph
-                    self._build_user_graph(story, comments)
+                    return story, await fetch_comments(story.id, cached=cached), None
                 except Exception as e:
-                    print(f"      ⚠️  Failed to fetch comments for {story.id}: {e}")
+                    return story, [], e
         
-        # Build topic graph
-        self._build_topic_graph(stories)
+        tasks = [asyncio.ensure_future(fetch_story_comments(story)) for story in stories]
         
-        # Sort by engagement score
-        stories.sort(key=lambda s: s.engagement_score, reverse=True)
-        
-        return stories[:max_stories]
+        try:
+            # Build the graphs as each story completes
+            for next_done in asyncio.as_completed(tasks):
+                story, comments, error = await next_done
+                if error:
+                    print(f"      ⚠️  Failed to fetch comments for {story.id}: {error}")
+                else:
+                    story.comments = comments
+                    self._build_user_graph(story, comments)
+                    
+                    if self.store:
+                        self.store.put('hackernews-story', story.id, {
+                            'points': story.points,
+                            'num_comments': story.num_comments,
+                            'comment_source': comment_source
+                        })
+                        self.store.mark_done('hackernews', story.id)
+                
+                self._build_topic_graph([story])
+                yield story
+        finally:
+            # The consumer may stop early; don't leave fetches running
+            for task in tasks:
+                task.cancel()
+        
+        if self.store:
+            self.store.end_run('hackernews')
     
     async def _search_stories(
         self,
@@ -205,7 +314,7 @@ class HackerNewsGraphCrawler:
         
         url = f"{self.ALGOLIA_API}/search"
         
-        async with self.session.get(url, params=params) as response:
+        async with self.runtime.request('GET', url, params=params, headers=self.headers) as response:
             response.raise_for_status()
             data = await response.json()
         
@@ -263,69 +372,202 @@ class HackerNewsGraphCrawler:
             print(f"      ⚠️  Failed to parse story: {e}")
             return None
     
-    async def _fetch_comments(self, story_id: int, max_depth: int = 3) -> List[HNComment]:
-        """Fetch comments for a story using Firebase API"""
+    def _comments_unchanged(self, story: HNStory, comment_source: str, done_ids: Set[str]) -> bool:
+        """True if the stored comment tree for a story can be reused"""
         
-        # Get story item (includes comment IDs)
-        url = f"{self.FIREBASE_API}/item/{story_id}.json"
+        if not self.store:
+            return False
         
-        async with self.session.get(url) as response:
-            response.raise_for_status()
-            data = await response.json()
+        # Finished earlier in this (interrupted) run
+        if str(story.id) in done_ids:
+            return True
         
-        if not data or 'kids' not in data:
-            return []
+        record = self.store.get('hackernews-story', story.id, max_age=MAX_ITEM_AGE)
+        return (
+            record is not None and
+            record['comment_source'] == comment_source and
+            record['num_comments'] == story.num_comments
+        )
+    
+    async def _fetch_item(self, item_id: int, cached: bool = False) -> Optional[Dict]:
+        """Fetch a single Firebase item, bounded by the worker pool"""
+        
+        if cached:
+            data = self.store.get('hackernews-item', item_id)
+            if data is not None:
+                return data
+        
+        url = f"{self.FIREBASE_API}/item/{item_id}.json"
         
-        # Fetch top-level comments
-        comment_ids = data['kids']
-        comments = []
+        async with self._fetch_semaphore:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            async with self.runtime.request('GET', url, headers=self.headers) as response:
+                response.raise_for_status()
+                data = await response.json()
         
-        for comment_id in comment_ids[:50]:  # Limit to 50 top-level comments
-            comment = await self._fetch_comment(comment_id, depth=0, max_depth=max_depth)
-            if comment:
-                comments.append(comment)
+        if self.store and data:
+            self.store.put('hackernews-item', item_id, data)
         
-        return comments
+        return data
     
-    async def _fetch_comment(self, comment_id: int, depth: int, max_depth: int) -> Optional[HNComment]:
-        """Recursively fetch comment and its replies"""
+    async def _fetch_comments(
+        self,
+        story_id: int,
+        budget: Optional[CommentBudget] = None,
+        cached: bool = False
+    ) -> List[HNComment]:
+        """
+        Fetch a story's comment tree breadth-first using Firebase API.
         
-        if depth > max_depth:
-            return None
+        Each level is fetched concurrently (bounded by max_concurrency),
+        so a story costs roughly one round-trip per level instead of one
+        per comment. Stops early when the budget's depth, node count or
+        time limit is reached and returns whatever was fetched so far.
+        With cached=True, items are read from the crawl store first.
+        """
         
-        url = f"{self.FIREBASE_API}/item/{comment_id}.json"
+        budget = budget or self.comment_budget
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + budget.max_seconds
         
-        try:
-            async with self.session.get(url) as response:
-                response.raise_for_status()
-                data = await response.json()
+        # Get story item (includes comment IDs)
+        data = await self._fetch_item(story_id, cached=cached)
+        
+        if not data or 'kids' not in data:
+            return []
+        
+        roots: List[HNComment] = []
+        level = [(kid_id, None) for kid_id in data['kids'][:budget.max_top_level]]
+        fetched = 0
+        depth = 0
+        
+        while level and depth <= budget.max_depth:
+            level = level[:budget.max_nodes - fetched]
+            time_left = deadline - loop.time()
+            if not level or time_left <= 0:
+                break
             
-            if not data or data.get('deleted') or data.get('dead'):
-                return None
+            tasks = [
+                asyncio.ensure_future(self._fetch_item(comment_id, cached=cached))
+                for comment_id, _ in level
+            ]
+            done, pending = await asyncio.wait(tasks, timeout=time_left)
+            for task in pending:
+                task.cancel()
             
-            comment = HNComment(
-                id=comment_id,
-                author=data.get('by', 'unknown'),
-                text=data.get('text', ''),
-                created_at=datetime.fromtimestamp(data.get('time', 0)),
-                parent_id=data.get('parent', 0),
-                depth=depth
-            )
+            next_level = []
+            for (comment_id, parent), task in zip(level, tasks):
+                if task not in done or task.exception():
+                    continue
+                
+                item = task.result()
+                if not item or item.get('deleted') or item.get('dead'):
+                    continue
+                
+                comment = HNComment(
+                    id=comment_id,
+                    author=item.get('by', 'unknown'),
+                    text=item.get('text', ''),
+                    created_at=datetime.fromtimestamp(item.get('time', 0)),
+                    parent_id=item.get('parent', 0),
+                    depth=depth
+                )
+                
+                # Update user cache
+                self.user_cache[comment.author]['comments'] += 1
+                
+                if parent is None:
+                    roots.append(comment)
+                else:
+                    parent.replies.append(comment)
+                
+                # Queue replies for the next level
+                if depth < budget.max_depth:
+                    next_level.extend(
+                        (kid_id, comment) for kid_id in item.get('kids', [])[:budget.max_replies]
+                    )
             
-            # Update user cache
-            self.user_cache[comment.author]['comments'] += 1
+            fetched += len(level)
+            depth += 1
+            level = next_level
+        
+        return roots
+    
+    async def _fetch_comments_algolia(
+        self,
+        story_id: int,
+        budget: Optional[CommentBudget] = None,
+        cached: bool = False
+    ) -> List[HNComment]:
+        """
+        Fetch a story's whole comment tree in one request from Algolia.
+        
+        Algolia's /items/{id} returns the full nested tree; it is trimmed
+        locally to the same depth/node/reply limits as the Firebase mode.
+        Algolia's copy can lag live HN slightly, so use Firebase mode
+        when fresh deltas matter.
+        """
+        
+        budget = budget or self.comment_budget
+        url = f"{self.ALGOLIA_API}/items/{story_id}"
+        
+        async def fetch_tree() -> Dict:
+            async with self._fetch_semaphore:
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire()
+                async with self.runtime.request('GET', url, headers=self.headers) as response:
+                    response.raise_for_status()
+                    return await response.json()
+        
+        data = self.store.get('hackernews-tree', story_id) if cached else None
+        if data is None:
+            data = await asyncio.wait_for(fetch_tree(), timeout=budget.max_seconds)
+            if self.store:
+                self.store.put('hackernews-tree', story_id, data)
+        
+        roots: List[HNComment] = []
+        level = [(child, None) for child in data.get('children', [])[:budget.max_top_level]]
+        fetched = 0
+        depth = 0
+        
+        # Walk level by level so the node budget trims like Firebase mode
+        while level and depth <= budget.max_depth:
+            level = level[:budget.max_nodes - fetched]
+            next_level = []
             
-            # Fetch replies
-            if 'kids' in data:
-                for kid_id in data['kids'][:10]:  # Limit replies
-                    reply = await self._fetch_comment(kid_id, depth + 1, max_depth)
-                    if reply:
-                        comment.replies.append(reply)
+            for node, parent in level:
+                # Deleted/dead comments come back without author or text
+                if not node.get('author') or node.get('text') is None:
+                    continue
+                
+                comment = HNComment(
+                    id=node['id'],
+                    author=node['author'],
+                    text=node['text'],
+                    created_at=datetime.fromtimestamp(node.get('created_at_i', 0)),
+                    parent_id=node.get('parent_id', 0),
+                    depth=depth
+                )
+                
+                # Update user cache
+                self.user_cache[comment.author]['comments'] += 1
+                
+                if parent is None:
+                    roots.append(comment)
+                else:
+                    parent.replies.append(comment)
+                
+                if depth < budget.max_depth:
+                    next_level.extend(
+                        (child, comment) for child in node.get('children', [])[:budget.max_replies]
+                    )
             
-            return comment
+            fetched += len(level)
+            depth += 1
+            level = next_level
         
-        except Exception:
-            return None
+        return roots
     
     def _build_user_graph(self, story: HNStory, comments: List[HNComment]):
         """Build user interaction graph"""
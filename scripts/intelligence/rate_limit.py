@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting for Intelligence Crawlers
+
+Async rate limiters that can be shared by many concurrent crawl tasks
+(and by several crawlers hitting the same host), so that adding
+concurrency never means exceeding a platform's request budget.
+"""
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Minimum-interval limiter shared by concurrent tasks.
+
+    Callers are released one at a time, at least `min_interval` seconds
+    apart, in the order they called acquire().
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._next_time = 0.0
+
+    async def acquire(self):
+        """Wait until the next request slot is available"""
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_time > now:
+                await asyncio.sleep(self._next_time - now)
+                now = time.monotonic()
+            self._next_time = now + self.min_interval
+
+
+class TokenBucket:
+    """
+    Token-bucket limiter with burst capacity, shared by concurrent tasks.
+
+    Tokens refill at `rate` per second up to `capacity`, so short bursts
+    go out immediately and sustained traffic settles at `rate`. When a
+    server reports its own budget (X-Ratelimit-* headers), the bucket
+    clamps to what the server says is left and pauses until the window
+    resets once it runs out.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if self._paused_until > now:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def update_from_headers(self, headers):
+        """
+        Apply a server-reported budget
+
+        Args:
+            headers: Response headers; uses X-Ratelimit-Remaining and
+                     X-Ratelimit-Reset (seconds until the window resets)
+        """
+        try:
+            remaining = float(headers['X-Ratelimit-Remaining'])
+            reset = float(headers['X-Ratelimit-Reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens = min(self._tokens, remaining)
+        if remaining < 1:
+            self._paused_until = now + reset
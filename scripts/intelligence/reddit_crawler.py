@@ -14,14 +14,34 @@ No API key needed - we use Reddit's public JSON endpoints.
 """
 
 import asyncio
-import aiohttp
-from typing import List, Dict, Optional, Set
+import itertools
+from typing import AsyncIterator, List, Dict, Optional, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import networkx as nx
 from collections import defaultdict
 import re
 
+from crawl_store import CrawlStore, MAX_ITEM_AGE, REFRESH_AFTER
+from interaction_graph import InteractionGraph
+from rate_limit import TokenBucket
+from runtime import CrawlerRuntime
+
+# Reddit's public JSON endpoints allow roughly one request every 2 seconds
+# sustained; the host bucket allows short bursts on top of that
+REDDIT_RATE = 0.5
+REDDIT_BURST = 5
+
+# Comment fields kept in the crawl store (the raw JSON is ~20x larger)
+STORED_COMMENT_FIELDS = {'id', 'author', 'body', 'score', 'created_utc', 'parent_id'}
+
+# Per-endpoint budgets (requests/second, burst) inside the host budget, so
+# a large comment backlog can't starve listing fetches and vice versa
+ENDPOINT_BUDGETS = {
+    'listing': (0.5, 6),
+    'comments': (0.4, 4)
+}
+
 
 @dataclass
 class RedditPost:
@@ -80,12 +100,25 @@ class RedditGraphCrawler:
     of discussions, users, and communities.
     """
     
-    def __init__(self, subreddits: List[str]):
+    def __init__(
+        self,
+        subreddits: List[str],
+        max_in_flight: int = 4,
+        rate_limiter: Optional[TokenBucket] = None,
+        store: Optional[CrawlStore] = None,
+        runtime: Optional[CrawlerRuntime] = None
+    ):
         self.subreddits = subreddits
-        self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Shared HTTP runtime (pooled connector, retries, circuit breakers,
+        # timings); a private one is created when none is passed in
+        self.runtime = runtime or CrawlerRuntime()
+        self.headers = {
+            'User-Agent': 'GrumpiBlogged-Intelligence/2.0 (AI Research Aggregator; Contact: grumpiblogged@example.com)'
+        }
         
         # Graph structures
-        self.user_graph = nx.DiGraph()  # User interaction graph
+        self.user_graph = InteractionGraph()  # User interaction graph
         self.topic_graph = nx.Graph()   # Topic co-occurrence graph
         self.subreddit_graph = nx.Graph()  # Cross-subreddit graph
         
@@ -98,31 +131,43 @@ class RedditGraphCrawler:
             'subreddits': set()
         })
         
-        # Rate limiting
-        self.last_request_time = datetime.now()
-        self.min_request_interval = 2.0  # Reddit asks for 2 seconds between requests
+        # Rate limiting - one host bucket shared by every concurrent request
+        # (kept in sync with Reddit's X-Ratelimit-* headers), per-endpoint
+        # buckets inside it, plus a global cap on requests in flight
+        self.rate_limiter = rate_limiter or TokenBucket(REDDIT_RATE, REDDIT_BURST)
+        self.endpoint_limiters = {
+            endpoint: TokenBucket(rate, burst)
+            for endpoint, (rate, burst) in ENDPOINT_BUDGETS.items()
+        }
+        self.max_in_flight = max_in_flight
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        
+        # Optional persistent cache - comment trees are reused until their
+        # comment count moves or their scores are due a refresh
+        self.store = store
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers={
-                'User-Agent': 'GrumpiBlogged-Intelligence/2.0 (AI Research Aggregator; Contact: grumpiblogged@example.com)'
-            }
-        )
+        await self.runtime.__aenter__()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        await self.runtime.__aexit__(exc_type, exc_val, exc_tb)
+    
+    async def _rate_limit(self, endpoint: str):
+        """Enforce rate limiting (endpoint budget, then host budget)"""
+        await self.endpoint_limiters[endpoint].acquire()
+        await self.rate_limiter.acquire()
     
-    async def _rate_limit(self):
-        """Enforce rate limiting"""
-        elapsed = (datetime.now() - self.last_request_time).total_seconds()
-        if elapsed < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = datetime.now()
+    async def _get_json(self, url: str, params: Dict, endpoint: str) -> Dict:
+        """Rate-limited GET bounded by the in-flight cap"""
+        async with self._in_flight:
+            await self._rate_limit(endpoint)
+            async with self.runtime.request('GET', url, params=params, headers=self.headers) as response:
+                self.rate_limiter.update_from_headers(response.headers)
+                response.raise_for_status()
+                return await response.json()
     
     async def crawl(
         self,
@@ -144,48 +189,127 @@ class RedditGraphCrawler:
             List of RedditPost objects with full metadata
         """
         
+        all_posts = [
+            post async for post in self.stream(
+                lookback_hours=lookback_hours,
+                min_score=min_score,
+                include_comments=include_comments,
+                max_posts_per_subreddit=max_posts_per_subreddit
+            )
+        ]
+        
+        # Sort by engagement score
+        all_posts.sort(key=lambda p: p.engagement_score, reverse=True)
+        
+        return all_posts
+    
+    async def stream(
+        self,
+        lookback_hours: int = 24,
+        min_score: int = 50,
+        include_comments: bool = True,
+        max_posts_per_subreddit: int = 100
+    ) -> AsyncIterator[RedditPost]:
+        """
+        Yield posts as soon as their comments are in.
+        
+        Takes the same arguments as crawl(). Posts are yielded in
+        completion order; the graphs grow as they go, and the
+        cross-subreddit graph is built once every post is in.
+        """
+        
         all_posts = []
         
-        # Crawl each subreddit
-        for subreddit in self.subreddits:
+        async def crawl_one(subreddit: str):
             print(f"   🔄 Crawling r/{subreddit}...")
-            
             try:
-                posts = await self._crawl_subreddit(
+                return subreddit, await self._crawl_subreddit(
                     subreddit=subreddit,
                     lookback_hours=lookback_hours,
                     min_score=min_score,
                     max_posts=max_posts_per_subreddit
-                )
-                
-                # Fetch comments if requested
-                if include_comments:
+                ), None
+            except Exception as e:
+                return subreddit, [], e
+        
+        # Comment fetches are queued by engagement so the most discussed
+        # posts get their comments first whatever subreddit they came from
+        comment_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        order = itertools.count()
+        done_ids = set()
+        if self.store and include_comments:
+            done_ids = self.store.begin_run('reddit', datetime.now().strftime('%Y-%m-%d'))
+        
+        # Finished posts wait here for the consumer; bounded, so a slow
+        # consumer holds up the comment workers instead of piling up posts
+        ready: asyncio.Queue = asyncio.Queue(maxsize=self.max_in_flight * 2)
+        
+        async def comment_worker():
+            while True:
+                _, _, post = await comment_queue.get()
+                try:
+                    comments = await self._fetch_comments(post, cached=post.id in done_ids)
+                except Exception as e:
+                    print(f"      ⚠️  Failed to fetch comments for {post.id}: {e}")
+                else:
+                    # Build user interaction graph as each post's comments arrive
+                    post.comments = comments
+                    self._build_user_graph(post, comments)
+                    if self.store:
+                        self.store.mark_done('reddit', post.id)
+                # Posts whose comments failed are still signals
+                await ready.put(post)
+                comment_queue.task_done()
+        
+        listings = []
+        
+        async def crawl_listings():
+            try:
+                # Crawl all subreddits concurrently; start fetching a subreddit's
+                # comments as soon as its listings are in
+                listings.extend(asyncio.ensure_future(crawl_one(s)) for s in self.subreddits)
+                for next_done in asyncio.as_completed(listings):
+                    subreddit, posts, error = await next_done
+                    if error:
+                        print(f"      ❌ Failed to crawl r/{subreddit}: {error}")
+                        continue
+                    
+                    print(f"      ✅ Found {len(posts)} posts in r/{subreddit}")
+                    
                     for post in posts:
-                        try:
-                            comments = await self._fetch_comments(post)
-                            post.comments = comments
-                            
-                            # Build user interaction graph from comments
-                            self._build_user_graph(post, comments)
-                        except Exception as e:
-                            print(f"      ⚠️  Failed to fetch comments for {post.id}: {e}")
-                
-                all_posts.extend(posts)
-                print(f"      ✅ Found {len(posts)} posts")
+                        if include_comments:
+                            comment_queue.put_nowait((-post.engagement_score, next(order), post))
+                        else:
+                            await ready.put(post)
                 
+                if include_comments:
+                    await comment_queue.join()
             except Exception as e:
-                print(f"      ❌ Failed to crawl r/{subreddit}: {e}")
-        
-        # Build topic graph
-        self._build_topic_graph(all_posts)
+                print(f"      ❌ Reddit crawl failed: {e}")
+            await ready.put(None)
+        
+        workers = []
+        if include_comments:
+            workers = [asyncio.ensure_future(comment_worker()) for _ in range(self.max_in_flight)]
+        producer = asyncio.ensure_future(crawl_listings())
+        
+        try:
+            while (post := await ready.get()) is not None:
+                all_posts.append(post)
+                self._build_topic_graph([post])
+                yield post
+        finally:
+            # The consumer may stop early; don't leave fetches running
+            tasks = [producer, *listings, *workers]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if self.store and include_comments:
+            self.store.end_run('reddit')
         
         # Build cross-subreddit graph
         self._build_subreddit_graph(all_posts)
-        
-        # Sort by engagement score
-        all_posts.sort(key=lambda p: p.engagement_score, reverse=True)
-        
-        return all_posts
     
     async def _crawl_subreddit(
         self,
@@ -196,87 +320,127 @@ class RedditGraphCrawler:
     ) -> List[RedditPost]:
         """Crawl a single subreddit"""
         
-        posts = []
+        candidates: Dict[str, Dict] = {}
         cutoff_time = datetime.now() - timedelta(hours=lookback_hours)
         
         # Try multiple sorting methods to get diverse content
-        for sort in ['hot', 'new', 'top']:
-            await self._rate_limit()
+        sorts = ['hot', 'new', 'top']
+        
+        async def fetch_listing(sort: str) -> Optional[Dict]:
+            url = f"https://www.reddit.com/r/{subreddit}/{sort}.json"
+            params = {'limit': 100}
+            
+            if sort == 'top':
+                params['t'] = 'day' if lookback_hours <= 24 else 'week'
             
             try:
-                url = f"https://www.reddit.com/r/{subreddit}/{sort}.json"
-                params = {'limit': 100}
-                
-                if sort == 'top':
-                    params['t'] = 'day' if lookback_hours <= 24 else 'week'
-                
-                async with self.session.get(url, params=params) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                
-                # Parse posts
-                for item in data['data']['children']:
-                    post_data = item['data']
-                    
-                    # Parse timestamp
-                    created = datetime.fromtimestamp(post_data['created_utc'])
-                    
-                    # Filter by time and score
-                    if created < cutoff_time:
-                        continue
-                    if post_data['score'] < min_score:
-                        continue
-                    
-                    # Create post object
-                    post = RedditPost(
-                        id=post_data['id'],
-                        subreddit=post_data['subreddit'],
-                        title=post_data['title'],
-                        selftext=post_data.get('selftext', ''),
-                        author=post_data['author'],
-                        score=post_data['score'],
-                        upvote_ratio=post_data.get('upvote_ratio', 0.5),
-                        num_comments=post_data['num_comments'],
-                        created_utc=created,
-                        url=post_data['url'],
-                        permalink=f"https://reddit.com{post_data['permalink']}",
-                        flair=post_data.get('link_flair_text'),
-                        awards=post_data.get('total_awards_received', 0),
-                        is_self=post_data['is_self'],
-                        domain=post_data.get('domain', '')
-                    )
-                    
-                    # Avoid duplicates
-                    if post.id not in self.post_cache:
-                        self.post_cache[post.id] = post
-                        posts.append(post)
-                        
-                        # Update user cache
-                        self.user_cache[post.author]['posts'] += 1
-                        self.user_cache[post.author]['total_score'] += post.score
-                        self.user_cache[post.author]['subreddits'].add(subreddit)
-                
+                return await self._get_json(url, params, 'listing')
             except Exception as e:
                 print(f"      ⚠️  Failed to fetch {sort} posts: {e}")
+                return None
         
-        return posts[:max_posts]
-    
-    async def _fetch_comments(self, post: RedditPost, max_depth: int = 3) -> List[RedditComment]:
-        """Fetch comments for a post"""
+        listings = await asyncio.gather(*(fetch_listing(sort) for sort in sorts))
         
-        await self._rate_limit()
+        # hot/new/top mostly overlap - dedup raw listing entries by id
+        # (and against other subreddits) before building any posts
+        for data in listings:
+            if not data:
+                continue
+            
+            for item in data['data']['children']:
+                post_data = item['data']
+                if post_data['id'] in self.post_cache:
+                    continue
+                
+                seen = candidates.get(post_data['id'])
+                if seen is None or post_data['score'] > seen['score']:
+                    candidates[post_data['id']] = post_data
         
-        url = f"https://www.reddit.com{post.permalink}.json"
+        posts = []
+        for post_data in candidates.values():
+            # Parse timestamp
+            created = datetime.fromtimestamp(post_data['created_utc'])
+            
+            # Filter by time and score
+            if created < cutoff_time:
+                continue
+            if post_data['score'] < min_score:
+                continue
+            
+            # Create post object
+            posts.append(RedditPost(
+                id=post_data['id'],
+                subreddit=post_data['subreddit'],
+                title=post_data['title'],
+                selftext=post_data.get('selftext', ''),
+                author=post_data['author'],
+                score=post_data['score'],
+                upvote_ratio=post_data.get('upvote_ratio', 0.5),
+                num_comments=post_data['num_comments'],
+                created_utc=created,
+                url=post_data['url'],
+                permalink=f"https://reddit.com{post_data['permalink']}",
+                flair=post_data.get('link_flair_text'),
+                awards=post_data.get('total_awards_received', 0),
+                is_self=post_data['is_self'],
+                domain=post_data.get('domain', '')
+            ))
+        
+        # Keep the most engaging posts, then register them
+        posts.sort(key=lambda p: p.engagement_score, reverse=True)
+        posts = posts[:max_posts]
         
-        async with self.session.get(url, params={'limit': 500}) as response:
-            response.raise_for_status()
-            data = await response.json()
+        for post in posts:
+            self.post_cache[post.id] = post
+            
+            # Update user cache
+            self.user_cache[post.author]['posts'] += 1
+            self.user_cache[post.author]['total_score'] += post.score
+            self.user_cache[post.author]['subreddits'].add(subreddit)
         
-        # Reddit returns [post_data, comments_data]
-        if len(data) < 2:
-            return []
+        return posts
+    
+    async def _fetch_comments(
+        self,
+        post: RedditPost,
+        max_depth: int = 3,
+        cached: bool = False
+    ) -> List[RedditComment]:
+        """
+        Fetch comments for a post
         
-        comments_data = data[1]['data']['children']
+        With a crawl store, the stored tree is reused while the post's
+        comment count is unchanged and its scores are younger than
+        REFRESH_AFTER (or unconditionally with cached=True, for posts
+        finished earlier in an interrupted run).
+        """
+        
+        comments_data = None
+        if self.store:
+            record = self.store.get(
+                'reddit-comments',
+                post.id,
+                max_age=MAX_ITEM_AGE if cached else REFRESH_AFTER
+            )
+            if record and (cached or record['num_comments'] == post.num_comments):
+                comments_data = record['children']
+        
+        if comments_data is None:
+            url = f"https://www.reddit.com{post.permalink}.json"
+            
+            data = await self._get_json(url, {'limit': 500}, 'comments')
+            
+            # Reddit returns [post_data, comments_data]
+            if len(data) < 2:
+                return []
+            
+            comments_data = data[1]['data']['children']
+            
+            if self.store:
+                self.store.put('reddit-comments', post.id, {
+                    'num_comments': post.num_comments,
+                    'children': self._slim_comments(comments_data)
+                })
         
         # Parse comment tree
         comments = []
@@ -290,6 +454,23 @@ class RedditGraphCrawler:
         
         return comments
     
+    def _slim_comments(self, children: List[Dict]) -> List[Dict]:
+        """Strip a raw comment listing down to the fields _parse_comment reads"""
+        
+        slim = []
+        for item in children:
+            if item['kind'] != 't1':
+                continue
+            
+            data = {k: v for k, v in item['data'].items() if k in STORED_COMMENT_FIELDS}
+            replies = item['data'].get('replies')
+            if replies and isinstance(replies, dict):
+                data['replies'] = {'data': {'children': self._slim_comments(replies['data']['children'])}}
+            
+            slim.append({'kind': 't1', 'data': data})
+        
+        return slim
+    
     def _parse_comment(self, data: Dict, depth: int, max_depth: int) -> Optional[RedditComment]:
         """Recursively parse comment tree"""
         
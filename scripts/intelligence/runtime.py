@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Crawler Runtime - One HTTP stack for every intelligence source
+
+HN, Reddit, SearXNG and Ollama Cloud used to each open their own
+aiohttp.ClientSession with their own timeout and retry logic (or none).
+The runtime gives them one shared stack:
+- A pooled connector with DNS caching and per-host connection limits
+- Retry/backoff policies (Retry-After aware) for transient failures;
+  only idempotent methods are retried unless a call opts in, so a POST
+  (e.g. an Ollama generate call) is never silently sent twice
+- A circuit breaker per host, so a dead host fails fast
+- Per-host request timing histograms for performance work
+
+Crawlers take an optional `runtime`; without one they create a private
+runtime, so they keep working standalone. A runtime built with a
+cassette (see cassette.py) records or replays all of its traffic.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, float('inf'))
+
+# Methods that are safe to resend after a timeout or an error status (RFC 9110)
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'TRACE', 'PUT', 'DELETE'})
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Raised instead of sending a request to a host whose breaker is open"""
+
+
+@dataclass
+class RetryPolicy:
+    """How a request is retried on connection errors and retryable statuses"""
+    attempts: int = 3
+    backoff: float = 1.0        # First retry delay (seconds), doubled each time
+    max_backoff: float = 30.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before retry number `attempt` (0-based), with jitter"""
+        base = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return base * random.uniform(0.5, 1.0)
+
+
+# For callers that do their own failover (e.g. hedged SearXNG queries)
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    Opens after `failure_threshold` consecutive failures; after
+    `reset_after` seconds one trial request is let through (half-open)
+    and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_after: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return 'half-open'
+        return 'open'
+
+    def check(self, host: str):
+        """Raise CircuitOpenError unless a request may be sent"""
+        state = self.state
+        if state == 'half-open':
+            # One trial at a time (a cancelled trial expires after reset_after)
+            now = time.monotonic()
+            if self._trial_started is None or now - self._trial_started >= self.reset_after:
+                self._trial_started = now
+                return
+        if state != 'closed':
+            raise CircuitOpenError(f"Circuit open for {host}")
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_started = None
+        if self.failures >= self.failure_threshold or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+
+class LatencyHistogram:
+    """Fixed-bucket request timing histogram"""
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS_MS)
+        self.total = 0
+        self.errors = 0
+        self.sum_ms = 0.0
+
+    def observe(self, seconds: float, error: bool = False):
+        ms = seconds * 1000
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        self.total += 1
+        self.sum_ms += ms
+        if error:
+            self.errors += 1
+
+    def percentile(self, p: float) -> float:
+        """Upper bucket bound containing the p-th percentile (ms)"""
+        if not self.total:
+            return 0.0
+        rank = p / 100 * self.total
+        seen = 0
+        for count, bound in zip(self.counts, LATENCY_BUCKETS_MS):
+            seen += count
+            if seen >= rank:
+                return bound
+        return LATENCY_BUCKETS_MS[-1]
+
+    def summary(self) -> Dict:
+        return {
+            'requests': self.total,
+            'errors': self.errors,
+            'mean_ms': round(self.sum_ms / self.total, 1) if self.total else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'buckets': dict(zip((str(b) for b in LATENCY_BUCKETS_MS), self.counts))
+        }
+
+
+class CrawlerRuntime:
+    """
+    Shared HTTP runtime for all intelligence sources.
+
+    Usage:
+        async with CrawlerRuntime() as runtime:
+            async with runtime.request('GET', url, params=...) as response:
+                data = await response.json()
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        dns_ttl: int = 300,
+        timeout: float = 30.0,
+        retry: Optional[RetryPolicy] = None,
+        headers: Optional[Dict[str, str]] = None,
+        cassette=None
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.headers = headers or {'User-Agent': 'GrumpiBlogged-Intelligence/2.0'}
+        self.cassette = cassette  # Optional cassette.Cassette (record/replay)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._users = 0
+        self._lifecycle = asyncio.Lock()
+
+    async def __aenter__(self):
+        # Reference counted so several crawlers can share one runtime
+        # with their own `async with crawler:` blocks; the lock keeps a
+        # concurrent enter from racing a close in progress
+        async with self._lifecycle:
+            if self._users == 0:
+                await self.start()
+            self._users += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        async with self._lifecycle:
+            self._users -= 1
+            if self._users == 0:
+                await self.close()
+
+    async def start(self):
+        """Open the pooled session"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                use_dns_cache=True
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=self.headers
+            )
+            if self.cassette:
+                self.session = self.cassette.wrap(self.session)
+
+    async def close(self):
+        """Close the pooled session"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker()
+        return self.breakers[host]
+
+    def observe(self, host: str, seconds: float, error: bool = False):
+        """Record one request's timing"""
+        if host not in self.histograms:
+            self.histograms[host] = LatencyHistogram()
+        self.histograms[host].observe(seconds, error)
+
+    @asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        retry: Optional[RetryPolicy] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs
+    ):
+        """
+        Send a request through the breaker/retry/metrics stack
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            retry: Retry policy (default: the runtime's)
+            idempotent: Whether the request may be resent; defaults to
+                whether `method` is idempotent. Non-idempotent requests
+                (POST, PATCH) get a single attempt unless this is True.
+            **kwargs: Passed to aiohttp (params, json, headers, timeout...)
+
+        Yields:
+            The aiohttp response (released on exit). Non-retryable error
+            statuses are yielded as-is, so callers keep raise_for_status().
+        """
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        policy = retry or self.retry
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempts = policy.attempts if idempotent else 1
+
+        for attempt in range(attempts):
+            last_attempt = attempt + 1 >= attempts
+            breaker.check(host)
+            started = time.monotonic()
+
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.observe(host, time.monotonic() - started, error=True)
+                breaker.record_failure()
+                if last_attempt:
+                    raise
+                await asyncio.sleep(policy.delay(attempt))
+                continue
+
+            server_error = response.status >= 500
+            self.observe(host, time.monotonic() - started, error=server_error)
+            if server_error:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if response.status in policy.retry_statuses and not last_attempt:
+                delay = policy.delay(attempt)
+                retry_after = response.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    delay = min(policy.max_backoff, float(retry_after))
+                response.release()
+                await asyncio.sleep(delay)
+                continue
+
+            try:
+                yield response
+            finally:
+                response.release()
+            return
+
+    @asynccontextmanager
+    async def ws_connect(self, url: str, **kwargs):
+        """Open a WebSocket through the breaker/metrics stack (no retries)"""
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        breaker.check(host)
+        started = time.monotonic()
+
+        try:
+            ws = await self.session.ws_connect(url, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.observe(host, time.monotonic() - started, error=True)
+            breaker.record_failure()
+            raise
+
+        self.observe(host, time.monotonic() - started)
+        breaker.record_success()
+        try:
+            yield ws
+        finally:
+            await ws.close()
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Per-host timing summaries and breaker states"""
+        return {
+            host: {**histogram.summary(), 'circuit': self.breaker(host).state}
+            for host, histogram in sorted(self.histograms.items())
+        }
+
+    def print_metrics(self):
+        """Print a one-line timing summary per host"""
+        for host, stats in self.metrics().items():
+            print(
+                f"   ⏱️  {host}: {stats['requests']} requests, {stats['errors']} errors, "
+                f"p50≤{stats['p50_ms']:.0f}ms p95≤{stats['p95_ms']:.0f}ms ({stats['circuit']})"
+            )
@@ -4,8 +4,8 @@ SearXNG Crawler - Multi-Instance Social Media Intelligence Gathering
 
 This isn't your basic search wrapper - this is a sophisticated
 multi-instance crawler that:
-1. Load balances across multiple SearXNG instances
-2. Handles rate limiting and failures gracefully
+1. Hedges each query across the fastest healthy SearXNG instances
+2. Rate limits per instance and handles failures gracefully
 3. Extracts structured data from unstructured results
 4. Correlates results across platforms
 5. Detects and handles instance failures in real-time
@@ -16,13 +16,65 @@ Author: GrumpiBlogged Intelligence Team
 import asyncio
 import aiohttp
 import random
-from typing import List, Dict, Optional, Set
-from dataclasses import dataclass
+from typing import AsyncIterator, List, Dict, Optional, Set, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from urllib.parse import urlparse, parse_qs
 import hashlib
+import json
 import re
 
+from crawl_store import CrawlStore
+from rate_limit import TokenBucket
+from runtime import CrawlerRuntime, NO_RETRY
+from signal_stream import local_naive
+
+# Search responses are reused for this long (lets an interrupted run
+# resume without re-querying instances)
+SEARCH_CACHE_TTL = 3600
+
+# Per-instance request budget (public instances ban aggressive clients)
+INSTANCE_RATE = 0.5
+INSTANCE_BURST = 2
+
+# Instances raced per query; the first good response wins
+HEDGE_WIDTH = 2
+
+# Topics the query planner expands into sub-queries
+DEFAULT_TOPICS = [
+    'local LLM',
+    'Ollama',
+    'machine learning',
+    'AI models',
+    'open source AI'
+]
+
+# SearXNG engines that search a platform directly
+PLATFORM_ENGINES = {
+    'reddit': ['reddit'],
+    'mastodon': ['mastodon users', 'mastodon hashtags'],
+    'youtube': ['youtube'],
+    'github': ['github'],
+    'stackoverflow': ['stackoverflow'],
+    'hackernews': ['hackernews']
+}
+
+# Platforms without a usable engine are reached with a site: query
+PLATFORM_SITES = {
+    'twitter': 'x.com',
+    'medium': 'medium.com',
+    'substack': 'substack.com'
+}
+
+
+@dataclass
+class SubQuery:
+    """One planned search request"""
+    query: str
+    categories: List[str]
+    engines: Optional[List[str]] = None
+    platform: Optional[str] = None  # None = generic social search
+
 
 @dataclass
 class SearXNGInstance:
@@ -34,6 +86,10 @@ class SearXNGInstance:
     consecutive_failures: int = 0
     avg_response_time: float = 0.0
     total_requests: int = 0
+    limiter: TokenBucket = field(
+        default_factory=lambda: TokenBucket(INSTANCE_RATE, INSTANCE_BURST),
+        repr=False
+    )
     
     def update_health(self, success: bool, response_time: float):
         """Update health score based on request outcome"""
@@ -58,6 +114,11 @@ class SearXNGInstance:
         """Check if instance is healthy enough to use"""
         return (self.health_score > 0.3 and 
                 self.consecutive_failures < 3)
+    
+    @property
+    def weight(self) -> float:
+        """Selection weight - healthy and fast instances first"""
+        return self.health_score / (0.5 + self.avg_response_time)
 
 
 class SearXNGCrawler:
@@ -66,9 +127,19 @@ class SearXNGCrawler:
     intelligent retry logic, and platform-specific result parsing.
     """
     
-    def __init__(self, instances: List[str]):
+    def __init__(
+        self,
+        instances: List[str],
+        store: Optional[CrawlStore] = None,
+        runtime: Optional[CrawlerRuntime] = None
+    ):
         self.instances = [SearXNGInstance(url=url) for url in instances]
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.store = store
+        
+        # Shared HTTP runtime (pooled connector, circuit breakers, timings);
+        # a private one is created when none is passed in
+        self.runtime = runtime or CrawlerRuntime()
+        self.headers = {'User-Agent': 'GrumpiBlogged-Intelligence/2.0 (AI Research Aggregator)'}
         
         # Platform detection patterns
         self.platform_patterns = {
@@ -88,39 +159,75 @@ class SearXNGCrawler:
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers={
-                'User-Agent': 'GrumpiBlogged-Intelligence/2.0 (AI Research Aggregator)'
-            }
-        )
+        await self.runtime.__aenter__()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        await self.runtime.__aexit__(exc_type, exc_val, exc_tb)
     
-    def _select_instance(self) -> Optional[SearXNGInstance]:
+    def _select_instances(
+        self,
+        count: int,
+        exclude: Set[str] = frozenset()
+    ) -> List[SearXNGInstance]:
         """
-        Select best instance using weighted random selection
-        based on health scores.
+        Select up to `count` distinct instances using weighted random
+        selection based on health and latency.
         """
-        healthy_instances = [i for i in self.instances if i.is_healthy]
+        candidates = [i for i in self.instances if i.url not in exclude]
+        healthy_instances = [i for i in candidates if i.is_healthy]
         
         if not healthy_instances:
             # All instances unhealthy - try the least bad one
-            return max(self.instances, key=lambda i: i.health_score)
+            return [max(candidates, key=lambda i: i.health_score)] if candidates else []
+        
+        # Weighted sampling without replacement (healthier, faster
+        # instances more likely)
+        selected = []
+        while healthy_instances and len(selected) < count:
+            weights = [i.weight for i in healthy_instances]
+            if sum(weights) == 0:
+                instance = random.choice(healthy_instances)
+            else:
+                instance = random.choices(healthy_instances, weights=weights)[0]
+            selected.append(instance)
+            healthy_instances.remove(instance)
         
-        # Weighted random selection (healthier instances more likely)
-        weights = [i.health_score for i in healthy_instances]
-        total_weight = sum(weights)
+        return selected
+    
+    async def _hedged_search(
+        self,
+        instances: List[SearXNGInstance],
+        **search_args
+    ) -> Optional[Tuple[SearXNGInstance, List[Dict]]]:
+        """
+        Race a query across instances and keep the first good response.
         
-        if total_weight == 0:
-            return random.choice(healthy_instances)
+        Slower requests are cancelled once one succeeds; cancelled
+        requests don't count against an instance's health.
         
-        normalized_weights = [w / total_weight for w in weights]
-        return random.choices(healthy_instances, weights=normalized_weights)[0]
+        Returns:
+            (winning instance, parsed results), or None if every instance failed
+        """
+        async def attempt(instance: SearXNGInstance):
+            try:
+                return instance, await self._search_instance(instance=instance, **search_args)
+            except Exception as e:
+                print(f"   ⚠️  Instance {instance.url} failed: {e}")
+                return None
+        
+        tasks = [asyncio.ensure_future(attempt(instance)) for instance in instances]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                outcome = await next_done
+                if outcome is not None:
+                    return outcome
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
     
     async def search(
         self,
@@ -128,7 +235,8 @@ class SearXNGCrawler:
         categories: List[str] = None,
         time_range: str = "day",
         max_results: int = 50,
-        engines: List[str] = None
+        engines: List[str] = None,
+        max_rounds: Optional[int] = None
     ) -> List[Dict]:
         """
         Search across SearXNG instances with intelligent load balancing.
@@ -139,6 +247,8 @@ class SearXNGCrawler:
             time_range: Time range filter ('day', 'week', 'month', 'year')
             max_results: Maximum results to return
             engines: Specific engines to use (e.g., ['twitter', 'reddit'])
+            max_rounds: Cap on hedged rounds (each costs up to HEDGE_WIDTH
+                requests); defaults to trying each instance twice
         
         Returns:
             List of search results with platform detection and metadata
@@ -147,48 +257,80 @@ class SearXNGCrawler:
         if categories is None:
             categories = ['social media', 'news', 'general']
         
+        cache_key = None
+        if self.store:
+            cache_key = hashlib.md5(json.dumps(
+                [query, categories, time_range, max_results, engines]
+            ).encode()).hexdigest()
+            cached = self.store.get('searxng-search', cache_key, max_age=SEARCH_CACHE_TTL)
+            if cached is not None:
+                # Same dedup as fresh results: another sub-query may
+                # already have returned some of these
+                fresh = []
+                for result in cached['results']:
+                    result_hash = self._result_hash(result)
+                    if result_hash in self.result_cache:
+                        continue
+                    self.result_cache.add(result_hash)
+                    result['publishedDate'] = self._parse_date(result['publishedDate'])
+                    fresh.append(result)
+                return fresh
+        
         all_results = []
         attempts = 0
         max_attempts = len(self.instances) * 2  # Try each instance twice
-        
-        while len(all_results) < max_results and attempts < max_attempts:
-            instance = self._select_instance()
-            if not instance:
+        answered: Set[str] = set()
+        rounds = 0
+        
+        while (len(all_results) < max_results and attempts < max_attempts and
+               (max_rounds is None or rounds < max_rounds)):
+            # Instances that already answered this query won't add much
+            instances = self._select_instances(HEDGE_WIDTH, exclude=answered)
+            if not instances:
                 break
+            attempts += len(instances)
+            rounds += 1
             
-            try:
-                results = await self._search_instance(
-                    instance=instance,
-                    query=query,
-                    categories=categories,
-                    time_range=time_range,
-                    engines=engines
-                )
-                
-                # Filter out duplicates
-                new_results = [
-                    r for r in results 
-                    if self._result_hash(r) not in self.result_cache
-                ]
-                
-                # Add to cache
-                for result in new_results:
-                    self.result_cache.add(self._result_hash(result))
-                
-                all_results.extend(new_results)
-                
-            except Exception as e:
-                print(f"   ⚠️  Instance {instance.url} failed: {e}")
+            outcome = await self._hedged_search(
+                instances,
+                query=query,
+                categories=categories,
+                time_range=time_range,
+                engines=engines
+            )
+            if outcome is None:
+                continue
+            
+            winner, results = outcome
+            answered.add(winner.url)
+            
+            # Filter out duplicates
+            new_results = [
+                r for r in results 
+                if self._result_hash(r) not in self.result_cache
+            ]
             
-            attempts += 1
+            # Add to cache
+            for result in new_results:
+                self.result_cache.add(self._result_hash(result))
+            
+            all_results.extend(new_results)
         
         # Sort by relevance and recency
-        all_results.sort(
-            key=lambda r: (r.get('score', 0), r.get('publishedDate', '')),
-            reverse=True
-        )
+        all_results.sort(key=self._rank_key, reverse=True)
+        
+        all_results = all_results[:max_results]
         
-        return all_results[:max_results]
+        if self.store and all_results:
+            self.store.put('searxng-search', cache_key, {'results': [
+                {
+                    **result,
+                    'publishedDate': result['publishedDate'].isoformat() if result['publishedDate'] else None
+                }
+                for result in all_results
+            ]})
+        
+        return all_results
     
     async def _search_instance(
         self,
@@ -196,24 +338,19 @@ class SearXNGCrawler:
         query: str,
         categories: List[str],
         time_range: str,
-        engines: List[str] = None,
-        retry_count: int = 0,
-        max_retries: int = 3
+        engines: List[str] = None
     ) -> List[Dict]:
         """
-        Execute search on a specific instance with retry logic and delays
+        Execute search on a specific instance
 
-        Implements:
-        - Exponential backoff (1s, 2s, 4s delays)
-        - Rate limiting protection (2s delay between requests)
-        - Automatic retry on transient failures
+        Waits for the instance's own token bucket rather than a fixed
+        sleep; retries happen in search() on other instances, so a slow
+        or failing instance never blocks the query.
         """
 
+        await instance.limiter.acquire()
         start_time = datetime.now()
 
-        # Add delay to avoid rate limiting (2 seconds between requests)
-        await asyncio.sleep(2.0)
-
         try:
             # Build search parameters
             params = {
@@ -226,46 +363,33 @@ class SearXNGCrawler:
             if engines:
                 params['engines'] = ','.join(engines)
 
-            # Execute search with timeout
-            async with self.session.get(
+            # Execute search with timeout (no runtime retries - a failed
+            # instance is retried by hedging to another one instead)
+            async with self.runtime.request(
+                'GET',
                 f"{instance.url}/search",
+                retry=NO_RETRY,
                 params=params,
+                headers=self.headers,
                 timeout=aiohttp.ClientTimeout(total=30)
             ) as response:
                 response.raise_for_status()
                 data = await response.json()
 
-            # Parse results
-            results = self._parse_results(data.get('results', []))
-
-            # Update instance health
-            response_time = (datetime.now() - start_time).total_seconds()
-            instance.update_health(success=True, response_time=response_time)
-
-            return results
-
-        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError):
             # Update instance health
             response_time = (datetime.now() - start_time).total_seconds()
             instance.update_health(success=False, response_time=response_time)
+            raise
 
-            # Retry with exponential backoff
-            if retry_count < max_retries:
-                backoff_delay = 2 ** retry_count  # 1s, 2s, 4s
-                print(f"   ⏳ Retrying {instance.url} in {backoff_delay}s (attempt {retry_count + 1}/{max_retries})")
-                await asyncio.sleep(backoff_delay)
+        # Parse results
+        results = self._parse_results(data.get('results', []))
 
-                return await self._search_instance(
-                    instance=instance,
-                    query=query,
-                    categories=categories,
-                    time_range=time_range,
-                    engines=engines,
-                    retry_count=retry_count + 1,
-                    max_retries=max_retries
-                )
-            else:
-                raise
+        # Update instance health
+        response_time = (datetime.now() - start_time).total_seconds()
+        instance.update_health(success=True, response_time=response_time)
+
+        return results
     
     def _parse_results(self, raw_results: List[Dict]) -> List[Dict]:
         """
@@ -365,14 +489,15 @@ class SearXNGCrawler:
             return 0
     
     def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
-        """Parse various date formats into datetime"""
+        """Parse various date formats into a naive local datetime"""
         
         if not date_str:
             return None
         
-        # Try ISO format first
+        # Try ISO format first ('Z' and offsets converted to local time,
+        # so parsed dates compare with the other crawlers' timestamps)
         try:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            return local_naive(datetime.fromisoformat(date_str.replace('Z', '+00:00')))
         except (ValueError, AttributeError):
             pass
         
@@ -392,6 +517,11 @@ class SearXNGCrawler:
         
         return None
     
+    @staticmethod
+    def _rank_key(result: Dict) -> Tuple:
+        """Relevance, then recency (undated results rank as oldest)"""
+        return (result.get('score', 0), result.get('publishedDate') or datetime.min)
+
     def _result_hash(self, result: Dict) -> str:
         """Generate hash for deduplication"""
         
@@ -407,29 +537,94 @@ class SearXNGCrawler:
         
         return hashlib.md5(combined.encode()).hexdigest()
     
+    def plan_queries(self, topics: List[str], platforms: List[str]) -> List[SubQuery]:
+        """
+        Expand topics into per-platform and per-engine sub-queries.
+        
+        Sub-queries are interleaved by topic, so truncating the plan to
+        a request budget keeps every topic and platform represented.
+        
+        Args:
+            topics: Search topics (e.g. ['Ollama', 'local LLM'])
+            platforms: Platforms to target
+        
+        Returns:
+            Planned sub-queries in priority order
+        """
+        
+        by_topic = []
+        for topic in topics:
+            plan = [SubQuery(query=topic, categories=['social media'])]
+            
+            for platform in platforms:
+                if platform in PLATFORM_ENGINES:
+                    plan.append(SubQuery(
+                        query=topic,
+                        categories=['social media', 'general'],
+                        engines=PLATFORM_ENGINES[platform],
+                        platform=platform
+                    ))
+                elif platform in PLATFORM_SITES:
+                    plan.append(SubQuery(
+                        query=f"{topic} site:{PLATFORM_SITES[platform]}",
+                        categories=['general'],
+                        platform=platform
+                    ))
+            
+            by_topic.append(plan)
+        
+        # Round-robin across topics
+        planned = []
+        for level in range(max((len(plan) for plan in by_topic), default=0)):
+            planned.extend(plan[level] for plan in by_topic if level < len(plan))
+        
+        return planned
+    
     async def search_social_media(
         self,
-        query: str,
+        query: Optional[str] = None,
         platforms: List[str] = None,
         time_range: str = "day",
-        max_results: int = 50
+        max_results: int = 50,
+        topics: Optional[List[str]] = None,
+        max_requests: int = 24,
+        max_concurrent: int = 6
     ) -> Dict[str, List[Dict]]:
         """
         Search social media platforms specifically.
         
+        Topics are fanned out into per-platform/per-engine sub-queries
+        (see plan_queries) that run concurrently across instances; the
+        shared _result_hash cache merges duplicates between them.
+        
+        Args:
+            query: Single topic (used when topics is not given)
+            platforms: Platforms to group results by
+            time_range: Time range filter
+            max_results: Maximum results per platform
+            topics: Topics to expand (default: DEFAULT_TOPICS)
+            max_requests: Global budget of HTTP requests for the fan-out
+            max_concurrent: Sub-queries in flight at once
+        
         Returns results grouped by platform.
         """
         
         if platforms is None:
             platforms = ['twitter', 'mastodon', 'reddit']
         
-        # Search with social media category
-        results = await self.search(
-            query=query,
-            categories=['social media'],
-            time_range=time_range,
-            max_results=max_results * 2  # Get more, filter later
-        )
+        results = [
+            result async for result in self.stream_social_media(
+                query=query,
+                platforms=platforms,
+                time_range=time_range,
+                max_results=max_results,
+                topics=topics,
+                max_requests=max_requests,
+                max_concurrent=max_concurrent
+            )
+        ]
+        
+        results.sort(key=self._rank_key, reverse=True)
         
         # Group by platform
         by_platform = {platform: [] for platform in platforms}
@@ -448,6 +643,60 @@ class SearXNGCrawler:
         
         return by_platform
     
+    async def stream_social_media(
+        self,
+        query: Optional[str] = None,
+        platforms: List[str] = None,
+        time_range: str = "day",
+        max_results: int = 50,
+        topics: Optional[List[str]] = None,
+        max_requests: int = 24,
+        max_concurrent: int = 6
+    ) -> AsyncIterator[Dict]:
+        """
+        Yield social media results as each sub-query finishes.
+        
+        Takes the same arguments as search_social_media(); results come
+        unsorted and ungrouped (max_results applies per sub-query).
+        """
+        
+        if platforms is None:
+            platforms = ['twitter', 'mastodon', 'reddit']
+        if topics is None:
+            topics = [query] if query else DEFAULT_TOPICS
+        
+        # Each sub-query gets one hedged round, costing up to HEDGE_WIDTH
+        # requests, so the plan is cut to fit the budget
+        plan = self.plan_queries(topics, platforms)
+        plan = plan[:max(1, max_requests // HEDGE_WIDTH)]
+        slots = asyncio.Semaphore(max_concurrent)
+        
+        async def run_sub_query(sub_query: SubQuery) -> List[Dict]:
+            async with slots:
+                try:
+                    return await self.search(
+                        query=sub_query.query,
+                        categories=sub_query.categories,
+                        time_range=time_range,
+                        max_results=max_results,
+                        engines=sub_query.engines,
+                        max_rounds=1
+                    )
+                except Exception as e:
+                    print(f"   ⚠️  Sub-query '{sub_query.query}' failed: {e}")
+                    return []
+        
+        tasks = [asyncio.ensure_future(run_sub_query(q)) for q in plan]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for result in await next_done:
+                    yield result
+        finally:
+            # The consumer may stop early; don't leave searches running
+            for task in tasks:
+                task.cancel()
+    
     def get_instance_health(self) -> List[Dict]:
         """Get health status of all instances"""
         
@@ -481,7 +730,7 @@ async def main():
         print("🔍 Searching for AI/ML content across social media...")
         
         results = await crawler.search_social_media(
-            query="local LLM OR Ollama OR AI models",
+            topics=['local LLM', 'Ollama', 'AI models'],
             platforms=['twitter', 'reddit', 'mastodon'],
             time_range="day",
             max_results=20
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Signal Stream - Streaming pipeline from crawlers to synthesis
+
+Crawling used to be all-or-nothing: asyncio.gather waited for every
+crawler before any signal was looked at. Here each source is an async
+generator of signal dicts feeding one bounded queue, and the consumer
+stages run while crawling continues:
+
+    crawler generators -> bounded queue -> normalize -> dedup
+                                        -> topic tagging -> trend counts
+
+A fast source no longer waits for a slow one, and the pipeline
+finishes shortly after the slowest single source does. Raw items in
+flight are capped by the queue depth (a full queue pauses the
+producers); processed signals are all kept in SignalPipeline.signals,
+so total memory still grows with the number of unique signals.
+"""
+
+import asyncio
+import re
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from graph_merge import normalize_topic
+
+QUEUE_DEPTH = 256
+
+# Keywords tagged on every signal (both crawlers' vocabularies)
+TOPIC_KEYWORDS = (
+    'ai', 'ml', 'llm', 'gpt', 'claude', 'gemini', 'llama', 'mistral', 'mixtral',
+    'openai', 'anthropic', 'machine learning', 'deep learning', 'neural network',
+    'transformer', 'attention', 'bert', 'diffusion', 'stable diffusion',
+    'midjourney', 'dall-e', 'reinforcement learning', 'rlhf', 'fine-tuning',
+    'quantization', 'lora', 'qlora', 'gguf', 'ollama', 'huggingface', 'pytorch',
+    'tensorflow', 'jax', 'langchain', 'llamaindex', 'vector database',
+    'embedding', 'rag', 'retrieval', 'agent', 'autonomous', 'multimodal', 'agi'
+)
+
+# Whole words only ('ai' must not match 'said'); spaces, hyphens and
+# underscores are interchangeable inside a keyword
+_TOPIC_RE = re.compile(
+    r'\b(' + '|'.join(
+        r'[\s_-]+'.join(map(re.escape, re.split(r'[\s-]+', keyword)))
+        for keyword in sorted(TOPIC_KEYWORDS, key=len, reverse=True)
+    ) + r')s?\b',
+    re.IGNORECASE
+)
+
+# Query parameters that never change what a URL points to
+_TRACKING_PARAMS = {'fbclid', 'gclid', 'ref', 'ref_src', 'ref_url', 'share_id', 'si',
+                    'source', 'utm_campaign', 'utm_content', 'utm_medium',
+                    'utm_name', 'utm_source', 'utm_term'}
+
+# Mobile / AMP / vanity hosts -> canonical host
+_HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.', 'old.', 'new.', 'np.')
+_HOST_ALIASES = {
+    'x.com': 'twitter.com',
+    'youtu.be': 'youtube.com',
+    'redd.it': 'reddit.com'
+}
+
+_REDDIT_POST_RE = re.compile(r'^(?:/r/[^/]+)?/comments/([a-z0-9]+)', re.IGNORECASE)
+_ARXIV_RE = re.compile(r'^/(?:abs|pdf)/([0-9]+\.[0-9]+)(?:v[0-9]+)?(?:\.pdf)?$')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def canonical_url(url: str) -> str:
+    """
+    Canonical form of a link, for dedup and story matching
+
+    Lowercases the host, folds mobile/AMP/short-link hosts, drops the
+    scheme, fragment, tracking params and trailing slash, and reduces
+    Reddit threads, tweets, YouTube videos and arXiv papers to their ids.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().split(':')[0]
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    host = _HOST_ALIASES.get(host, host)
+    path = parts.path.rstrip('/')
+    params = [
+        (key, value) for key, value in parse_qsl(parts.query)
+        if key.lower() not in _TRACKING_PARAMS
+    ]
+
+    if host == 'reddit.com':
+        match = _REDDIT_POST_RE.match(path)
+        if match:
+            path, params = f"/comments/{match.group(1).lower()}", []
+        elif parts.netloc.lower().endswith('redd.it') and path:
+            path, params = f"/comments{path.lower()}", []
+    elif host == 'youtube.com':
+        if parts.netloc.lower().endswith('youtu.be'):
+            params = [('v', path.lstrip('/'))]
+        else:
+            params = [(key, value) for key, value in params if key == 'v']
+        path = '/watch'
+    elif host == 'twitter.com':
+        params = []
+    elif host == 'arxiv.org':
+        match = _ARXIV_RE.match(path)
+        if match:
+            path = f"/abs/{match.group(1)}"
+
+    return urlunsplit(('', host, path, urlencode(sorted(params)), '')).lstrip('/')
+
+
+def local_naive(timestamp: datetime) -> datetime:
+    """
+    A timestamp in the crawlers' convention: naive local time
+
+    HN and Reddit timestamps come from datetime.fromtimestamp, but
+    SearXNG dates ending in 'Z' parse as UTC-aware, and the two cannot
+    be compared or subtracted.
+    """
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone().replace(tzinfo=None)
+    return timestamp
+
+
+def normalize_signal(signal: Dict) -> Dict:
+    """
+    Stage 1: uniform field types and tidy text
+
+    Args:
+        signal: Raw signal dict from a crawler generator
+
+    Returns:
+        The same dict, normalized in place
+    """
+    signal['source'] = (signal.get('source') or 'other').lower()
+    signal['title'] = _WHITESPACE_RE.sub(' ', signal.get('title') or '').strip()
+    signal['content'] = (signal.get('content') or '').strip()
+    signal['url'] = (signal.get('url') or '').strip()
+    signal['engagement'] = signal.get('engagement') or {}
+
+    timestamp = signal.get('timestamp')
+    if isinstance(timestamp, (int, float)):
+        timestamp = datetime.fromtimestamp(timestamp)
+    elif isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except ValueError:
+            timestamp = None
+    signal['timestamp'] = local_naive(timestamp) if timestamp else datetime.now()
+
+    return signal
+
+
+def signal_key(signal: Dict) -> str:
+    """Stage 2 key: the canonical URL, or source + title without one"""
+    if signal['url']:
+        return canonical_url(signal['url'])
+    return f"{signal['source']}:{signal['title'].lower()}"
+
+
+def tag_topics(signal: Dict) -> List[str]:
+    """Stage 3: normalized topics mentioned in the title or content"""
+    text = f"{signal['title']} {signal['content'][:2000]}"
+    return sorted({normalize_topic(match) for match in _TOPIC_RE.findall(text)})
+
+
+class TrendCounter:
+    """Stage 4: running per-topic mention, platform and engagement counts"""
+
+    def __init__(self):
+        self.mentions: Counter = Counter()
+        self.engagement: Counter = Counter()
+        self.platforms: Dict[str, Counter] = defaultdict(Counter)
+        self.hourly: Dict[str, Counter] = defaultdict(Counter)
+
+    def observe(self, signal: Dict):
+        engagement = sum(v for v in signal['engagement'].values() if isinstance(v, (int, float)))
+        hour = signal['timestamp'].replace(minute=0, second=0, microsecond=0)
+        for topic in signal['topics']:
+            self.mentions[topic] += 1
+            self.engagement[topic] += engagement
+            self.platforms[topic][signal['source']] += 1
+            self.hourly[topic][hour] += 1
+
+    def top(self, top_n: int = 20) -> List[Dict]:
+        """Most mentioned topics with their platform spread"""
+        return [
+            {
+                'topic': topic,
+                'mentions': mentions,
+                'engagement': self.engagement[topic],
+                'platforms': dict(self.platforms[topic])
+            }
+            for topic, mentions in self.mentions.most_common(top_n)
+        ]
+
+
+class SignalPipeline:
+    """
+    Bounded-queue pipeline from crawler generators to a signal list.
+
+    Usage:
+        pipeline = SignalPipeline()
+        pipeline.add_source('hackernews', hn_signals())
+        pipeline.add_source('reddit', reddit_signals())
+        signals = await pipeline.run()
+    """
+
+    def __init__(self, queue_depth: int = QUEUE_DEPTH):
+        self.queue_depth = queue_depth
+        self.sources: Dict[str, AsyncIterator[Dict]] = {}
+        self.signals: List[Dict] = []
+        self.seen: Set[str] = set()
+        self.duplicates = 0
+        self.trends = TrendCounter()
+        self.errors: Dict[str, Exception] = {}
+        self.dropped = 0  # Signals whose processing raised
+        self.source_seconds: Dict[str, float] = {}
+        self.source_counts: Counter = Counter()
+        self.first_signal_seconds: Optional[float] = None
+        self._started = 0.0
+
+    def add_source(self, name: str, signals: AsyncIterator[Dict]):
+        """Register an async generator of signal dicts"""
+        self.sources[name] = signals
+
+    def process(self, signal: Dict) -> Optional[Dict]:
+        """
+        Run one signal through every consumer stage
+
+        Returns:
+            The processed signal, or None if it was a duplicate
+        """
+        signal = normalize_signal(signal)
+
+        key = signal_key(signal)
+        if key in self.seen:
+            self.duplicates += 1
+            return None
+        self.seen.add(key)
+
+        signal['topics'] = tag_topics(signal)
+        self.trends.observe(signal)
+        self.signals.append(signal)
+        return signal
+
+    async def _produce(self, name: str, signals: AsyncIterator[Dict], queue: asyncio.Queue):
+        try:
+            async for signal in signals:
+                self.source_counts[name] += 1
+                await queue.put(signal)  # Waits while the queue is full
+        except Exception as e:
+            self.errors[name] = e
+            print(f"   ⚠️  {name} stream failed: {e}")
+        finally:
+            self.source_seconds[name] = time.monotonic() - self._started
+
+    async def _consume(self, queue: asyncio.Queue):
+        while True:
+            signal = await queue.get()
+            if signal is None:
+                return
+            if self.first_signal_seconds is None:
+                self.first_signal_seconds = time.monotonic() - self._started
+            # One malformed signal must not kill the consumer: the
+            # producers would then block on a full queue forever
+            try:
+                self.process(signal)
+            except Exception as e:
+                self.dropped += 1
+                print(f"   ⚠️  Dropped malformed signal: {e!r}")
+
+    async def run(self) -> List[Dict]:
+        """
+        Drain every source through the stages
+
+        Returns:
+            Deduplicated, normalized, topic-tagged signals
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+        self._started = time.monotonic()
+        consumer = asyncio.ensure_future(self._consume(queue))
+
+        try:
+            await asyncio.gather(*(
+                self._produce(name, signals, queue)
+                for name, signals in self.sources.items()
+            ))
+            await queue.put(None)
+            await consumer
+        finally:
+            if not consumer.done():
+                consumer.cancel()
+
+        return self.signals
+
+    def print_summary(self):
+        """Print per-source timings and dedup counts"""
+        for name, seconds in self.source_seconds.items():
+            status = 'failed' if name in self.errors else f"{self.source_counts[name]} signals"
+            print(f"   ⏱️  {name}: {status} in {seconds:.2f}s")
+        if self.first_signal_seconds is not None:
+            print(f"   ⏱️  First signal processed after {self.first_signal_seconds:.2f}s")
+        print(f"   🧹 {self.duplicates} duplicates dropped")
+        if self.dropped:
+            print(f"   ⚠️  {self.dropped} malformed signals dropped")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Stage Graph - Run pipeline stages as a dependency graph
+
+Synthesis (and the pipeline around it) used to run its stages strictly
+one after another, although most of them only need one or two earlier
+results. Stages here declare what they depend on; each one starts as
+soon as its dependencies have finished, so independent stages overlap.
+
+Every run records per-stage start/finish times and the critical path:
+the chain of stages, following each stage's last dependency to finish,
+that decided when the graph completed. Speeding up anything off that
+chain does not make the run faster.
+"""
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+@dataclass
+class Stage:
+    """One node: a callable taking its dependencies' results as keyword args"""
+    name: str
+    func: Callable[..., Any]
+    deps: Sequence[str] = ()
+    description: Optional[str] = None
+    started: Optional[float] = None   # Seconds since the run started
+    finished: Optional[float] = None
+    critical_path: List[str] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class StageGraph:
+    """
+    Dependency-graph executor for async (or plain) stages.
+
+    Usage:
+        graph = StageGraph()
+        graph.add('trends', analyze_trends)
+        graph.add('predictions', predict, deps=('trends',))
+        results = await graph.run()   # {'trends': ..., 'predictions': ...}
+
+    A stage is called with one keyword argument per dependency (named
+    after it). If any stage raises, the stages still running are
+    cancelled and the error propagates.
+
+    Args:
+        announce: Format string printed (with the stage description)
+            when a described stage starts
+    """
+
+    def __init__(self, announce: str = "✨ {}..."):
+        self.announce = announce
+        self.stages: Dict[str, Stage] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        deps: Sequence[str] = (),
+        description: Optional[str] = None
+    ):
+        """
+        Register a stage
+
+        Args:
+            name: Stage name (and the keyword its result is passed as)
+            func: Callable returning the result or an awaitable of it
+            deps: Names of stages that must finish first
+            description: Printed when the stage starts
+        """
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        self.stages[name] = Stage(name, func, tuple(deps), description)
+
+    def _check(self):
+        """Raise ValueError on unknown dependencies or cycles"""
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage {stage.name} depends on unknown stage {dep}")
+
+        visiting, done = set(), set()
+
+        def visit(name: str, path: List[str]):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name, [])
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run every stage, each as soon as its dependencies are done
+
+        Returns:
+            Stage name -> result
+        """
+        self._check()
+        results: Dict[str, Any] = {}
+        pending = dict(self.stages)
+        running: Dict[asyncio.Task, Stage] = {}
+        run_started = time.monotonic()
+
+        async def execute(stage: Stage):
+            stage.started = time.monotonic() - run_started
+            if stage.description:
+                print(self.announce.format(stage.description))
+            result = stage.func(**{dep: results[dep] for dep in stage.deps})
+            if inspect.isawaitable(result):
+                result = await result
+            stage.finished = time.monotonic() - run_started
+            return result
+
+        try:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(dep in results for dep in stage.deps):
+                        del pending[name]
+                        running[asyncio.ensure_future(execute(stage))] = stage
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage = running.pop(task)
+                    results[stage.name] = task.result()  # Re-raises a stage's error
+                    last_dep = max(
+                        (self.stages[dep] for dep in stage.deps),
+                        key=lambda dep: dep.finished,
+                        default=None
+                    )
+                    stage.critical_path = (last_dep.critical_path if last_dep else []) + [stage.name]
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return results
+
+    def critical_path(self) -> List[Stage]:
+        """Stages on the chain that ended last in the latest run"""
+        finished = [stage for stage in self.stages.values() if stage.finished is not None]
+        if not finished:
+            return []
+        last = max(finished, key=lambda stage: stage.finished)
+        return [self.stages[name] for name in last.critical_path]
+
+    def timings(self) -> Dict[str, Dict]:
+        """Per-stage start, finish and duration (seconds since run start)"""
+        on_path = {stage.name for stage in self.critical_path()}
+        return {
+            stage.name: {
+                'started': round(stage.started or 0.0, 3),
+                'finished': round(stage.finished or 0.0, 3),
+                'seconds': round(stage.seconds, 3),
+                'critical': stage.name in on_path,
+                'critical_path': list(stage.critical_path)
+            }
+            for stage in sorted(self.stages.values(), key=lambda stage: stage.started or 0.0)
+        }
+
+    def print_timings(self):
+        """Print a one-line timing per stage and the critical path"""
+        for name, timing in self.timings().items():
+            marker = '*' if timing['critical'] else ' '
+            print(
+                f"   ⏱️ {marker}{name}: {timing['seconds']:.2f}s "
+                f"(+{timing['started']:.2f}s → +{timing['finished']:.2f}s)"
+            )
+        path = self.critical_path()
+        if path:
+            print(f"   🧭 Critical path: {' → '.join(stage.name for stage in path)} ({path[-1].finished:.2f}s)")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Story Matcher - Find the same story across HN, Reddit and social media
+
+Synthesis and the platform correlation heatmap read
+intelligence_data['cross_platform_stories'], which nothing produced.
+The matcher groups signals that are about the same story:
+
+- Links: signals sharing a canonical URL (tracking params, mobile
+  hosts and short links folded; HN/Reddit link posts contribute the
+  link they point to, not just their discussion page)
+- Titles: near-identical titles, found with MinHash signatures and
+  banded LSH instead of comparing every pair
+
+Groups are merged with union-find, so the whole pass is roughly linear
+in the number of signals. Groups seen on two or more platforms become
+cross-platform stories.
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from signal_stream import canonical_url, local_naive
+
+NUM_PERM = 64           # MinHash signature length
+BANDS = 16              # LSH bands (NUM_PERM / BANDS rows each, ~0.5 Jaccard)
+TITLE_THRESHOLD = 0.6   # Estimated Jaccard needed to merge two titles
+MIN_TITLE_TOKENS = 3    # Shorter titles are too generic to match on
+CHUNK_TOKENS = 50_000   # Tokens hashed per NumPy pass (bounds memory)
+
+_PRIME = (1 << 31) - 1
+_PERMUTATIONS = np.random.RandomState(42).randint(1, _PRIME, size=(2, NUM_PERM)).astype(np.uint64)
+
+# Platform boilerplate that says nothing about the story
+_TITLE_PREFIX_RE = re.compile(r'^\s*(?:(?:show|ask|tell|launch) hn\s*[:\-]|\[[a-z]{1,3}\])\s*', re.IGNORECASE)
+_TOKEN_RE = re.compile(r'[a-z0-9]+(?:[.+#][a-z0-9]+)*')
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has',
+    'have', 'how', 'in', 'is', 'it', 'its', 'new', 'of', 'on', 'or', 'that',
+    'the', 'this', 'to', 'we', 'what', 'why', 'with', 'you', 'your'
+}
+
+# Discussion pages, not the story's own link (left out of story urls)
+_DISCUSSION_HOSTS = ('news.ycombinator.com', 'reddit.com')
+
+
+def title_tokens(title: str) -> List[str]:
+    """
+    Comparable words of a title
+
+    Lowercased, boilerplate prefixes and stopwords removed, and common
+    suffixes stripped so 'releases' and 'released' match.
+    """
+    words = _TOKEN_RE.findall(_TITLE_PREFIX_RE.sub('', title).lower())
+    tokens = set()
+    for word in words:
+        if word in STOPWORDS:
+            continue
+        for suffix in ('ing', 'ed', 'es', 's'):
+            if len(word) > len(suffix) + 3 and word.endswith(suffix):
+                word = word[:-len(suffix)]
+                break
+        tokens.add(word)
+    return sorted(tokens)
+
+
+def minhash_signatures(token_lists: List[List[str]]) -> np.ndarray:
+    """
+    MinHash signatures for many token sets at once
+
+    All tokens are hashed into one flat array, every permutation is
+    applied to it in a single vectorized step, and np.minimum.reduceat
+    takes the per-set minima.
+
+    Args:
+        token_lists: One non-empty token list per item
+
+    Returns:
+        (len(token_lists), NUM_PERM) uint64 array
+    """
+    signatures = np.empty((len(token_lists), NUM_PERM), dtype=np.uint64)
+    a, b = _PERMUTATIONS[0][:, None], _PERMUTATIONS[1][:, None]
+
+    start = 0
+    while start < len(token_lists):
+        # Take lists until the chunk holds CHUNK_TOKENS tokens
+        end, size = start, 0
+        while end < len(token_lists) and (end == start or size + len(token_lists[end]) <= CHUNK_TOKENS):
+            size += len(token_lists[end])
+            end += 1
+
+        chunk = token_lists[start:end]
+        hashes = np.fromiter(
+            (zlib.crc32(token.encode('utf-8')) for tokens in chunk for token in tokens),
+            dtype=np.uint64,
+            count=size
+        ) % _PRIME
+        offsets = np.cumsum([0] + [len(tokens) for tokens in chunk[:-1]])
+
+        permuted = (a * hashes[None, :] + b) % _PRIME
+        signatures[start:end] = np.minimum.reduceat(permuted, offsets, axis=1).T
+        start = end
+
+    return signatures
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x: int, y: int):
+        root_x, root_y = self.find(x), self.find(y)
+        if root_x != root_y:
+            self.parent[root_y] = root_x
+
+
+def _engagement(signal: Dict) -> int:
+    return int(sum(v for v in (signal.get('engagement') or {}).values() if isinstance(v, (int, float))))
+
+
+def _link_keys(signal: Dict) -> List[str]:
+    keys = []
+    for field in ('url', 'link'):
+        if signal.get(field):
+            key = canonical_url(signal[field])
+            if key:
+                keys.append(key)
+    return keys
+
+
+def match_stories(
+    signals: List[Dict],
+    min_platforms: int = 2,
+    threshold: float = TITLE_THRESHOLD
+) -> List[Dict]:
+    """
+    Group signals into stories and keep the cross-platform ones
+
+    Args:
+        signals: Signal dicts ('source', 'title', 'url', optional 'link',
+            'engagement', 'timestamp')
+        min_platforms: Distinct sources a story needs
+        threshold: Estimated title Jaccard similarity needed to merge
+
+    Returns:
+        Stories with title, platforms, total_engagement, urls,
+        first_seen (naive local time) and signals, most platforms /
+        engagement first
+    """
+    groups = _UnionFind(len(signals))
+
+    # 1. Shared canonical links
+    first_with_key: Dict[str, int] = {}
+    for i, signal in enumerate(signals):
+        for key in _link_keys(signal):
+            if key in first_with_key:
+                groups.union(first_with_key[key], i)
+            else:
+                first_with_key[key] = i
+
+    # 2. Near-identical titles via MinHash LSH
+    indexed, token_lists = [], []
+    for i, signal in enumerate(signals):
+        tokens = title_tokens(signal.get('title', ''))
+        if len(tokens) >= MIN_TITLE_TOKENS:
+            indexed.append(i)
+            token_lists.append(tokens)
+
+    if indexed:
+        signatures = minhash_signatures(token_lists)
+        rows = NUM_PERM // BANDS
+        for band in range(BANDS):
+            buckets: Dict[bytes, int] = {}
+            band_values = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+            for position, value in enumerate(band_values):
+                key = value.tobytes()
+                first = buckets.setdefault(key, position)
+                if first != position and groups.find(indexed[first]) != groups.find(indexed[position]):
+                    # Verify the candidate before merging
+                    similarity = np.mean(signatures[first] == signatures[position])
+                    if similarity >= threshold:
+                        groups.union(indexed[first], indexed[position])
+
+    # 3. Collect groups
+    members = defaultdict(list)
+    for i in range(len(signals)):
+        members[groups.find(i)].append(i)
+
+    stories = []
+    for indices in members.values():
+        platforms = sorted({signals[i].get('source', 'unknown') for i in indices})
+        if len(platforms) < min_platforms:
+            continue
+
+        group = [signals[i] for i in indices]
+        lead = max(group, key=_engagement)
+        urls = sorted({
+            key for signal in group for key in _link_keys(signal)
+            if not key.startswith(_DISCUSSION_HOSTS)
+        })
+        timestamps = [local_naive(s['timestamp']) for s in group if isinstance(s.get('timestamp'), datetime)]
+
+        stories.append({
+            'title': lead.get('title', ''),
+            'platforms': platforms,
+            'total_engagement': sum(_engagement(s) for s in group),
+            'signal_count': len(group),
+            'urls': urls,
+            'first_seen': min(timestamps) if timestamps else None,
+            'signals': group
+        })
+
+    stories.sort(key=lambda s: (len(s['platforms']), s['total_engagement']), reverse=True)
+    return stories
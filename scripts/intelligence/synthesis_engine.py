@@ -14,13 +14,37 @@ This isn't just "summarization" - this is SYNTHESIS.
 """
 
 import asyncio
+import time
 import aiohttp
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 import numpy as np
 from collections import defaultdict, Counter
 
+from embedding_cache import EmbeddingCache, text_key
+from runtime import CrawlerRuntime, LatencyHistogram
+from signal_stream import signal_key
+from stage_graph import StageGraph
+from topic_clusters import TopicClusterer
+from vector_index import VectorIndex
+
+# LLM generations can legitimately take minutes
+OLLAMA_TIMEOUT = aiohttp.ClientTimeout(total=300)
+
+# Texts per /api/embed request, and requests in flight at once
+EMBED_BATCH_SIZE = 64
+EMBED_CONCURRENCY = 4
+
+# LLM generations in flight at once (shared by every synthesis stage),
+# and the longest one item may take including retries (seconds)
+LLM_CONCURRENCY = 4
+LLM_ITEM_TIMEOUT = 180.0
+
+# Similarity to a signal from an earlier day that marks a returning story
+RECURRING_SIMILARITY = 0.9
+
 
 @dataclass
 class IntelligenceReport:
@@ -45,6 +69,9 @@ class IntelligenceReport:
     platforms_analyzed: List[str]
     time_range: str
     generated_at: datetime
+    
+    # Stories that resurfaced from earlier runs (signal index)
+    recurring_stories: List[Dict] = field(default_factory=list)
 
 
 class OllamaCloudClient:
@@ -58,23 +85,67 @@ class OllamaCloudClient:
     - Structured Outputs (clean JSON responses)
     """
 
-    def __init__(self, api_key: str, base_url: str = "https://api.ollama.ai"):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.ollama.ai",
+        runtime: Optional[CrawlerRuntime] = None,
+        embedding_cache: Optional[EmbeddingCache] = None
+    ):
         self.api_key = api_key
         self.base_url = base_url
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.embedding_cache = embedding_cache
+        self.headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json'
+        }
+
+        # Shared HTTP runtime (pooled connector, retries, circuit breakers,
+        # timings); a private one is created when none is passed in
+        self.runtime = runtime or CrawlerRuntime()
+
+        # Per-call latency by "<endpoint> <model>" (the runtime's
+        # histograms only see one host)
+        self.latency: Dict[str, LatencyHistogram] = {}
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            headers={
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
-        )
+        # Open once per run and share; calls only need the runtime's
+        # session, so concurrent calls are safe inside one `async with`
+        await self.runtime.__aenter__()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        await self.runtime.__aexit__(exc_type, exc_val, exc_tb)
+
+    @asynccontextmanager
+    async def _post(self, url: str, payload: Dict, call: str):
+        """POST through the runtime with auth headers and the LLM timeout, timed under `call`"""
+        # Not retried: the runtime only resends idempotent requests, and a
+        # generate call that timed out may still have run (and been billed)
+        started = time.monotonic()
+        error = True
+        try:
+            async with self.runtime.request(
+                'POST', url, json=payload, headers=self.headers, timeout=OLLAMA_TIMEOUT
+            ) as response:
+                yield response
+                error = response.status >= 400
+        finally:
+            if call not in self.latency:
+                self.latency[call] = LatencyHistogram()
+            self.latency[call].observe(time.monotonic() - started, error)
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Per-call timing summaries (including reading the response)"""
+        return {call: histogram.summary() for call, histogram in sorted(self.latency.items())}
+
+    def print_metrics(self):
+        """Print a one-line timing summary per endpoint and model"""
+        for call, stats in self.metrics().items():
+            print(
+                f"   ⏱️  {call}: {stats['requests']} calls, {stats['errors']} errors, "
+                f"mean {stats['mean_ms']:.0f}ms, p95≤{stats['p95_ms']:.0f}ms"
+            )
 
     async def generate(
         self,
@@ -140,7 +211,7 @@ class OllamaCloudClient:
         if tools:
             payload['tools'] = tools
 
-        async with self.session.post(url, json=payload) as response:
+        async with self._post(url, payload, f"chat {model}") as response:
             response.raise_for_status()
             data = await response.json()
             return data['message']['content']
@@ -229,21 +300,81 @@ class OllamaCloudClient:
         )
         return json.loads(response)
 
-    async def embed_batch(self, model: str, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts"""
-
-        embeddings = []
+    async def embed_batch(
+        self,
+        model: str,
+        texts: List[str],
+        batch_size: int = EMBED_BATCH_SIZE,
+        max_concurrent: int = EMBED_CONCURRENCY
+    ) -> List[List[float]]:
+        """Generate embeddings for multiple texts (see embed_matrix)"""
+        return (await self.embed_matrix(model, texts, batch_size, max_concurrent)).tolist()
+
+    async def embed_matrix(
+        self,
+        model: str,
+        texts: List[str],
+        batch_size: int = EMBED_BATCH_SIZE,
+        max_concurrent: int = EMBED_CONCURRENCY
+    ) -> np.ndarray:
+        """
+        Embed texts as a (len(texts), dim) float32 matrix
 
-        for text in texts:
-            url = f"{self.base_url}/api/embeddings"
-            payload = {'model': model, 'prompt': text}
+        Identical texts are embedded once, cached vectors are reused,
+        and the rest go out `batch_size` inputs per /api/embed request
+        with at most `max_concurrent` requests in flight.
 
-            async with self.session.post(url, json=payload) as response:
-                response.raise_for_status()
-                data = await response.json()
-                embeddings.append(data['embedding'])
+        Args:
+            model: Embedding model
+            texts: Texts to embed
+            batch_size: Inputs per request
+            max_concurrent: Requests in flight
 
-        return embeddings
+        Returns:
+            One row per input text, in input order
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        keys = [text_key(text) for text in texts]
+        vectors: Dict[bytes, np.ndarray] = {}
+        missing: Dict[bytes, str] = {}
+
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+            cached = self.embedding_cache.get(model, key) if self.embedding_cache else None
+            if cached is not None:
+                vectors[key] = cached
+            else:
+                missing[key] = text
+
+        if missing:
+            slots = asyncio.Semaphore(max_concurrent)
+            url = f"{self.base_url}/api/embed"
+            missing_keys = list(missing)
+            batches = [missing_keys[i:i + batch_size] for i in range(0, len(missing_keys), batch_size)]
+
+            async def embed(batch: List[bytes]):
+                async with slots:
+                    payload = {'model': model, 'input': [missing[key] for key in batch]}
+                    async with self._post(url, payload, f"embed {model}") as response:
+                        response.raise_for_status()
+                        data = await response.json()
+                matrix = np.asarray(data['embeddings'], dtype=np.float32)
+                if self.embedding_cache:
+                    # Use the stored precision so warm and cold runs agree
+                    matrix = self.embedding_cache.put(model, batch, matrix)
+                vectors.update(zip(batch, matrix))
+
+            try:
+                await asyncio.gather(*(embed(batch) for batch in batches))
+            finally:
+                # Keep whatever did come back, even if a batch failed
+                if self.embedding_cache:
+                    self.embedding_cache.save()
+
+        return np.stack([vectors[key] for key in keys])
 
 
 class SynthesisEngine:
@@ -259,8 +390,22 @@ class SynthesisEngine:
     - Tool calling for orchestration
     """
 
-    def __init__(self, ollama_api_key: str):
-        self.ollama = OllamaCloudClient(ollama_api_key)
+    def __init__(
+        self,
+        ollama_api_key: str,
+        runtime: Optional[CrawlerRuntime] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        topic_clusterer: Optional[TopicClusterer] = None,
+        signal_index: Optional[VectorIndex] = None,
+        max_concurrent: int = LLM_CONCURRENCY,
+        item_timeout: float = LLM_ITEM_TIMEOUT
+    ):
+        self.ollama = OllamaCloudClient(ollama_api_key, runtime=runtime, embedding_cache=embedding_cache)
+        self.topic_clusterer = topic_clusterer
+        self.signal_index = signal_index
+        self.item_timeout = item_timeout
+        self._llm_slots = asyncio.Semaphore(max_concurrent)
+        self.stage_graph: Optional[StageGraph] = None
 
         # Model selection for different tasks - using Ollama Cloud models
         self.models = {
@@ -274,33 +419,61 @@ class SynthesisEngine:
         """
         Main synthesis pipeline: Transform raw intelligence into report.
         
-        Pipeline:
-        1. Analyze emerging trends
-        2. Detect cross-platform stories
-        3. Identify key influencers
-        4. Generate predictions
-        5. Create narrative synthesis
+        Stages (run as a dependency graph, independent ones concurrently):
+        - trends: Analyze emerging trends
+        - cross_platform: Detect cross-platform stories
+        - influencers: Identify key influencers
+        - predictions: Generate predictions (needs trends)
+        - narrative: Create narrative synthesis (needs all of the above)
+        - embeddings -> topic_clusters, recurring: Cluster signals into
+          topics and find returning stories
+        
+        The Ollama client is opened once for the whole run; stage
+        timings and the critical path are kept in self.stage_graph.
         """
         
-        print("✨ Phase 1: Analyzing emerging trends...")
-        emerging_trends = await self._analyze_trends(intelligence_data)
-        
-        print("✨ Phase 2: Detecting cross-platform stories...")
-        cross_platform = await self._detect_cross_platform(intelligence_data)
-        
-        print("✨ Phase 3: Identifying key influencers...")
-        influencers = await self._identify_influencers(intelligence_data)
-        
-        print("✨ Phase 4: Generating predictions...")
-        predictions = await self._generate_predictions(emerging_trends)
-        
-        print("✨ Phase 5: Creating narrative synthesis...")
-        headline, summary = await self._create_narrative(
-            trends=emerging_trends,
-            cross_platform=cross_platform,
-            influencers=influencers,
-            predictions=predictions
-        )
+        signals = intelligence_data.get('signals', [])
+        
+        graph = StageGraph()
+        graph.add('trends', lambda: self._analyze_trends(intelligence_data),
+                  description="Analyzing emerging trends")
+        graph.add('cross_platform', lambda: self._detect_cross_platform(intelligence_data),
+                  description="Detecting cross-platform stories")
+        graph.add('influencers', lambda: self._identify_influencers(intelligence_data),
+                  description="Identifying key influencers")
+        graph.add('predictions', lambda trends: self._generate_predictions(trends),
+                  deps=('trends',), description="Generating predictions")
+        graph.add('narrative', lambda trends, cross_platform, influencers, predictions: self._create_narrative(
+                      trends=trends,
+                      cross_platform=cross_platform,
+                      influencers=influencers,
+                      predictions=predictions
+                  ),
+                  deps=('trends', 'cross_platform', 'influencers', 'predictions'),
+                  description="Creating narrative synthesis")
+        graph.add('embeddings', lambda: self._embed_signals(signals),
+                  description="Embedding signals")
+        # CPU-bound; threads keep them off the event loop while LLM calls run
+        graph.add('topic_clusters', lambda embeddings: asyncio.to_thread(
+                      self._cluster_topics, intelligence_data, embeddings
+                  ),
+                  deps=('embeddings',), description="Clustering topics")
+        graph.add('recurring', lambda embeddings: asyncio.to_thread(self._find_recurring, signals, embeddings),
+                  deps=('embeddings',), description="Finding returning stories")
+        self.stage_graph = graph
+        
+        async with self.ollama:
+            results = await graph.run()
+        
+        print("   ⏱️  Synthesis stages (* = critical path):")
+        graph.print_timings()
+        
+        headline, summary = results['narrative']
+        
+        # Merged here rather than in the recurring stage's thread
+        recurring, seen_before = results['recurring']
+        for i, hit in seen_before.items():
+            signals[i]['seen_before'] = hit
         
         # Compute confidence score
         confidence = self._compute_confidence(intelligence_data)
@@ -309,31 +482,147 @@ class SynthesisEngine:
             headline=headline,
             summary=summary,
             confidence_score=confidence,
-            emerging_trends=emerging_trends,
-            cross_platform_stories=cross_platform,
-            top_influencers=influencers,
-            topic_clusters=intelligence_data.get('topic_clusters', {}),
-            predictions=predictions,
+            emerging_trends=results['trends'],
+            cross_platform_stories=results['cross_platform'],
+            top_influencers=results['influencers'],
+            topic_clusters=results['topic_clusters'],
+            predictions=results['predictions'],
             total_signals=intelligence_data.get('total_signals', 0),
             platforms_analyzed=self._get_platforms(intelligence_data),
             time_range="Last 24 hours",
-            generated_at=datetime.now()
+            generated_at=datetime.now(),
+            recurring_stories=recurring
         )
     
+    async def _embed_signals(self, signals: List[Dict]) -> Optional[np.ndarray]:
+        """
+        Embed signal titles and content (cached, so only new signals
+        are sent). None when nothing needs embeddings or the API fails.
+        """
+        
+        if not signals or not (self.topic_clusterer or self.signal_index):
+            return None
+        
+        texts = [f"{s['title']}\n{(s.get('content') or '')[:500]}" for s in signals]
+        try:
+            return await self.ollama.embed_matrix(self.models['embedding'], texts)
+        except Exception as e:
+            print(f"   ⚠️  Embedding failed, skipping clustering and recurrence: {e}")
+            return None
+    
+    def _cluster_topics(self, data: Dict, embeddings: Optional[np.ndarray]) -> Dict[str, List]:
+        """Group signals into persistent topic clusters via their embeddings"""
+        
+        signals = data.get('signals', [])
+        if not self.topic_clusterer or embeddings is None:
+            return data.get('topic_clusters', {})
+        
+        assignments = self.topic_clusterer.cluster(embeddings, [s['title'] for s in signals])
+        self.topic_clusterer.save()
+        
+        clusters = self.topic_clusterer.group(signals, assignments)
+        print(f"   ✅ {len(clusters)} topic clusters ({int((assignments >= 0).sum())}/{len(signals)} signals)")
+        return clusters
+    
+    def _find_recurring(
+        self,
+        signals: List[Dict],
+        embeddings: Optional[np.ndarray]
+    ) -> Tuple[List[Dict], Dict[int, Dict]]:
+        """
+        Match signals against every earlier run's signals in the vector
+        index, then add today's signals to it.
+        
+        Runs in a worker thread while other stages read the signals, so
+        it leaves them untouched: the caller merges the returned
+        'seen_before' hits in once the graph has finished.
+        
+        Returns:
+            One entry per returning story (closest first), and the
+            earlier hit for each resurfacing signal by its position
+        """
+        
+        if not self.signal_index or embeddings is None:
+            return [], {}
+        
+        today = datetime.now().date().isoformat()
+        recurring = {}
+        seen_before = {}
+        for i, (signal, hits) in enumerate(zip(signals, self.signal_index.search(embeddings, k=5))):
+            # Rows indexed earlier today are re-runs, not returning stories
+            earlier = [hit for hit in hits if hit['date'] != today]
+            if not earlier or earlier[0]['similarity'] < RECURRING_SIMILARITY:
+                continue
+            
+            hit = earlier[0]
+            seen_before[i] = hit
+            if hit['id'] not in recurring:
+                recurring[hit['id']] = {
+                    'title': signal['title'],
+                    'source': signal['source'],
+                    'url': signal['url'],
+                    'previous_title': hit['title'],
+                    'previous_url': hit['url'],
+                    'first_seen': hit['date'],
+                    'similarity': hit['similarity']
+                }
+        
+        added = self.signal_index.add(
+            [signal_key(s) for s in signals],
+            embeddings,
+            [
+                {'title': s['title'], 'url': s['url'], 'source': s['source'], 'date': today}
+                for s in signals
+            ]
+        )
+        print(f"   ✅ {len(recurring)} returning stories ({added} signals indexed, {len(self.signal_index)} total)")
+        return sorted(recurring.values(), key=lambda story: -story['similarity']), seen_before
+    
+    async def _generate_many(
+        self,
+        model: str,
+        prompts: List[str],
+        max_tokens: int,
+        label: str
+    ) -> List[Optional[str]]:
+        """
+        Run generations concurrently under the engine's shared semaphore
+        
+        Each item gets `item_timeout` seconds; a failed or timed-out item
+        comes back as None so the caller can degrade it instead of
+        losing the whole stage.
+        
+        Returns:
+            Stripped text (or None) per prompt, in prompt order
+        """
+        
+        async def one(prompt: str) -> Optional[str]:
+            async with self._llm_slots:
+                try:
+                    text = await asyncio.wait_for(
+                        self.ollama.generate(model=model, prompt=prompt, max_tokens=max_tokens),
+                        timeout=self.item_timeout
+                    )
+                    return text.strip() or None
+                except asyncio.TimeoutError:
+                    print(f"   ⚠️  {label} timed out after {self.item_timeout:.0f}s")
+                except Exception as e:
+                    print(f"   ⚠️  {label} failed: {e}")
+                return None
+        
+        return list(await asyncio.gather(*(one(prompt) for prompt in prompts)))
+    
     async def _analyze_trends(self, data: Dict) -> List[Dict]:
         """
         Analyze emerging trends using velocity, acceleration,
         and cross-platform correlation.
         """
         
-        trends = data.get('emerging_trends', [])
-        
-        # Enrich each trend with AI analysis
-        enriched_trends = []
+        trends = data.get('emerging_trends', [])[:5]  # Top 5 trends
         
-        for trend in trends[:5]:  # Top 5 trends
-            # Generate insight using reasoning model
-            prompt = f"""Analyze this emerging AI/ML trend:
+        # Generate insights using reasoning model, all at once
+        prompts = [
+            f"""Analyze this emerging AI/ML trend:
 
 Topic: {trend['topic']}
 Velocity: {trend['velocity']:.2f} signals/hour
@@ -347,21 +636,22 @@ Provide:
 3. What are the implications?
 
 Be concise and insightful (3-4 sentences)."""
-            
-            async with self.ollama as client:
-                insight = await client.generate(
-                    model=self.models['reasoning'],
-                    prompt=prompt,
-                    max_tokens=300
-                )
-            
-            enriched_trends.append({
+            for trend in trends
+        ]
+        insights = await self._generate_many(self.models['reasoning'], prompts, max_tokens=300, label='trend insight')
+        
+        # A failed insight falls back to the numbers
+        return [
+            {
                 **trend,
-                'insight': insight.strip(),
+                'insight': insight or (
+                    f"{trend['topic']} is picking up at {trend['velocity']:.2f} signals/hour "
+                    f"across {trend['platforms']} platforms."
+                ),
                 'significance': self._compute_significance(trend)
-            })
-        
-        return enriched_trends
+            }
+            for trend, insight in zip(trends, insights)
+        ]
     
     async def _detect_cross_platform(self, data: Dict) -> List[Dict]:
         """
@@ -369,14 +659,11 @@ Be concise and insightful (3-4 sentences)."""
         This indicates high-impact news.
         """
         
-        cross_platform = data.get('cross_platform_stories', [])
+        cross_platform = data.get('cross_platform_stories', [])[:10]  # Top 10
         
         # Enrich with synthesis
-        enriched = []
-        
-        for story in cross_platform[:10]:  # Top 10
-            # Generate synthesis
-            prompt = f"""Synthesize this cross-platform AI/ML story:
+        prompts = [
+            f"""Synthesize this cross-platform AI/ML story:
 
 Title: {story['title']}
 Platforms: {', '.join(story['platforms'])}
@@ -384,20 +671,20 @@ Total Engagement: {story['total_engagement']}
 
 What's the core story? Why did it spread across platforms?
 (2-3 sentences)"""
-            
-            async with self.ollama as client:
-                synthesis = await client.generate(
-                    model=self.models['creative'],
-                    prompt=prompt,
-                    max_tokens=200
-                )
-            
-            enriched.append({
-                **story,
-                'synthesis': synthesis.strip()
-            })
+            for story in cross_platform
+        ]
+        syntheses = await self._generate_many(self.models['creative'], prompts, max_tokens=200, label='story synthesis')
         
-        return enriched
+        return [
+            {
+                **story,
+                'synthesis': synthesis or (
+                    f"Spread across {', '.join(story['platforms'])} "
+                    f"with {story['total_engagement']:,} total engagement."
+                )
+            }
+            for story, synthesis in zip(cross_platform, syntheses)
+        ]
     
     async def _identify_influencers(self, data: Dict) -> List[Dict]:
         """Identify and profile key influencers"""
@@ -425,10 +712,9 @@ What's the core story? Why did it spread across platforms?
         This uses the reasoning model to extrapolate future developments.
         """
         
-        predictions = []
-        
-        for trend in trends[:3]:  # Top 3 trends
-            prompt = f"""Based on this AI/ML trend, predict what happens next:
+        trends = trends[:3]  # Top 3 trends
+        prompts = [
+            f"""Based on this AI/ML trend, predict what happens next:
 
 Topic: {trend['topic']}
 Current State: {trend['insight']}
@@ -441,22 +727,21 @@ Predict:
 3. What's the potential impact?
 
 Be specific and actionable (4-5 sentences)."""
-            
-            async with self.ollama as client:
-                prediction = await client.generate(
-                    model=self.models['reasoning'],
-                    prompt=prediction,
-                    max_tokens=400
-                )
-            
-            predictions.append({
+            for trend in trends
+        ]
+        results = await self._generate_many(self.models['reasoning'], prompts, max_tokens=400, label='prediction')
+        
+        # No fallback text: a failed prediction is left out
+        return [
+            {
                 'topic': trend['topic'],
-                'prediction': prediction.strip(),
-                'confidence': trend.get('score', 0) / 10.0,
+                'prediction': prediction,
+                'confidence': min(max(trend.get('confidence', 0.0), 0.0), 1.0),
                 'timeframe': '7 days'
-            })
-        
-        return predictions
+            }
+            for trend, prediction in zip(trends, results)
+            if prediction
+        ]
     
     async def _create_narrative(
         self,
@@ -491,13 +776,12 @@ Format:
 HEADLINE: [your headline]
 SUMMARY: [your summary]"""
         
-        async with self.ollama as client:
-            response = await client.generate(
-                model=self.models['creative'],
-                prompt=context,
-                max_tokens=300,
-                temperature=0.8  # More creative
-            )
+        response = await self.ollama.generate(
+            model=self.models['creative'],
+            prompt=context,
+            max_tokens=300,
+            temperature=0.8  # More creative
+        )
         
         # Parse response
         lines = response.strip().split('\n')
@@ -563,7 +847,7 @@ SUMMARY: [your summary]"""
     
     def _format_signals(self, signals: List) -> str:
         """Format signals for prompt"""
-        return "\n".join(f"- {s.title}" for s in signals)
+        return "\n".join(f"- {s['title']}" for s in signals)
     
     def _format_trends(self, trends: List[Dict]) -> str:
         """Format trends for prompt"""
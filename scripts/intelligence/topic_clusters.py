@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Topic Clusters - Embedding-based clustering of signals into topics
+
+IntelligenceReport.topic_clusters was never filled. The clusterer
+groups signal embeddings (from the embedding cache, so yesterday's
+signals cost nothing) into named topics that persist between runs:
+
+1. New signals are first assigned to an existing cluster when their
+   cosine similarity to its centroid is high enough; the centroid is
+   then updated as a running mean
+2. Whatever is left is clustered from scratch - DBSCAN (cosine) on
+   normal days, MiniBatchKMeans (with near-duplicate centroids merged)
+   when a day is too large for DBSCAN's pairwise distances
+3. New clusters are labeled by their most distinctive title words
+   (class-based TF-IDF) and keep that label from then on
+
+Clusters not seen for STALE_AFTER are dropped, so the state stays small.
+"""
+
+import math
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from sklearn.cluster import DBSCAN, MiniBatchKMeans
+
+from crawl_store import DEFAULT_STORE
+from story_matcher import STOPWORDS
+
+DEFAULT_CLUSTER_PATH = DEFAULT_STORE.parent / "topic_clusters.npz"
+
+ASSIGN_SIMILARITY = 0.75     # Cosine similarity to join an existing cluster
+DBSCAN_EPS = 0.25            # Cosine distance between neighbours
+MIN_CLUSTER_SIZE = 3         # Smaller groups stay unclustered
+KMEANS_ABOVE = 5000          # Switch to MiniBatchKMeans past this many signals
+LABEL_TERMS = 3              # Words per cluster label
+STALE_AFTER = 30 * 24 * 3600  # Drop clusters unseen for this long (seconds)
+
+_LABEL_WORD_RE = re.compile(r"[a-z][a-z0-9+#.-]*[a-z0-9+#]|[a-z]")
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def _label_words(text: str) -> List[str]:
+    return [
+        word for word in _LABEL_WORD_RE.findall(text.lower())
+        if len(word) > 2 and word not in STOPWORDS
+    ]
+
+
+class TopicClusterer:
+    """
+    Persistent, incrementally updated topic clusters.
+
+    Args:
+        path: .npz file holding centroids, counts, labels and last-seen times
+        assign_similarity: Minimum centroid similarity for assignment
+        eps: DBSCAN neighbourhood (cosine distance)
+        min_cluster_size: Minimum members for a new cluster
+        kmeans_above: Unassigned-signal count that switches to MiniBatchKMeans
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CLUSTER_PATH,
+        assign_similarity: float = ASSIGN_SIMILARITY,
+        eps: float = DBSCAN_EPS,
+        min_cluster_size: int = MIN_CLUSTER_SIZE,
+        kmeans_above: int = KMEANS_ABOVE
+    ):
+        self.path = Path(path)
+        self.assign_similarity = assign_similarity
+        self.eps = eps
+        self.min_cluster_size = min_cluster_size
+        self.kmeans_above = kmeans_above
+
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.labels: List[str] = []
+        self.last_seen = np.zeros(0, dtype=np.float64)
+
+        if self.path.exists():
+            with np.load(self.path) as data:
+                self.centroids = data['centroids']
+                self.counts = data['counts']
+                self.labels = data['labels'].tolist()
+                self.last_seen = data['last_seen']
+
+    def cluster(self, embeddings: np.ndarray, texts: List[str]) -> np.ndarray:
+        """
+        Assign signals to clusters, creating new ones as needed
+
+        Args:
+            embeddings: (n, dim) signal embeddings
+            texts: Signal titles (for labeling new clusters)
+
+        Returns:
+            Cluster index per signal (-1 = unclustered)
+        """
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        assignments = np.full(len(vectors), -1, dtype=np.int64)
+        if not len(vectors):
+            return assignments
+
+        # A different embedding model invalidates the old centroids
+        if self.centroids.size and self.centroids.shape[1] != vectors.shape[1]:
+            self.centroids = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+            self.counts = np.zeros(0, dtype=np.int64)
+            self.labels = []
+            self.last_seen = np.zeros(0, dtype=np.float64)
+
+        # 1. Incremental assignment to existing clusters
+        existing = len(self.labels)
+        if existing:
+            similarity = vectors @ self.centroids.T
+            best = similarity.argmax(axis=1)
+            close = similarity[np.arange(len(vectors)), best] >= self.assign_similarity
+            assignments[close] = best[close]
+
+        # 2. Cluster the rest from scratch
+        rest = np.flatnonzero(assignments == -1)
+        if len(rest) >= self.min_cluster_size:
+            new_labels = self._cluster_new(vectors[rest])
+            label_counts = Counter(new_labels[new_labels >= 0].tolist())
+            doc_freq = Counter(word for i in rest for word in set(_label_words(texts[i])))
+
+            new_centroids = []
+            for cluster, _ in label_counts.most_common():
+                members = rest[new_labels == cluster]
+                if len(members) < self.min_cluster_size:
+                    continue
+                assignments[members] = existing + len(new_centroids)
+                new_centroids.append(vectors[members].mean(axis=0))
+                self.labels.append(self._make_label([texts[i] for i in members], doc_freq, len(rest)))
+
+            if new_centroids:
+                dim = vectors.shape[1]
+                self.centroids = np.vstack([self.centroids.reshape(-1, dim), _normalize(np.array(new_centroids))])
+                self.counts = np.concatenate([self.counts, np.zeros(len(new_centroids), dtype=np.int64)])
+                self.last_seen = np.concatenate([self.last_seen, np.zeros(len(new_centroids))])
+
+        # 3. Fold members into their centroids (running mean)
+        assigned = assignments >= 0
+        if assigned.any():
+            k = len(self.labels)
+            sums = np.zeros((k, vectors.shape[1]), dtype=np.float64)
+            np.add.at(sums, assignments[assigned], vectors[assigned])
+            added = np.bincount(assignments[assigned], minlength=k)
+            self.centroids = _normalize(self.centroids * self.counts[:, None] + sums)
+            self.counts = self.counts + added
+            self.last_seen[added > 0] = time.time()
+
+        return assignments
+
+    def _cluster_new(self, vectors: np.ndarray) -> np.ndarray:
+        if len(vectors) > self.kmeans_above:
+            n_clusters = max(2, int(math.sqrt(len(vectors) / 2)))
+            model = MiniBatchKMeans(
+                n_clusters=n_clusters,
+                batch_size=1024,
+                n_init=3,
+                random_state=0
+            ).fit(vectors)
+            
+            # k is a guess; merge centroids close enough that assignment
+            # would treat them as one topic anyway
+            centers = _normalize(model.cluster_centers_)
+            close = sparse.csr_matrix(centers @ centers.T >= self.assign_similarity)
+            _, merged = connected_components(close, directed=False)
+            return merged[model.labels_]
+
+        return DBSCAN(
+            eps=self.eps,
+            min_samples=self.min_cluster_size,
+            metric='cosine'
+        ).fit_predict(vectors)
+
+    def _make_label(self, texts: List[str], doc_freq: Counter, total_docs: int) -> str:
+        """Most distinctive words of a cluster's titles (class-based TF-IDF)"""
+        term_freq = Counter(word for text in texts for word in _label_words(text))
+        scores = {
+            word: count / len(texts) * math.log(1 + total_docs / doc_freq[word])
+            for word, count in term_freq.items()
+        }
+        words = sorted(scores, key=lambda w: (-scores[w], w))[:LABEL_TERMS]
+        label = ' / '.join(words) or f"cluster {len(self.labels) + 1}"
+
+        # Labels are dict keys in the report
+        if label in self.labels:
+            label = f"{label} ({len(self.labels) + 1})"
+        return label
+
+    def group(self, signals: List[Dict], assignments: np.ndarray, max_members: int = 10) -> Dict[str, List]:
+        """
+        Report view: label -> member titles (most engaging first), for
+        clusters with members in this batch, largest first
+        """
+        members: Dict[int, List[Dict]] = {}
+        for signal, cluster in zip(signals, assignments.tolist()):
+            if cluster >= 0:
+                members.setdefault(cluster, []).append(signal)
+
+        def engagement(signal: Dict) -> float:
+            return sum(v for v in signal.get('engagement', {}).values() if isinstance(v, (int, float)))
+
+        return {
+            self.labels[cluster]: [s['title'] for s in sorted(group, key=engagement, reverse=True)[:max_members]]
+            for cluster, group in sorted(members.items(), key=lambda item: -len(item[1]))
+        }
+
+    def save(self):
+        """Persist clusters, dropping the ones unseen for STALE_AFTER"""
+        keep = self.last_seen >= time.time() - STALE_AFTER
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp,
+            centroids=self.centroids[keep] if self.centroids.size else self.centroids,
+            counts=self.counts[keep],
+            labels=np.array([label for label, kept in zip(self.labels, keep) if kept], dtype=str),
+            last_seen=self.last_seen[keep]
+        )
+        tmp.replace(self.path)
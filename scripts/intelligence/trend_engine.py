@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Trend Engine - Windowed emerging-trend detection
+
+Synthesis and the trend velocity chart both read
+intelligence_data['emerging_trends'], which nothing produced. The
+engine builds it from the tagged signals in a few NumPy passes:
+
+- Signals are bucketed per topic into fixed time windows (a
+  topics x windows count matrix filled with np.add.at)
+- Velocity is the recent rate (signals/hour), acceleration the change
+  against the window span before it, and platform diversity the number
+  of distinct sources mentioning the topic
+- Emergence is scored against a rolling per-topic baseline (an
+  exponentially weighted mean/variance of the hourly rate); the score
+  is unbounded, so each trend also carries a 0-1 confidence derived
+  from it
+
+Baselines are persisted in the crawl store, so each nightly run only
+folds its own data into them.
+"""
+
+import math
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from signal_stream import local_naive
+
+WINDOW_HOURS = 1.0           # Bucket width
+HORIZON_HOURS = 24.0         # How far back signals are bucketed
+RECENT_WINDOWS = 6           # Velocity span (and the span it is compared to)
+BASELINE_HALF_LIFE = 7 * 24  # Hours for an old rate to lose half its weight
+MIN_VARIANCE = 1.0           # Variance floor (brand-new topics have none)
+SAMPLE_SIGNALS = 5           # Example signals kept per trend
+CONFIDENCE_SCALE = 10.0      # Score at which confidence reaches 1 - 1/e (~63%)
+
+BASELINE_CURSOR = 'trend-baselines'
+
+
+class TrendEngine:
+    """
+    Detect emerging topics in a batch of tagged signals.
+
+    Args:
+        store: CrawlStore for persisted baselines (None = start fresh
+            every run and keep nothing)
+        window_hours: Bucket width
+        horizon_hours: Oldest signal age considered
+        recent_windows: Windows that make up the velocity span
+        half_life_hours: Baseline memory
+    """
+
+    def __init__(
+        self,
+        store=None,
+        window_hours: float = WINDOW_HOURS,
+        horizon_hours: float = HORIZON_HOURS,
+        recent_windows: int = RECENT_WINDOWS,
+        half_life_hours: float = BASELINE_HALF_LIFE
+    ):
+        self.store = store
+        self.window_hours = window_hours
+        self.n_windows = max(2 * recent_windows, math.ceil(horizon_hours / window_hours))
+        self.recent_windows = recent_windows
+        self.half_life_hours = half_life_hours
+        self.baselines = store.get_cursor(BASELINE_CURSOR) if store else {}
+
+    def detect(
+        self,
+        signals: List[Dict],
+        now: Optional[datetime] = None,
+        top_n: int = 20,
+        min_mentions: int = 2
+    ) -> List[Dict]:
+        """
+        Score topics and update the baselines
+
+        Args:
+            signals: Signals with 'topics', 'source', 'timestamp' (see
+                signal_stream.SignalPipeline; aware timestamps are
+                converted to naive local time)
+            now: End of the newest window (default: now)
+            top_n: Trends to return
+            min_mentions: Ignore topics with fewer signals in the horizon
+
+        Returns:
+            Trends (highest score first) with topic, velocity,
+            acceleration, platforms, score, confidence (0-1) and
+            sample signals
+        """
+        now = local_naive(now) if now else datetime.now()
+        topic_rows, source_rows, ages, signal_rows = [], [], [], []
+
+        for i, signal in enumerate(signals):
+            timestamp = signal.get('timestamp')
+            if not isinstance(timestamp, datetime):
+                continue
+            age = (now - local_naive(timestamp)).total_seconds() / 3600
+            for topic in signal.get('topics', ()):
+                topic_rows.append(topic)
+                source_rows.append(signal.get('source', 'unknown'))
+                ages.append(age)
+                signal_rows.append(i)
+
+        if not topic_rows:
+            self._update_baselines(np.array([], dtype=str), np.zeros(0))
+            return []
+
+        topics, topic_idx = np.unique(np.array(topic_rows), return_inverse=True)
+        sources, source_idx = np.unique(np.array(source_rows), return_inverse=True)
+        ages = np.maximum(np.array(ages), 0.0)  # Clock skew: future = newest
+
+        # Newest window is last
+        window = self.n_windows - 1 - np.floor(ages / self.window_hours).astype(np.int64)
+        inside = window >= 0
+        topic_idx, source_idx, window = topic_idx[inside], source_idx[inside], window[inside]
+        signal_rows = np.array(signal_rows)[inside]
+
+        counts = np.zeros((len(topics), self.n_windows))
+        np.add.at(counts, (topic_idx, window), 1)
+
+        seen_on = np.zeros((len(topics), len(sources)), dtype=bool)
+        seen_on[topic_idx, source_idx] = True
+        diversity = seen_on.sum(axis=1)
+
+        k = self.recent_windows
+        span = k * self.window_hours
+        velocity = counts[:, -k:].sum(axis=1) / span
+        previous = counts[:, -2 * k:-k].sum(axis=1) / span
+        acceleration = (velocity - previous) / span
+        mentions = counts.sum(axis=1)
+
+        # Surprise against the baseline; counting noise (Poisson variance
+        # of a rate measured over `span` hours) keeps busy topics from
+        # looking emergent on ordinary fluctuations
+        mean, var = self._baseline_arrays(topics)
+        surprise = (velocity - mean) / np.sqrt(var + mean / span + MIN_VARIANCE)
+        score = np.maximum(surprise, 0.0) * diversity
+        confidence = 1.0 - np.exp(-score / CONFIDENCE_SCALE)
+
+        self._update_baselines(topics, mentions / (self.n_windows * self.window_hours))
+
+        ranked = np.argsort(-score, kind='stable')
+        ranked = ranked[(mentions[ranked] >= min_mentions) & (score[ranked] > 0)][:top_n]
+
+        # Newest signals first as samples
+        by_recency = np.argsort(-window, kind='stable')
+
+        trends = []
+        for t in ranked:
+            sample = signal_rows[by_recency[topic_idx[by_recency] == t]][:SAMPLE_SIGNALS]
+            trends.append({
+                'topic': str(topics[t]),
+                'velocity': float(velocity[t]),
+                'acceleration': float(acceleration[t]),
+                'platforms': int(diversity[t]),
+                'platform_names': [str(s) for s in sources[seen_on[t]]],
+                'mentions': int(mentions[t]),
+                'baseline': float(mean[t]),
+                'score': round(float(score[t]), 2),
+                'confidence': round(float(confidence[t]), 3),
+                'timeline': counts[t].astype(int).tolist(),
+                'signals': [signals[i] for i in sample]
+            })
+
+        return trends
+
+    def _baseline_arrays(self, topics: np.ndarray):
+        stats = self.baselines.get('topics', {})
+        mean = np.array([stats.get(t, {}).get('mean', 0.0) for t in topics])
+        var = np.array([stats.get(t, {}).get('var', 0.0) for t in topics])
+        return mean, var
+
+    def _update_baselines(self, topics: np.ndarray, rates: np.ndarray):
+        """Fold this run's hourly rates into the EWMA baselines and persist"""
+        stats = self.baselines.get('topics', {})
+        updated_at = self.baselines.get('updated_at')
+        now = time.time()
+
+        # Weight by time elapsed, so an immediate rerun barely moves anything
+        if updated_at is None:
+            alpha = 1.0
+        else:
+            elapsed = max(0.0, now - updated_at) / 3600
+            alpha = 1.0 - 0.5 ** (elapsed / self.half_life_hours)
+
+        names = sorted(set(stats) | set(topics.tolist()))
+        observed = dict(zip(topics.tolist(), rates.tolist()))
+        x = np.array([observed.get(name, 0.0) for name in names])
+        mean = np.array([stats.get(name, {}).get('mean', x[i]) for i, name in enumerate(names)])
+        var = np.array([stats.get(name, {}).get('var', 0.0) for name in names])
+
+        delta = x - mean
+        mean = mean + alpha * delta
+        var = (1 - alpha) * (var + alpha * delta ** 2)
+
+        # Topics that faded out entirely are dropped
+        self.baselines = {
+            'updated_at': now,
+            'topics': {
+                name: {'mean': round(m, 6), 'var': round(v, 6)}
+                for name, m, v in zip(names, mean.tolist(), var.tolist())
+                if m >= 1e-4 or name in observed
+            }
+        }
+
+        if self.store:
+            self.store.set_cursor(BASELINE_CURSOR, self.baselines)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Vector Index - On-disk similarity index over every signal ever seen
+
+"Have we covered a story like this before?" needs embeddings from
+every past run, which is far more than should be loaded each night.
+The index is append-only and read through NumPy memmaps:
+
+- vectors.f16   normalized float16 rows (n x dim), appended in place
+- offsets.i64   byte offset of each row's metadata line
+- metadata.jsonl  one JSON object per row (id, title, url, source, date)
+- lists.i32     IVF list of each row (once the quantizer is trained)
+- ivf.npy       coarse quantizer centroids
+- index.json    dim, row count, quantizer state
+
+Below IVF_MIN_ROWS, queries scan the memmap in chunks (exact). Past
+it, a coarse k-means quantizer is trained on a sample and queries only
+scan the `nprobe` closest lists. Either way only the rows being scored
+are paged in.
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+
+from crawl_store import DEFAULT_STORE
+
+DEFAULT_INDEX_DIR = DEFAULT_STORE.parent / "vector_index"
+
+CHUNK_ROWS = 65_536          # Rows scored per memmap slice
+IVF_MIN_ROWS = 50_000        # Train the coarse quantizer past this size
+IVF_SAMPLE = 20_000          # Rows sampled to train it
+IVF_RETRAIN_GROWTH = 4       # Retrain once the index is this many times larger
+DEFAULT_NPROBE = 8           # IVF lists scanned per query
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+class VectorIndex:
+    """
+    Append-only memmapped vector index with optional IVF.
+
+    Usage:
+        index = VectorIndex(path)
+        index.add(ids, vectors, metadata)
+        hits = index.search(query_vectors, k=5)
+    """
+
+    def __init__(self, root: Path = DEFAULT_INDEX_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.header = {'dim': None, 'count': 0, 'ivf_trained_at': 0}
+
+        header_path = self.root / "index.json"
+        if header_path.exists():
+            self.header.update(json.loads(header_path.read_text()))
+
+        # A crash between the row append and the header write leaves
+        # extra bytes at the end of the files; they are ignored and
+        # overwritten by the next add()
+        self._ids: Optional[Set[str]] = None
+        self.centroids: Optional[np.ndarray] = None
+        if (self.root / "ivf.npy").exists() and self.header['ivf_trained_at']:
+            self.centroids = np.load(self.root / "ivf.npy")
+
+    def __len__(self) -> int:
+        return self.header['count']
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.header['dim']
+
+    def _path(self, name: str) -> Path:
+        return self.root / name
+
+    def _memmap(self, name: str, dtype, shape) -> np.ndarray:
+        return np.memmap(self._path(name), dtype=dtype, mode='r', shape=shape)
+
+    def _vectors(self) -> np.ndarray:
+        return self._memmap("vectors.f16", np.float16, (len(self), self.dim))
+
+    def _lists(self) -> np.ndarray:
+        return self._memmap("lists.i32", np.int32, (len(self),))
+
+    @property
+    def ids(self) -> Set[str]:
+        """Ids already indexed (read from metadata on first use)"""
+        if self._ids is None:
+            self._ids = {meta['id'] for meta in self._iter_metadata()}
+        return self._ids
+
+    def _iter_metadata(self):
+        if not len(self):
+            return
+        with open(self._path("metadata.jsonl"), 'rb') as f:
+            for _ in range(len(self)):
+                yield json.loads(f.readline())
+
+    def metadata(self, rows: List[int]) -> List[Dict]:
+        """Metadata for row numbers (seeks; nothing else is read)"""
+        offsets = self._memmap("offsets.i64", np.int64, (len(self),))
+        result = []
+        with open(self._path("metadata.jsonl"), 'rb') as f:
+            for row in rows:
+                f.seek(int(offsets[row]))
+                result.append(json.loads(f.readline()))
+        return result
+
+    def _write_header(self):
+        tmp = self._path("index.json.tmp")
+        tmp.write_text(json.dumps(self.header))
+        os.replace(tmp, self._path("index.json"))
+
+    def _append(self, name: str, data: bytes, itemsize: int):
+        """Append at the committed row count (drops bytes from a crashed add)"""
+        path = self._path(name)
+        with open(path, 'r+b' if path.exists() else 'wb') as f:
+            f.seek(len(self) * itemsize)
+            f.write(data)
+            f.truncate()
+
+    def add(self, ids: List[str], vectors: np.ndarray, metadata: List[Dict]) -> int:
+        """
+        Append vectors whose ids are not indexed yet
+
+        Args:
+            ids: Stable id per vector (e.g. canonical URL)
+            vectors: (n, dim) embeddings
+            metadata: JSON-serializable dict per vector
+
+        Returns:
+            Number of rows added
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.dim is None and len(vectors):
+            self.header['dim'] = int(vectors.shape[1])
+        if len(vectors) and vectors.shape[1] != self.dim:
+            raise ValueError(f"Index holds {self.dim}-d vectors, got {vectors.shape[1]}-d")
+
+        seen = self.ids
+        keep = []
+        for i, item_id in enumerate(ids):
+            if item_id not in seen:
+                seen.add(item_id)
+                keep.append(i)
+        if not keep:
+            return 0
+
+        rows = _normalize(vectors[keep])
+
+        # Metadata lines and their offsets
+        meta_path = self._path("metadata.jsonl")
+        offsets = np.empty(len(keep), dtype=np.int64)
+        lines = []
+        position = 0
+        if len(self):
+            last = self._memmap("offsets.i64", np.int64, (len(self),))[-1]
+            with open(meta_path, 'rb') as f:
+                f.seek(int(last))
+                position = int(last) + len(f.readline())
+        for n, i in enumerate(keep):
+            line = (json.dumps({**metadata[i], 'id': ids[i]}) + "\n").encode('utf-8')
+            offsets[n] = position
+            position += len(line)
+            lines.append(line)
+
+        self._append("vectors.f16", rows.astype(np.float16).tobytes(), 2 * self.dim)
+        self._append("offsets.i64", offsets.tobytes(), 8)
+        with open(meta_path, 'r+b' if meta_path.exists() else 'wb') as f:
+            f.seek(int(offsets[0]))
+            f.write(b''.join(lines))
+            f.truncate()
+        if self.centroids is not None:
+            self._append("lists.i32", self._assign(rows).tobytes(), 4)
+
+        self.header['count'] += len(keep)
+        self._write_header()
+
+        trained_at = self.header['ivf_trained_at']
+        if len(self) >= IVF_MIN_ROWS and (not trained_at or len(self) >= trained_at * IVF_RETRAIN_GROWTH):
+            self.train()
+
+        return len(keep)
+
+    def _assign(self, rows: np.ndarray) -> np.ndarray:
+        return (rows @ self.centroids.T).argmax(axis=1).astype(np.int32)
+
+    def train(self):
+        """(Re)train the coarse quantizer and rebuild every row's list"""
+        vectors = self._vectors()
+        n_lists = max(2, int(math.sqrt(len(self))))
+        sample = np.sort(np.random.RandomState(0).choice(len(self), min(IVF_SAMPLE, len(self)), replace=False))
+
+        model = MiniBatchKMeans(n_clusters=n_lists, batch_size=4096, n_init=3, random_state=0)
+        model.fit(np.asarray(vectors[sample], dtype=np.float32))
+        self.centroids = _normalize(model.cluster_centers_)
+
+        lists = np.empty(len(self), dtype=np.int32)
+        for start in range(0, len(self), CHUNK_ROWS):
+            chunk = np.asarray(vectors[start:start + CHUNK_ROWS], dtype=np.float32)
+            lists[start:start + CHUNK_ROWS] = self._assign(chunk)
+
+        np.save(self._path("ivf.npy"), self.centroids)
+        lists.tofile(self._path("lists.i32"))
+        self.header['ivf_trained_at'] = len(self)
+        self._write_header()
+
+    def search(self, queries: np.ndarray, k: int = 5, nprobe: int = DEFAULT_NPROBE) -> List[List[Dict]]:
+        """
+        k nearest indexed vectors (cosine) for each query
+
+        Args:
+            queries: (q, dim) or (dim,) query embeddings
+            k: Neighbours per query
+            nprobe: IVF lists scanned per query (ignored when exact)
+
+        Returns:
+            Per query, up to k metadata dicts with a 'similarity' key,
+            most similar first
+        """
+        queries = _normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        if not len(self) or not len(queries):
+            return [[] for _ in queries]
+
+        vectors = self._vectors()
+        if self.centroids is None:
+            rows, scores = self._scan(queries, vectors, k)
+        else:
+            rows, scores = self._scan_ivf(queries, vectors, k, nprobe)
+
+        wanted = sorted({row for query_rows in rows for row in query_rows})
+        metadata = dict(zip(wanted, self.metadata(wanted)))
+        return [
+            [{**metadata[row], 'similarity': float(score)} for row, score in zip(query_rows, query_scores)]
+            for query_rows, query_scores in zip(rows, scores)
+        ]
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, rows: np.ndarray, k: int):
+        if scores.shape[1] > k:
+            part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            scores = np.take_along_axis(scores, part, axis=1)
+            rows = np.take_along_axis(rows, part, axis=1)
+        order = np.argsort(-scores, axis=1)
+        return np.take_along_axis(rows, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+    def _scan(self, queries: np.ndarray, vectors: np.ndarray, k: int):
+        """Exact search, one memmap chunk at a time"""
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+
+        for start in range(0, len(vectors), CHUNK_ROWS):
+            chunk = np.asarray(vectors[start:start + CHUNK_ROWS], dtype=np.float32)
+            scores = queries @ chunk.T
+            rows = np.broadcast_to(np.arange(start, start + len(chunk)), scores.shape)
+            best_rows, best_scores = self._top_k(
+                np.hstack([best_scores, scores]), np.hstack([best_rows, rows]), k
+            )
+
+        return best_rows.tolist(), best_scores.tolist()
+
+    def _scan_ivf(self, queries: np.ndarray, vectors: np.ndarray, k: int, nprobe: int):
+        """Approximate search over the nprobe closest IVF lists"""
+        lists = np.asarray(self._lists())
+        order = np.argsort(lists, kind='stable')
+        bounds = np.searchsorted(lists[order], np.arange(len(self.centroids) + 1))
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :nprobe]
+
+        all_rows, all_scores = [], []
+        for query, probe in zip(queries, probes):
+            candidates = np.sort(np.concatenate([order[bounds[p]:bounds[p + 1]] for p in probe]))
+            if not len(candidates):
+                all_rows.append([])
+                all_scores.append([])
+                continue
+            scores = np.asarray(vectors[candidates], dtype=np.float32) @ query
+            rows, scores = self._top_k(scores[None, :], candidates[None, :], k)
+            all_rows.append(rows[0].tolist())
+            all_scores.append(scores[0].tolist())
+
+        return all_rows, all_scores
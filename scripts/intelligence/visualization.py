@@ -22,6 +22,8 @@ from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from interaction_graph import InteractionGraph
+
 
 class IntelligenceVisualizer:
     """
@@ -216,25 +218,33 @@ class IntelligenceVisualizer:
     
     def create_influence_map(
         self,
-        user_graph: nx.DiGraph,
+        user_graph,
         top_n: int = 20,
         title: str = "Influence Network Map"
     ) -> go.Figure:
         """
         Create influence network with PageRank-sized nodes.
         
-        Shows who influences whom in the AI/ML community.
+        Shows who influences whom in the AI/ML community. Accepts an
+        InteractionGraph (PageRank on the sparse matrix, networkx only
+        for the top users) or a networkx DiGraph.
         """
         
         # Compute PageRank
-        pagerank = nx.pagerank(user_graph)
+        if isinstance(user_graph, InteractionGraph):
+            pagerank = user_graph.pagerank()
+        else:
+            pagerank = nx.pagerank(user_graph)
         
         # Get top N users
         top_users = sorted(pagerank.items(), key=lambda x: x[1], reverse=True)[:top_n]
         top_user_names = [u[0] for u in top_users]
         
         # Create subgraph
-        subgraph = user_graph.subgraph(top_user_names)
+        if isinstance(user_graph, InteractionGraph):
+            subgraph = user_graph.to_networkx(top_user_names)
+        else:
+            subgraph = user_graph.subgraph(top_user_names)
         
         # Get positions
         pos = nx.spring_layout(subgraph, k=1, iterations=50)
@@ -371,10 +381,13 @@ class IntelligenceVisualizer:
         # Group signals by hour
         hourly_data = defaultdict(lambda: {'count': 0, 'engagement': 0})
         
+        # Signals are the pipeline's dicts (see signal_stream.normalize_signal)
         for signal in signals:
-            hour = signal.timestamp.replace(minute=0, second=0, microsecond=0)
+            hour = signal['timestamp'].replace(minute=0, second=0, microsecond=0)
             hourly_data[hour]['count'] += 1
-            hourly_data[hour]['engagement'] += sum(signal.engagement.values())
+            hourly_data[hour]['engagement'] += sum(
+                v for v in signal['engagement'].values() if isinstance(v, (int, float))
+            )
         
         # Sort by time
         times = sorted(hourly_data.keys())
@@ -4,7 +4,9 @@ Memory Manager for AI-Generated Blog Posts
 
 Provides persistent memory across blog generations to:
 - Prevent duplicate content (SHA256 fingerprinting)
+- Catch near-duplicates (SimHash + LSH index over post history)
 - Track used jokes/phrases (cooldown system)
+- Retain years of history in tiers (full, compacted, Bloom filter)
 - Maintain consistent tone (persona tracking)
 - Build context for AI prompts
 """
@@ -12,9 +14,15 @@ Provides persistent memory across blog generations to:
 import json
 import hashlib
 import re
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Tuple
+from typing import Dict, Iterable, List, Set, Optional, Tuple
+
+from fingerprints import (
+    SIMHASH_BITS, BloomFilter, SimHashIndex, bands_for, simhash, to_hex,
+    from_hex, max_distance_for
+)
 
 # Paths
 SCRIPT_DIR = Path(__file__).parent
@@ -22,10 +30,169 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 MEMORY_DIR = PROJECT_ROOT / "data" / "memory"
 POSTS_DIR = PROJECT_ROOT / "docs" / "_posts"
 
+# Published post filename suffix for each workflow ({date}-{suffix}.md)
+POST_SUFFIXES = {
+    'ollama-pulse': 'ollama-daily-learning',
+    'ai-research-daily': 'ai-research-daily',
+    'idea-vault': 'idea-vault',
+}
+
+# Posts at or above this SimHash similarity count as near-duplicates
+NEAR_DUPLICATE_THRESHOLD = 0.9
+
+# Retention tiers: full entries for recent posts, compacted summaries
+# (date, slug, fingerprint, SimHash) for older ones, and a Bloom filter
+# holding every fingerprint and joke ever used
+RECENT_LIMIT = 30
+ARCHIVE_LIMIT = 730
+
 # Ensure memory directory exists
 MEMORY_DIR.mkdir(parents=True, exist_ok=True)
 
 
+# Common joke patterns
+JOKE_PATTERNS = [
+    r'(?:LLM|GPU|AI|ML)[-\s](?:latté|golf|hype|brew|magic)',
+    r'byte[-\s]brew',
+    r'neural[-\s]network[-\s](?:ninja|wizard)',
+    r'tensor[-\s](?:time|trouble)',
+    r'gradient[-\s]descent[-\s](?:into|madness)',
+    r'overfitting[-\s](?:to|the)',
+    r'(?:my|your)[-\s]\d+[-\s]year[-\s]old',
+    r'plot[-\s]twist',
+    r'spoiler[-\s]alert',
+    r'mic[-\s]drop',
+]
+
+TONE_INDICATORS = [
+    'technical', 'forward-looking', 'optimistic', 'analytical',
+    'community', 'helpful', 'neutral', 'excited', 'cautious',
+    'breakthrough', 'incremental', 'controversial', 'pedagogical',
+    'rigorous', 'measured', 'curious', 'energetic', 'grounded',
+    'inquisitive', 'reflective', 'balanced', 'insightful'
+]
+
+# Persona markers used to infer tone when no indicator is present,
+# in priority order
+PERSONA_MARKERS = [
+    (('💡', 'hype'), 'energetic'),
+    (('🛠️', 'fix'), 'grounded'),
+    (('🤔', 'curious'), 'inquisitive'),
+    (('📈', 'trend'), 'reflective'),
+    (('📚', 'scholar'), 'pedagogical'),
+]
+
+# Quoted phrases only count as jokes if they mention one of these
+QUOTE_KEYWORDS = ('llm', 'ai', 'model', 'gpu', 'neural')
+
+
+@dataclass
+class ScanResult:
+    """Jokes and tone words found in one post"""
+    tone_words: List[str]
+    jokes: List[str]
+
+
+class ContentScanner:
+    """
+    Single-pass scanner for jokes, quoted phrases and tone indicators.
+
+    All patterns are compiled into one alternation and matched against
+    the lowercased post in a single finditer() walk. Quoted phrases only
+    consume their opening quote, so jokes inside quotes are still found.
+    """
+
+    def __init__(
+        self,
+        joke_patterns: List[str] = JOKE_PATTERNS,
+        tone_indicators: List[str] = TONE_INDICATORS,
+        persona_markers: List[Tuple[Tuple[str, ...], str]] = PERSONA_MARKERS
+    ):
+        self.persona_markers = persona_markers
+        self.marker_tones = {
+            marker.lower(): tone
+            for markers, tone in persona_markers
+            for marker in markers
+        }
+
+        # Pattern text is left as written: lowercasing it would turn
+        # \S, \W, \D and \B into their opposites
+        jokes = '|'.join(f'(?:{p})' for p in joke_patterns)
+        tones = '|'.join(re.escape(t.lower()) for t in sorted(tone_indicators, key=len, reverse=True))
+        markers = '|'.join(re.escape(m) for m in sorted(self.marker_tones, key=len, reverse=True))
+
+        # Content is still lowercased up front so matches come out as
+        # lowercase identifiers
+        self.pattern = re.compile(
+            rf'(?P<joke>{jokes})'
+            rf'|"(?=(?P<quoted>[^"]{{10,50}})")'
+            rf'|(?<!\w)(?P<tone>{tones})(?!\w)'
+            rf'|(?P<marker>{markers})',
+            re.IGNORECASE
+        )
+
+    def scan(self, content: str) -> ScanResult:
+        """
+        Scan a post for jokes, quoted phrases and tone indicators
+
+        Args:
+            content: Markdown content
+
+        Returns:
+            ScanResult with up to 5 tone words and 10 unique jokes
+        """
+        jokes: Dict[str, None] = {}
+        tones: Dict[str, None] = {}
+        markers: Set[str] = set()
+        quote_close = -1
+
+        for match in self.pattern.finditer(content.lower()):
+            kind = match.lastgroup
+            if kind == 'joke':
+                joke = match.group('joke')
+                jokes[joke.replace(' ', '-')] = None
+                # Jokes consume their text; keep markers like 'ai hype'
+                markers.update(t for m, t in self.marker_tones.items() if m in joke)
+            elif kind == 'quoted':
+                # A closing quote can't open the next phrase
+                if match.start() == quote_close:
+                    continue
+                quote = match.group('quoted')
+                quote_close = match.end('quoted')
+                if any(word in quote for word in QUOTE_KEYWORDS):
+                    # Create identifier from first 3 words
+                    jokes['-'.join(quote.split()[:3])] = None
+            elif kind == 'tone':
+                tones[match.group('tone')] = None
+            elif kind == 'marker':
+                markers.add(self.marker_tones[match.group('marker')])
+
+        tone_words = list(tones)
+        if not tone_words:
+            # If none found, infer from persona markers
+            for _, tone in self.persona_markers:
+                if tone in markers:
+                    tone_words.append(tone)
+                    break
+
+        return ScanResult(tone_words=tone_words[:5], jokes=list(jokes)[:10])
+
+    def scan_many(self, contents: Iterable[str]) -> List[ScanResult]:
+        """
+        Scan many posts with the same compiled pattern
+
+        Args:
+            contents: Markdown contents
+
+        Returns:
+            One ScanResult per input, in order
+        """
+        return [self.scan(content) for content in contents]
+
+
+CONTENT_SCANNER = ContentScanner()
+
+
 class BlogMemory:
     """Manages persistent memory for a blog workflow"""
     
@@ -39,6 +206,8 @@ class BlogMemory:
         self.workflow_name = workflow_name
         self.memory_file = MEMORY_DIR / f"{workflow_name}_memory.json"
         self.memory = self._load_memory()
+        self.bloom = self._load_bloom()
+        self._simhash_index: Optional[SimHashIndex] = None
     
     def _load_memory(self) -> Dict:
         """Load memory from JSON file"""
@@ -46,22 +215,45 @@ class BlogMemory:
             return {
                 "workflow": self.workflow_name,
                 "last_run": None,
-                "post_history": []
+                "post_history": [],
+                "archive": []
             }
         
         try:
             with open(self.memory_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                memory = json.load(f)
+            memory.setdefault("archive", [])
+            return memory
         except Exception as e:
             print(f"⚠️  Error loading memory: {e}")
             return {
                 "workflow": self.workflow_name,
                 "last_run": None,
-                "post_history": []
+                "post_history": [],
+                "archive": []
             }
+
+    def _load_bloom(self) -> BloomFilter:
+        """Load the all-time Bloom filter, seeding it from history if missing"""
+        if self.memory.get("bloom"):
+            return BloomFilter.from_dict(self.memory["bloom"])
+
+        bloom = BloomFilter()
+        for entry in self.memory["post_history"]:
+            self._remember(bloom, entry)
+        return bloom
+
+    @staticmethod
+    def _remember(bloom: BloomFilter, entry: Dict):
+        """Record an entry's fingerprint and jokes in the Bloom filter"""
+        if entry.get("content_fingerprint"):
+            bloom.add(f"fp:{entry['content_fingerprint']}")
+        for joke in entry.get("used_jokes", []):
+            bloom.add(f"joke:{joke}")
     
     def _save_memory(self):
         """Save memory to JSON file"""
+        self.memory["bloom"] = self.bloom.to_dict()
         try:
             with open(self.memory_file, 'w', encoding='utf-8') as f:
                 json.dump(self.memory, indent=2, fp=f)
@@ -76,8 +268,12 @@ class BlogMemory:
     
     def is_duplicate(self, content: str) -> bool:
         """
-        Check if content is a duplicate of recent posts
-        
+        Check if content is a duplicate of any post still on record
+
+        The Bloom filter rules most posts out without a scan; a hit is
+        only trusted once a recent or archived entry with the same
+        fingerprint confirms it, since the filter has false positives.
+
         Args:
             content: Markdown content to check
             
@@ -85,95 +281,90 @@ class BlogMemory:
             True if duplicate, False otherwise
         """
         fp = self.fingerprint(content)
-        
-        # Check last 7 posts
-        recent = self.memory["post_history"][-7:]
-        for entry in recent:
+
+        if f"fp:{fp}" not in self.bloom:
+            return False
+
+        for entry in reversed(self.memory["archive"] + self.memory["post_history"]):
             if entry.get("content_fingerprint") == fp:
                 print(f"⚠️  Duplicate content detected (matches {entry['date']})")
                 return True
-        
+
+        print("⚠️  Possible duplicate: Bloom filter hit with no matching post on record")
         return False
-    
+
+    def has_used_joke(self, joke: str) -> bool:
+        """
+        Check if a joke/phrase identifier was ever used in this workflow
+
+        Args:
+            joke: Identifier as produced by extract_jokes_phrases()
+
+        Returns:
+            True if used before (subject to the Bloom filter's error rate)
+        """
+        return f"joke:{joke}" in self.bloom
+
+    def simhash_index(self, max_distance: int) -> SimHashIndex:
+        """
+        LSH index over recent and archived posts (built lazily, and
+        rebuilt with more bands if a larger distance budget needs them)
+        """
+        bands = bands_for(max_distance)
+        if self._simhash_index is None or self._simhash_index.bands < bands:
+            self._simhash_index = SimHashIndex(bands)
+            for entry in self.memory["archive"] + self.memory["post_history"]:
+                if entry.get("simhash"):
+                    self._simhash_index.add(entry["date"], from_hex(entry["simhash"]))
+        return self._simhash_index
+
+    def find_near_duplicate(
+        self,
+        content: str,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar prior post above a similarity threshold
+
+        Args:
+            content: Markdown content to check
+            threshold: Minimum SimHash similarity (0-1) to report
+
+        Returns:
+            (date, similarity) of the closest match, or None
+        """
+        max_distance = max_distance_for(threshold)
+        match = self.simhash_index(max_distance).nearest(simhash(content), max_distance)
+        if not match:
+            return None
+
+        date, distance = match
+        return date, 1.0 - distance / SIMHASH_BITS
+
     def extract_tone_words(self, content: str) -> List[str]:
         """
         Extract tone indicators from content
-        
+
         Args:
             content: Markdown content
-            
+
         Returns:
             List of tone words
         """
-        tone_indicators = {
-            'technical', 'forward-looking', 'optimistic', 'analytical',
-            'community', 'helpful', 'neutral', 'excited', 'cautious',
-            'breakthrough', 'incremental', 'controversial', 'pedagogical',
-            'rigorous', 'measured', 'curious', 'energetic', 'grounded',
-            'inquisitive', 'reflective', 'balanced', 'insightful'
-        }
-        
-        # Extract words from content
-        words = set(re.findall(r'\b\w+\b', content.lower()))
-        
-        # Find matching tone indicators
-        found_tones = list(words & tone_indicators)
-        
-        # If none found, infer from persona markers
-        if not found_tones:
-            if '💡' in content or 'hype' in content.lower():
-                found_tones.append('energetic')
-            elif '🛠️' in content or 'fix' in content.lower():
-                found_tones.append('grounded')
-            elif '🤔' in content or 'curious' in content.lower():
-                found_tones.append('inquisitive')
-            elif '📈' in content or 'trend' in content.lower():
-                found_tones.append('reflective')
-            elif '📚' in content or 'scholar' in content.lower():
-                found_tones.append('pedagogical')
-        
-        return found_tones[:5]  # Limit to 5
-    
+        return CONTENT_SCANNER.scan(content).tone_words
+
     def extract_jokes_phrases(self, content: str) -> List[str]:
         """
         Extract memorable jokes/phrases from content
-        
+
         Args:
             content: Markdown content
-            
+
         Returns:
             List of joke/phrase identifiers
         """
-        jokes = []
-        
-        # Common joke patterns
-        patterns = [
-            r'(?:LLM|GPU|AI|ML)[-\s](?:latté|golf|hype|brew|magic)',
-            r'byte[-\s]brew',
-            r'neural[-\s]network[-\s](?:ninja|wizard)',
-            r'tensor[-\s](?:time|trouble)',
-            r'gradient[-\s]descent[-\s](?:into|madness)',
-            r'overfitting[-\s](?:to|the)',
-            r'(?:my|your)[-\s]\d+[-\s]year[-\s]old',
-            r'plot[-\s]twist',
-            r'spoiler[-\s]alert',
-            r'mic[-\s]drop',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            jokes.extend([m.lower().replace(' ', '-') for m in matches])
-        
-        # Extract quoted phrases (potential jokes)
-        quoted = re.findall(r'"([^"]{10,50})"', content)
-        for quote in quoted:
-            if any(word in quote.lower() for word in ['llm', 'ai', 'model', 'gpu', 'neural']):
-                # Create identifier from first 3 words
-                words = quote.split()[:3]
-                jokes.append('-'.join(words).lower())
-        
-        return list(set(jokes))[:10]  # Limit to 10, unique
-    
+        return CONTENT_SCANNER.scan(content).jokes
+
     def get_joke_blacklist(self, cooldown_days: int = 7) -> Set[str]:
         """
         Get jokes that should not be reused (within cooldown period)
@@ -236,43 +427,128 @@ class BlogMemory:
             title_slug: URL-friendly title
             content: Full markdown content
         """
+        scan = CONTENT_SCANNER.scan(content)
         entry = {
             "date": date,
             "title_slug": title_slug,
-            "tone_words": self.extract_tone_words(content),
-            "used_jokes": self.extract_jokes_phrases(content),
-            "content_fingerprint": self.fingerprint(content)
+            "tone_words": scan.tone_words,
+            "used_jokes": scan.jokes,
+            "content_fingerprint": self.fingerprint(content),
+            "simhash": to_hex(simhash(content))
         }
-        
+
         self.memory["post_history"].append(entry)
+        self._remember(self.bloom, entry)
+        self._compact()
+        self._simhash_index = None
         self.memory["last_run"] = datetime.now().isoformat()
         
-        # Keep only last 30 entries (save space)
-        self.memory["post_history"] = self.memory["post_history"][-30:]
-        
         self._save_memory()
         
         print(f"✅ Added post to memory: {date} ({len(entry['tone_words'])} tones, {len(entry['used_jokes'])} jokes)")
     
-    def should_post(self, content: str) -> Tuple[bool, str]:
+    def _compact(self):
+        """
+        Move entries beyond RECENT_LIMIT into the compacted archive
+
+        Archived entries keep only what duplicate detection needs (the
+        content fingerprint, to confirm Bloom filter hits, and the
+        SimHash); their jokes already live in the Bloom filter. Archive
+        entries beyond ARCHIVE_LIMIT are dropped entirely.
+        """
+        history = self.memory["post_history"]
+        if len(history) > RECENT_LIMIT:
+            overflow = history[:-RECENT_LIMIT]
+            self.memory["post_history"] = history[-RECENT_LIMIT:]
+            self.memory["archive"].extend(
+                {
+                    "date": entry["date"],
+                    "title_slug": entry.get("title_slug", ""),
+                    "content_fingerprint": entry.get("content_fingerprint"),
+                    "simhash": entry.get("simhash")
+                }
+                for entry in overflow
+            )
+
+        self.memory["archive"] = self.memory["archive"][-ARCHIVE_LIMIT:]
+
+        if self.bloom.is_saturated:
+            print(f"⚠️  Bloom filter over capacity ({self.bloom.count}/{self.bloom.capacity}) - false positives rising")
+
+    def reindex_posts(
+        self,
+        posts_dir: Path = POSTS_DIR,
+        scanner: Optional[ContentScanner] = None
+    ) -> int:
+        """
+        Re-extract jokes and tone words for every post in history
+
+        Run this after changing JOKE_PATTERNS or TONE_INDICATORS so that
+        older entries are judged by the same rules as new ones.
+
+        Args:
+            posts_dir: Directory holding published posts
+            scanner: Scanner to use (defaults to CONTENT_SCANNER)
+
+        Returns:
+            Number of entries re-indexed
+        """
+        scanner = scanner or CONTENT_SCANNER
+        suffix = POST_SUFFIXES.get(self.workflow_name, self.workflow_name)
+
+        entries = []
+        contents = []
+        for entry in self.memory["post_history"]:
+            post_file = posts_dir / f"{entry['date']}-{suffix}.md"
+            if not post_file.exists():
+                continue
+            entries.append(entry)
+            contents.append(post_file.read_text(encoding='utf-8'))
+
+        for entry, scan in zip(entries, scanner.scan_many(contents)):
+            entry["tone_words"] = scan.tone_words
+            entry["used_jokes"] = scan.jokes
+            self._remember(self.bloom, entry)
+
+        if entries:
+            self._save_memory()
+
+        print(f"✅ Re-indexed {len(entries)}/{len(self.memory['post_history'])} posts for {self.workflow_name}")
+        return len(entries)
+
+    def should_post(
+        self,
+        content: str,
+        similarity_threshold: float = NEAR_DUPLICATE_THRESHOLD,
+        date: Optional[str] = None
+    ) -> Tuple[bool, str]:
         """
         Determine if content should be posted
-        
+
         Args:
             content: Markdown content to check
-            
+            similarity_threshold: SimHash similarity that counts as a near-duplicate
+            date: Post date (YYYY-MM-DD) the draft is for, defaults to today
+
         Returns:
             (should_post, reason)
         """
         # Check for duplicate
         if self.is_duplicate(content):
             return False, "Duplicate content detected"
-        
-        # Check if already posted today
-        today = datetime.now().strftime("%Y-%m-%d")
-        for entry in self.memory["post_history"][-3:]:  # Check last 3
-            if entry["date"] == today:
-                return False, f"Already posted today ({today})"
+
+        # Check for near-duplicate (same post with a new timestamp/opening line)
+        near = self.find_near_duplicate(content, similarity_threshold)
+        if near:
+            date, score = near
+            return False, f"Near-duplicate of {date} post ({score:.0%} similar)"
+
+        # Check if already posted on that day (back-dated or replayed
+        # drafts can land anywhere in recent history)
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        for entry in self.memory["post_history"]:
+            if entry["date"] == date:
+                return False, f"Already posted on {date}"
         
         return True, "Content is unique and ready to post"
 
@@ -282,15 +558,21 @@ def main():
     import sys
     
     if len(sys.argv) < 2:
-        print("Usage: python memory_manager.py <workflow-name>")
+        print("Usage: python memory_manager.py <workflow-name> [--reindex]")
         print("  workflow-name: 'ollama-pulse' or 'ai-research-daily'")
+        print("  --reindex: re-extract jokes/tones from published posts")
         sys.exit(1)
     
     workflow = sys.argv[1]
     memory = BlogMemory(workflow)
+
+    if '--reindex' in sys.argv[2:]:
+        memory.reindex_posts()
     
     print(f"\n📊 Memory Status for {workflow}")
     print(f"Total posts in memory: {len(memory.memory['post_history'])}")
+    print(f"Archived posts: {len(memory.memory['archive'])}")
+    print(f"Bloom filter: {memory.bloom.count}/{memory.bloom.capacity} items")
     print(f"Last run: {memory.memory.get('last_run', 'Never')}")
     print(f"\n{memory.get_context_summary()}")
     
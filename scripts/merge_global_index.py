@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Global Index Merge Driver - Union concurrent global_index.json updates
+
+Each workflow runs on its own runner and pushes its own copy of
+data/memory/global_index.json, so the file flock in global_index.py
+can't serialize them. Git calls this driver (see .gitattributes) when
+a push has to be rebased onto another feed's update, and the two
+versions are merged entry by entry instead of conflicting.
+
+Setup (once per clone, the workflows do this before pushing):
+    git config merge.global-index.driver "python scripts/merge_global_index.py %O %A %B"
+
+Usage:
+    python merge_global_index.py <base> <ours> <theirs>
+
+The merged index is written to <ours>. Exit code 0 = merged, 1 = error
+(git then reports a conflict).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from global_index import merge_indexes
+
+
+def _read(path: Path) -> dict:
+    text = path.read_text(encoding='utf-8') if path.exists() else ""
+    return json.loads(text) if text.strip() else {}
+
+
+def main():
+    if len(sys.argv) != 4:
+        print("Usage: python merge_global_index.py <base> <ours> <theirs>")
+        sys.exit(1)
+
+    base, ours, theirs = (Path(arg) for arg in sys.argv[1:])
+    try:
+        merged = merge_indexes(_read(base), _read(ours), _read(theirs))
+    except Exception as e:
+        print(f"❌ Could not merge global index: {e}")
+        sys.exit(1)
+
+    ours.write_text(json.dumps(merged, indent=2), encoding='utf-8')
+    print(f"✅ Merged global index ({len(merged['posts'])} posts)")
+
+
+if __name__ == "__main__":
+    main()
@@ -173,8 +173,13 @@ def create_teaser_note(
     return event
 
 
-async def publish_to_relay(relay_url: str, event: Dict, session: aiohttp.ClientSession) -> bool:
-    """Publish event to a single relay"""
+async def publish_to_relay(relay_url: str, event: Dict, session) -> bool:
+    """
+    Publish event to a single relay
+
+    `session` is an aiohttp.ClientSession or a CrawlerRuntime (whose
+    ws_connect adds per-relay circuit breaking and timings).
+    """
     try:
         # Convert to WebSocket URL if needed
         ws_url = relay_url.replace('http://', 'ws://').replace('https://', 'wss://')
@@ -196,8 +201,14 @@ async def publish_to_relay(relay_url: str, event: Dict, session: aiohttp.ClientS
         return False
 
 
-async def broadcast_events(events: List[Dict], relays: List[str]) -> Dict[str, int]:
-    """Broadcast events to all relays in parallel"""
+async def broadcast_events(events: List[Dict], relays: List[str], runtime=None) -> Dict:
+    """
+    Broadcast events to all relays in parallel (optionally through a shared CrawlerRuntime)
+
+    Returns:
+        Success/failure counts, and per relay the outcome of each event
+        ('article'/'teaser' -> 'success', 'rejected' or 'error')
+    """
     results = {
         "total_relays": len(relays),
         "successful": 0,
@@ -205,7 +216,7 @@ async def broadcast_events(events: List[Dict], relays: List[str]) -> Dict[str, i
         "relay_results": {}
     }
     
-    async with aiohttp.ClientSession() as session:
+    async with (runtime or aiohttp.ClientSession()) as session:
         for event in events:
             event_kind = "article" if event['kind'] == KIND_LONG_FORM else "teaser"
             print(f"\n📡 Broadcasting {event_kind} to {len(relays)} relays...")
@@ -214,16 +225,17 @@ async def broadcast_events(events: List[Dict], relays: List[str]) -> Dict[str, i
             relay_results = await asyncio.gather(*tasks, return_exceptions=True)
             
             for relay, success in zip(relays, relay_results):
+                per_event = results["relay_results"].setdefault(relay, {})
                 if isinstance(success, Exception):
                     results["failed"] += 1
-                    results["relay_results"][relay] = "error"
+                    per_event[event_kind] = "error"
                 elif success:
                     results["successful"] += 1
-                    results["relay_results"][relay] = "success"
+                    per_event[event_kind] = "success"
                     print(f"  ✅ {relay}")
                 else:
                     results["failed"] += 1
-                    results["relay_results"][relay] = "rejected"
+                    per_event[event_kind] = "rejected"
                     print(f"  ❌ {relay}")
     
     return results
@@ -265,29 +277,19 @@ def get_viral_hashtags(source: str, content: str) -> List[str]:
     return tags[:7]  # Limit to 7 hashtags for optimal visibility
 
 
-def main():
-    """Main publishing function"""
-    import sys
-    
-    if len(sys.argv) < 4:
-        print("Usage: python post_to_nostr.py <markdown_file> <source> <pubkey> [private_key]")
-        print("  source: 'ollama-pulse' or 'ai-research-daily'")
-        sys.exit(1)
-    
-    md_file = Path(sys.argv[1])
-    source = sys.argv[2]
-    pubkey = sys.argv[3]
-    private_key = sys.argv[4] if len(sys.argv) > 4 else None
-    
-    if not private_key:
-        print("⚠️  WARNING: No private key provided - using placeholder signatures")
-        print("   Set NOSTR_PRIVATE_KEY environment variable or pass as argument")
-        private_key = "PLACEHOLDER"
-    
-    # Load blog post
-    with open(md_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+def build_events(content: str, source: str, pubkey: str, private_key: str) -> List[Dict]:
+    """
+    Build the long-form article and teaser note for a blog post
+
+    Args:
+        content: Markdown content
+        source: 'ollama-pulse' or 'ai-research-daily'
+        pubkey: Nostr public key
+        private_key: Nostr private key
+
+    Returns:
+        [article_event, teaser_event]
+    """
     # Extract metadata (TODO: Parse Jekyll front matter properly)
     title = f"GrumpiBlogged - {datetime.now().strftime('%Y-%m-%d')}"
     summary = "Daily AI ecosystem intelligence, translated for humans"
@@ -318,17 +320,62 @@ def main():
         pubkey=pubkey,
         private_key=private_key
     )
-    
+
+    return [article_event, teaser_event]
+
+
+async def publish_content(content: str, source: str, pubkey: str, private_key: str, runtime=None) -> Dict:
+    """
+    Build and broadcast a blog post to the configured relays
+
+    Args:
+        content: Markdown content
+        source: 'ollama-pulse' or 'ai-research-daily'
+        pubkey: Nostr public key
+        private_key: Nostr private key
+        runtime: Optional CrawlerRuntime to publish through
+
+    Returns:
+        Broadcast results (see broadcast_events)
+    """
+    events = build_events(content, source, pubkey, private_key)
+
     # Load relay config and broadcast
     config = load_relay_config()
     relays = get_publishing_relays(config)
     
     print(f"\n🎯 Publishing to {len(relays)} relays...")
-    print(f"   Article ID: {article_event['id'][:16]}...")
-    print(f"   Teaser ID: {teaser_event['id'][:16]}...")
+    print(f"   Article ID: {events[0]['id'][:16]}...")
+    print(f"   Teaser ID: {events[1]['id'][:16]}...")
     
     # Broadcast both events
-    results = asyncio.run(broadcast_events([article_event, teaser_event], relays))
+    return await broadcast_events(events, relays, runtime=runtime)
+
+
+def main():
+    """Main publishing function"""
+    import sys
+    
+    if len(sys.argv) < 4:
+        print("Usage: python post_to_nostr.py <markdown_file> <source> <pubkey> [private_key]")
+        print("  source: 'ollama-pulse' or 'ai-research-daily'")
+        sys.exit(1)
+    
+    md_file = Path(sys.argv[1])
+    source = sys.argv[2]
+    pubkey = sys.argv[3]
+    private_key = sys.argv[4] if len(sys.argv) > 4 else None
+    
+    if not private_key:
+        print("⚠️  WARNING: No private key provided - using placeholder signatures")
+        print("   Set NOSTR_PRIVATE_KEY environment variable or pass as argument")
+        private_key = "PLACEHOLDER"
+    
+    # Load blog post
+    with open(md_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    results = asyncio.run(publish_content(content, source, pubkey, private_key))
     
     print(f"\n✅ Publishing complete!")
     print(f"   Successful: {results['successful']}/{results['total_relays'] * 2}")
@@ -337,4 +384,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
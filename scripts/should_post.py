@@ -6,6 +6,9 @@ Checks:
 1. Content fingerprint (prevent duplicates)
 2. Already posted today (prevent double-posting)
 3. Content quality (basic validation)
+4. Cross-workflow overlap (shared global index)
+
+Thresholds are read per workflow from config/content_guard.json.
 
 Usage:
     python should_post.py <markdown-file> <workflow-name>
@@ -18,6 +21,7 @@ Exit codes:
 import sys
 from pathlib import Path
 from memory_manager import BlogMemory
+from global_index import GlobalContentIndex, load_guard_config
 
 
 def validate_content(content: str) -> tuple[bool, str]:
@@ -77,8 +81,16 @@ def main():
         sys.exit(1)
     
     # Check memory
+    config = load_guard_config(workflow)
     memory = BlogMemory(workflow)
-    should_post, reason = memory.should_post(content)
+    should_post, reason = memory.should_post(
+        content,
+        similarity_threshold=config["near_duplicate_threshold"]
+    )
+
+    # Check other workflows
+    if should_post:
+        should_post, reason = GlobalContentIndex().check(content, workflow, config=config)
     
     if should_post:
         print(f"✅ SHOULD POST: {reason}")
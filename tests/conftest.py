@@ -0,0 +1,14 @@
+"""
+Shared test setup
+
+The scripts are run as plain files (no package), importing siblings by
+module name, so tests put both script directories on sys.path the same
+way generate_intelligence_blog.py does.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "scripts" / "intelligence"))
@@ -0,0 +1,178 @@
+"""
+Recorded HTTP responses replay by request, with the same headers and
+seeded injected errors
+"""
+
+import asyncio
+
+import aiohttp
+import pytest
+from multidict import CIMultiDict
+
+from cassette import Cassette, CassetteResponse
+
+
+class FakeResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self.headers = CIMultiDict([
+            ('Content-Type', 'application/json'),
+            ('Content-Encoding', 'gzip'),
+            ('Set-Cookie', 'a=1'),
+            ('Set-Cookie', 'b=2'),
+        ])
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+class FakeSession:
+    """Answers with a counter so replays can be told apart"""
+
+    def __init__(self):
+        self.calls = 0
+        self.closed = False
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        status = 500 if url.endswith("/broken") else 200
+        return FakeResponse(status, f'{{"call": {self.calls}}}'.encode())
+
+    async def close(self):
+        self.closed = True
+
+
+def _record(path):
+    async def run():
+        session = Cassette(path, mode='record').wrap(FakeSession())
+        await session.request('GET', 'https://hn.example/item', params={'id': 1})
+        await session.request('GET', 'https://hn.example/item', params={'id': 2})
+        await session.request('POST', 'https://ollama.example/chat', json={'prompt': 'first'})
+        await session.request('POST', 'https://ollama.example/chat', json={'prompt': 'second'})
+        await session.request('GET', 'https://hn.example/broken')
+        await session.close()
+
+    asyncio.run(run())
+
+
+async def _json(session, method, url, **kwargs):
+    response = await session.request(method, url, **kwargs)
+    return await response.json()
+
+
+def test_replay_serves_recorded_bodies_by_request(tmp_path):
+    path = tmp_path / "run.json.gz"
+    _record(path)
+
+    cassette = Cassette(path)
+    session = cassette.wrap(FakeSession())
+
+    async def run():
+        return [
+            await _json(session, 'GET', 'https://hn.example/item', params={'id': 2}),
+            await _json(session, 'GET', 'https://hn.example/item', params={'id': 1}),
+            await _json(session, 'POST', 'https://ollama.example/chat', json={'prompt': 'second'}),
+        ]
+
+    assert asyncio.run(run()) == [{'call': 2}, {'call': 1}, {'call': 4}]
+    assert cassette.stats['served'] == 3
+    assert session.session.calls == 0
+    # Recorded headers must not claim a compression the body no longer has
+    assert all(
+        name.lower() != 'content-encoding'
+        for i in cassette.interactions for name, _ in i['headers']
+    )
+
+
+def test_record_and_replay_return_the_same_headers(tmp_path):
+    path = tmp_path / "run.json.gz"
+
+    async def record():
+        session = Cassette(path, mode='record').wrap(FakeSession())
+        response = await session.request('GET', 'https://hn.example/item', params={'id': 1})
+        await session.close()
+        return response
+
+    recorded = asyncio.run(record())
+    replayed = asyncio.run(Cassette(path).wrap(FakeSession()).request('GET', 'https://hn.example/item', params={'id': 1}))
+
+    for response in (recorded, replayed):
+        assert response.headers.getall('Set-Cookie') == ['a=1', 'b=2']
+        assert 'Content-Encoding' not in response.headers
+    assert list(recorded.headers.items()) == list(replayed.headers.items())
+
+
+def test_unmatched_body_falls_back_to_recordings_in_order(tmp_path):
+    path = tmp_path / "run.json.gz"
+    _record(path)
+    cassette = Cassette(path)
+    session = cassette.wrap(FakeSession())
+
+    async def run():
+        url = 'https://ollama.example/chat'
+        return [await _json(session, 'POST', url, json={'prompt': 'today'}) for _ in range(3)]
+
+    # Both recordings in order, then the last one keeps being served
+    assert asyncio.run(run()) == [{'call': 3}, {'call': 4}, {'call': 4}]
+    assert cassette.stats['loose_matches'] == 3
+
+
+def test_missing_recording_is_a_404(tmp_path):
+    path = tmp_path / "run.json.gz"
+    _record(path)
+    cassette = Cassette(path)
+
+    response = asyncio.run(cassette.wrap(FakeSession()).request('GET', 'https://reddit.example/r/x'))
+
+    assert response.status == 404
+    assert cassette.stats['misses'] == 1
+    with pytest.raises(aiohttp.ClientResponseError):
+        response.raise_for_status()
+
+
+def test_recorded_errors_replay_as_errors(tmp_path):
+    path = tmp_path / "run.json.gz"
+    _record(path)
+
+    response = asyncio.run(Cassette(path).wrap(FakeSession()).request('GET', 'https://hn.example/broken'))
+
+    assert isinstance(response, CassetteResponse)
+    with pytest.raises(aiohttp.ClientResponseError):
+        response.raise_for_status()
+
+
+def test_injected_errors_are_seeded(tmp_path):
+    path = tmp_path / "run.json.gz"
+    _record(path)
+
+    def failures(seed):
+        cassette = Cassette(path, error_rate=0.5, seed=seed)
+        session = cassette.wrap(FakeSession())
+        pattern = []
+
+        async def run():
+            for _ in range(20):
+                try:
+                    await session.request('GET', 'https://hn.example/item', params={'id': 1})
+                    pattern.append(False)
+                except aiohttp.ClientConnectionError:
+                    pattern.append(True)
+
+        asyncio.run(run())
+        return pattern, cassette.stats['injected_errors']
+
+    first, injected = failures(seed=7)
+    assert failures(seed=7) == (first, injected)
+    assert 0 < injected < 20
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(tmp_path / "run.json.gz", mode='live')
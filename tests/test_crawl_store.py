@@ -0,0 +1,119 @@
+"""
+Cached crawl items expire and survive reopening; interrupted runs resume
+with the items they already finished
+"""
+
+import time
+
+import crawl_store
+from crawl_store import CrawlStore
+
+
+def test_items_round_trip_and_count_hits(tmp_path):
+    with CrawlStore(tmp_path / "store.sqlite") as store:
+        assert store.get("hackernews-item", 1) is None
+        store.put("hackernews-item", 1, {"title": "Show HN", "kids": [2, 3]})
+
+        assert store.get("hackernews-item", "1") == {"title": "Show HN", "kids": [2, 3]}
+        assert store.get("reddit-comments", 1) is None
+        assert (store.hits, store.misses) == (1, 2)
+
+
+def test_items_survive_reopening(tmp_path):
+    path = tmp_path / "store.sqlite"
+    with CrawlStore(path) as store:
+        store.put("hackernews-item", 7, {"score": 12})
+
+    with CrawlStore(path) as store:
+        assert store.get("hackernews-item", 7) == {"score": 12}
+
+
+def test_max_age_treats_old_items_as_missing(tmp_path, monkeypatch):
+    with CrawlStore(tmp_path / "store.sqlite") as store:
+        store.put("hackernews-item", 1, {"score": 1})
+
+        later = time.time() + crawl_store.REFRESH_AFTER + 60
+        monkeypatch.setattr(crawl_store.time, "time", lambda: later)
+
+        assert store.get("hackernews-item", 1, max_age=crawl_store.REFRESH_AFTER) is None
+        assert store.get("hackernews-item", 1) == {"score": 1}
+
+
+def test_prune_drops_only_expired_items(tmp_path, monkeypatch):
+    with CrawlStore(tmp_path / "store.sqlite") as store:
+        store.put("hackernews-item", "old", {})
+        now = time.time() + crawl_store.MAX_ITEM_AGE + 60
+        monkeypatch.setattr(crawl_store.time, "time", lambda: now)
+        store.put("hackernews-item", "new", {})
+
+        store.prune()
+
+        assert store.get("hackernews-item", "old") is None
+        assert store.get("hackernews-item", "new") == {}
+
+
+def test_interrupted_run_resumes_with_its_done_items(tmp_path):
+    path = tmp_path / "store.sqlite"
+    with CrawlStore(path) as store:
+        assert store.begin_run("hackernews", "2026-10-19") == set()
+        store.mark_done("hackernews", 101)
+        store.mark_done("hackernews", 102)
+        # Killed before end_run()
+
+    with CrawlStore(path) as store:
+        assert store.begin_run("hackernews", "2026-10-19") == {"101", "102"}
+        store.mark_done("hackernews", 103)
+        store.end_run("hackernews")
+
+        cursor = store.get_cursor("hackernews")
+        assert cursor["complete"]
+        assert "done" not in cursor
+        assert store.conn.execute("SELECT COUNT(*) FROM run_items").fetchone()[0] == 0
+
+
+def test_mark_done_does_not_rewrite_the_cursor(tmp_path):
+    with CrawlStore(tmp_path / "store.sqlite") as store:
+        store.begin_run("hackernews", "2026-10-19")
+        before = store.conn.execute("SELECT value, updated_at FROM cursors").fetchone()
+
+        for item_id in range(500):
+            store.mark_done("hackernews", item_id)
+        store.mark_done("hackernews", 7)  # Re-marking is a no-op
+
+        assert store.conn.execute("SELECT value, updated_at FROM cursors").fetchone() == before
+        assert len(store.begin_run("hackernews", "2026-10-19")) == 500
+
+
+def test_resumes_legacy_cursor_with_inline_done_ids(tmp_path):
+    with CrawlStore(tmp_path / "store.sqlite") as store:
+        store.set_cursor("reddit", {"run_id": "2026-10-19", "done": ["a", "b"], "complete": False})
+        assert store.begin_run("reddit", "2026-10-19") == {"a", "b"}
+
+
+def test_finished_or_different_run_starts_fresh(tmp_path):
+    with CrawlStore(tmp_path / "store.sqlite") as store:
+        store.begin_run("reddit", "2026-10-18")
+        store.mark_done("reddit", "abc")
+        store.end_run("reddit")
+        finished_at = store.get_cursor("reddit")["last_complete"]
+
+        # Same id after completion: nothing to resume
+        assert store.begin_run("reddit", "2026-10-18") == set()
+
+        store.mark_done("reddit", "def")
+        assert store.begin_run("reddit", "2026-10-19") == set()
+
+        cursor = store.get_cursor("reddit")
+        assert cursor["run_id"] == "2026-10-19"
+        assert not cursor["complete"]
+        assert cursor["last_complete"] == finished_at
+
+
+def test_cursors_are_per_source(tmp_path):
+    with CrawlStore(tmp_path / "store.sqlite") as store:
+        assert store.get_cursor("searxng") == {}
+        store.set_cursor("searxng", {"page": 3})
+        store.set_cursor("reddit", {"after": "t3_x"})
+
+        assert store.get_cursor("searxng") == {"page": 3}
+        assert store.get_cursor("reddit") == {"after": "t3_x"}
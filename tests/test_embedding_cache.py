@@ -0,0 +1,128 @@
+"""
+Cached embeddings round-trip through disk and only uncached texts are
+sent to the model
+"""
+
+import asyncio
+import zlib
+
+import numpy as np
+import pytest
+
+from embedding_cache import EmbeddingCache, text_key
+from runtime import CrawlerRuntime
+from synthesis_engine import OllamaCloudClient
+
+DIM = 32
+
+
+def _vector(text):
+    return np.random.RandomState(zlib.crc32(text.encode())).randn(DIM)
+
+
+def _cosine(a, b):
+    return float(a @ b / np.linalg.norm(a) / np.linalg.norm(b))
+
+
+class FakeResponse:
+    status = 200
+    headers = {}
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self):
+        return self.data
+
+    def release(self):
+        pass
+
+
+class FakeEmbedAPI:
+    """Stands in for the runtime's session; records every batch sent"""
+
+    closed = False
+
+    def __init__(self):
+        self.batches = []
+
+    async def request(self, method, url, json=None, **kwargs):
+        self.batches.append(list(json['input']))
+        return FakeResponse({'embeddings': [_vector(text).tolist() for text in json['input']]})
+
+    async def close(self):
+        pass
+
+
+def _client(cache):
+    api = FakeEmbedAPI()
+    runtime = CrawlerRuntime()
+    runtime.session = api
+    runtime._users = 1
+    return OllamaCloudClient('test-key', runtime=runtime, embedding_cache=cache), api
+
+
+@pytest.mark.parametrize("dtype, min_cosine", [('float16', 0.9999), ('int8', 0.999)])
+def test_vectors_survive_save_and_reload(tmp_path, dtype, min_cosine):
+    texts = [f"signal {i}" for i in range(20)]
+    matrix = np.stack([_vector(text) for text in texts])
+    keys = [text_key(text) for text in texts]
+
+    cache = EmbeddingCache(tmp_path, dtype)
+    stored = cache.put('nomic-embed-text', keys, matrix)
+    cache.save()
+
+    reloaded = EmbeddingCache(tmp_path, dtype)
+    for key, original, written in zip(keys, matrix, stored):
+        vector = reloaded.get('nomic-embed-text', key)
+        np.testing.assert_array_equal(vector, written)
+        assert _cosine(vector, original) >= min_cosine
+    assert reloaded.get('other-model', keys[0]) is None
+    assert (reloaded.hits, reloaded.misses) == (20, 1)
+
+
+def test_digests_ending_in_nul_bytes_round_trip(tmp_path):
+    keys = [b'\x01' * 15 + b'\x00', b'\x02' * 14 + b'\x00\x00', b'\x00' * 16]
+    cache = EmbeddingCache(tmp_path)
+    cache.put('m', keys, np.eye(3, DIM))
+    cache.save()
+
+    reloaded = EmbeddingCache(tmp_path)
+    for row, key in enumerate(keys):
+        assert reloaded.get('m', key).argmax() == row
+
+
+def test_saves_append_to_existing_file(tmp_path):
+    cache = EmbeddingCache(tmp_path, 'int8')
+    cache.put('m', [text_key('a')], _vector('a')[None, :])
+    cache.save()
+    cache = EmbeddingCache(tmp_path, 'int8')
+    cache.put('m', [text_key('b')], _vector('b')[None, :])
+    cache.save()
+
+    reloaded = EmbeddingCache(tmp_path, 'int8')
+    assert _cosine(reloaded.get('m', text_key('a')), _vector('a')) > 0.999
+    assert _cosine(reloaded.get('m', text_key('b')), _vector('b')) > 0.999
+
+
+def test_unknown_dtype_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        EmbeddingCache(tmp_path, 'float64')
+
+
+def test_embed_matrix_only_sends_uncached_texts(tmp_path):
+    texts = [f"signal {i % 7}" for i in range(12)]
+
+    client, api = _client(EmbeddingCache(tmp_path))
+    cold = asyncio.run(client.embed_matrix('nomic-embed-text', texts, batch_size=4))
+    assert sorted(len(batch) for batch in api.batches) == [3, 4]  # 7 distinct texts
+    np.testing.assert_array_equal(cold[0], cold[7])
+
+    client, api = _client(EmbeddingCache(tmp_path))
+    warm = asyncio.run(client.embed_matrix('nomic-embed-text', texts + ['brand new']))
+    assert api.batches == [['brand new']]
+    # Warm rows are exactly what the cold run returned
+    np.testing.assert_array_equal(warm[:-1], cold)
@@ -0,0 +1,89 @@
+"""
+SimHash fingerprints survive regenerated boilerplate, the banded LSH index
+finds every pair within its distance budget, and the Bloom filter round-trips
+"""
+
+import random
+
+import pytest
+
+from fingerprints import (
+    SIMHASH_BITS, BloomFilter, SimHashIndex, bands_for, hamming_distance,
+    max_distance_for, similarity, simhash
+)
+
+POST = """
+## Ollama Pulse - 2026-10-18 07:00 UTC
+
+Today's pulse covers 14 new models, including a quantized vision model
+that runs comfortably on a laptop GPU, plus three fresh releases of the
+local inference server with faster prompt caching and better batching.
+The community spent most of the day benchmarking long-context recall.
+"""
+
+
+def _flip(value: int, bits: int, seed: int = 0) -> int:
+    for bit in random.Random(seed).sample(range(SIMHASH_BITS), bits):
+        value ^= 1 << bit
+    return value
+
+
+def test_regenerated_timestamp_keeps_fingerprint():
+    later = POST.replace("2026-10-18 07:00", "2026-10-19 09:30").replace("14 new", "17 new")
+    assert simhash(later) == simhash(POST)
+
+
+def test_small_edit_is_near_duplicate_and_rewrite_is_not():
+    edited = POST.replace("most of the day", "most of the night")
+    rewrite = "A completely different post about GPU prices, power draw and cooling."
+    assert similarity(simhash(POST), simhash(edited)) >= 0.9
+    assert similarity(simhash(POST), simhash(rewrite)) < 0.9
+
+
+def test_max_distance_for_threshold():
+    assert max_distance_for(1.0) == 0
+    assert max_distance_for(0.9) == 6
+    assert max_distance_for(0.85) == 9
+
+
+def test_index_finds_every_pair_within_band_budget():
+    index = SimHashIndex(bands=8)
+    base = simhash(POST)
+    for distance in range(0, 8):
+        index.add(f"d{distance}", _flip(base, distance, seed=distance))
+
+    matches = dict(index.query(base, max_distance=7))
+    assert matches == {f"d{d}": d for d in range(8)}
+    assert index.nearest(base, max_distance=7) == ("d0", 0)
+
+
+def test_index_respects_max_distance():
+    index = SimHashIndex(bands=8)
+    base = simhash(POST)
+    index.add("far", _flip(base, 5))
+    assert index.query(base, max_distance=4) == []
+    assert hamming_distance(base, _flip(base, 5)) == 5
+
+
+def test_bloom_filter_round_trip():
+    bloom = BloomFilter(capacity=100)
+    for i in range(100):
+        bloom.add(f"joke:{i}")
+
+    restored = BloomFilter.from_dict(bloom.to_dict())
+    assert all(f"joke:{i}" in restored for i in range(100))
+    assert restored.count == 100
+    assert sum(f"other:{i}" in restored for i in range(1000)) < 50
+
+
+def test_bands_for_covers_distance_budget():
+    assert bands_for(7) == 8
+    assert bands_for(8) == 16
+    assert bands_for(9) == 16
+    assert bands_for(0) == 1
+
+
+def test_query_rejects_distance_beyond_bands():
+    index = SimHashIndex(bands=8)
+    with pytest.raises(ValueError):
+        index.query(0, max_distance=8)
@@ -0,0 +1,159 @@
+"""
+Posts too close to another workflow's recent posts are caught, and
+concurrent index updates merge without losing entries
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from fingerprints import SimHashIndex, hamming_distance, simhash, to_hex
+from global_index import DEFAULT_GUARD_CONFIG, GlobalContentIndex, merge_indexes, split_sections
+
+POST = """
+## Research roundup
+
+A long look at retrieval-augmented generation: chunking strategies,
+rerankers and why most evaluation sets leak answers into the corpus.
+"""
+
+# One flipped bit in every 8-bit band plus one more: 9 bits apart, and
+# no band in common with the original under the old 8-band index
+SPREAD_BITS = [0, 8, 16, 24, 32, 40, 48, 56, 1]
+
+
+def _planted(value: int) -> int:
+    for bit in SPREAD_BITS:
+        value ^= 1 << bit
+    return value
+
+
+def test_nine_bit_cross_workflow_pair_is_caught(tmp_path):
+    base = simhash(POST)
+    planted = _planted(base)
+    assert hamming_distance(base, planted) == 9
+
+    # The old fixed 8-band index could never see this pair
+    old = SimHashIndex(bands=8)
+    old.add("idea-vault 2026-10-18", planted)
+    assert old.query(base, max_distance=7) == []
+
+    index = GlobalContentIndex(tmp_path / "global_index.json")
+    index.index["posts"].append({"workflow": "idea-vault", "date": "2026-10-18", "simhash": to_hex(planted)})
+
+    config = dict(DEFAULT_GUARD_CONFIG, cross_workflow_threshold=0.85)
+    is_unique, reason = index.check(POST, "ollama-pulse", date="2026-10-19", config=config)
+
+    assert not is_unique
+    assert "idea-vault 2026-10-18" in reason
+
+
+def test_own_workflow_posts_are_skipped(tmp_path):
+    index = GlobalContentIndex(tmp_path / "global_index.json")
+    index.index["posts"].append({"workflow": "ollama-pulse", "date": "2026-10-18", "simhash": to_hex(simhash(POST))})
+
+    is_unique, _ = index.check(POST, "ollama-pulse", date="2026-10-19", config=dict(DEFAULT_GUARD_CONFIG))
+    assert is_unique
+
+
+def test_short_sections_are_not_fingerprinted():
+    long_body = "word " * 80
+    sections = split_sections(f"## Intro\nhi\n\n## Body\n{long_body}")
+    assert [heading for heading, _ in sections] == ["Body"]
+
+
+def test_lsh_indexes_are_cached_until_the_next_record(tmp_path, monkeypatch):
+    import global_index
+
+    built = []
+    real = global_index.SimHashIndex
+
+    def counting(bands):
+        built.append(bands)
+        return real(bands)
+
+    monkeypatch.setattr(global_index, "SimHashIndex", counting)
+    index = GlobalContentIndex(tmp_path / "global_index.json")
+    config = dict(DEFAULT_GUARD_CONFIG)
+
+    index.check(POST, "ollama-pulse", date="2026-10-19", config=config)
+    index.check(POST, "ollama-pulse", date="2026-10-19", config=config)
+    assert len(built) == 2  # Posts and sections, once each
+
+    index.record("idea-vault", "2026-10-19", POST, config=config)
+    is_unique, _ = index.check(POST, "ollama-pulse", date="2026-10-19", config=config)
+    assert not is_unique
+    assert len(built) == 3  # Posts rebuilt; the post match returns before sections
+
+
+def _entries(workflow, date):
+    return {
+        "posts": [{"workflow": workflow, "date": date, "simhash": f"{date}{workflow}"}],
+        "sections": [],
+        "phrases": {"plot-twist": [[workflow, date]]}
+    }
+
+
+def test_merge_keeps_both_sides_additions_and_prunes():
+    base = _entries("ollama-pulse", "2026-09-01")
+    ours = {
+        "updated": "2026-10-19T08:00:00",
+        "posts": base["posts"] + _entries("ollama-pulse", "2026-10-19")["posts"],
+        "sections": [],
+        "phrases": {"plot-twist": [["ollama-pulse", "2026-09-01"], ["ollama-pulse", "2026-10-19"]]}
+    }
+    # Theirs pruned the September entry and added its own post
+    theirs = {**_entries("idea-vault", "2026-10-19"), "updated": "2026-10-19T09:00:00"}
+
+    merged = merge_indexes(base, ours, theirs)
+
+    assert [(e["workflow"], e["date"]) for e in merged["posts"]] == [
+        ("ollama-pulse", "2026-10-19"), ("idea-vault", "2026-10-19")
+    ]
+    assert merged["phrases"] == {"plot-twist": [["idea-vault", "2026-10-19"], ["ollama-pulse", "2026-10-19"]]}
+    assert merged["updated"] == "2026-10-19T09:00:00"
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_concurrent_pushes_merge_through_the_git_driver(tmp_path):
+    driver = Path(__file__).resolve().parent.parent / "scripts" / "merge_global_index.py"
+
+    def git(cwd, *args):
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                       cwd=cwd, check=True, capture_output=True)
+
+    def record(clone, workflow):
+        GlobalContentIndex(clone / "global_index.json").record(
+            workflow, "2026-10-19", POST.replace("retrieval", workflow), config=dict(DEFAULT_GUARD_CONFIG)
+        )
+        git(clone, "commit", "-am", workflow)
+
+    origin = tmp_path / "origin.git"
+    git(tmp_path, "init", "--bare", "-b", "main", str(origin))
+    seed = tmp_path / "seed"
+    git(tmp_path, "clone", str(origin), str(seed))
+    (seed / ".gitattributes").write_text("global_index.json merge=global-index\n")
+    (seed / "global_index.json").write_text(json.dumps({"posts": [], "sections": [], "phrases": {}}))
+    git(seed, "add", ".")
+    git(seed, "commit", "-m", "seed")
+    git(seed, "push", "origin", "HEAD:main")
+
+    clones = []
+    for name in ("pulse", "vault"):
+        clone = tmp_path / name
+        git(tmp_path, "clone", str(origin), str(clone))
+        git(clone, "config", "merge.global-index.driver", f"{sys.executable} {driver} %O %A %B")
+        clones.append(clone)
+
+    record(clones[0], "ollama-pulse")
+    record(clones[1], "idea-vault")
+    git(clones[0], "push")
+    git(clones[1], "pull", "--rebase")
+    git(clones[1], "push")
+
+    merged = json.loads((clones[1] / "global_index.json").read_text())
+    assert sorted(e["workflow"] for e in merged["posts"]) == ["idea-vault", "ollama-pulse"]
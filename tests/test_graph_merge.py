@@ -0,0 +1,97 @@
+"""
+Per-source user graphs stay apart per platform and topic graphs merge on
+normalized labels
+"""
+
+import networkx as nx
+import pytest
+
+from graph_merge import merge_topic_graphs, merge_user_graphs, normalize_topic
+from interaction_graph import InteractionGraph
+
+
+def _graph(edges, types=None):
+    graph = InteractionGraph()
+    for name, node_type in (types or {}).items():
+        graph.add_node(name, type=node_type)
+    for source, target, weight, kind in edges:
+        graph.add_edge(source, target, weight=weight, interaction=kind)
+    return graph
+
+
+@pytest.mark.parametrize("label, expected", [
+    ("Stable Diffusion", "stable-diffusion"),
+    ("stable_diffusion", "stable-diffusion"),
+    ("  fine_tuning/LoRA ", "fine-tuning-lora"),
+    ("ML", "machine-learning"),
+    ("LLMs", "llm"),
+])
+def test_normalize_topic(label, expected):
+    assert normalize_topic(label) == expected
+
+
+def test_user_graphs_are_namespaced_per_platform():
+    merged = merge_user_graphs({
+        'hackernews': _graph([('pg', 'dang', 2.0, 'reply')], types={'pg': 'author'}),
+        'reddit': _graph([('pg', 'spez', 1.0, 'comment')]),
+    })
+
+    assert sorted(merged.names) == ['hackernews:dang', 'hackernews:pg', 'reddit:pg', 'reddit:spez']
+    nx_graph = merged.to_networkx()
+    assert nx_graph['hackernews:pg']['hackernews:dang']['weight'] == 2.0
+    assert nx_graph['hackernews:pg']['hackernews:dang']['interaction'] == 'reply'
+    assert nx_graph.nodes['hackernews:pg']['type'] == 'author'
+    assert nx_graph.nodes['reddit:pg']['type'] == 'user'
+
+
+def test_linked_identities_sum_weights():
+    merged = merge_user_graphs(
+        {
+            'hackernews': _graph([('Alice', 'bob', 1.0, 'comment')]),
+            'reddit': _graph([('alice', 'BOB', 2.5, 'comment'), ('carol_r', 'alice', 1.0, 'reply')]),
+        },
+        link_identities=True,
+        identities={'reddit:carol_r': 'carol'}
+    )
+
+    assert sorted(merged.names) == ['alice', 'bob', 'carol']
+    assert merged.number_of_interactions() == 3
+    assert merged.number_of_edges() == 2
+    assert merged.to_networkx()['alice']['bob']['weight'] == 3.5
+
+
+def test_absorb_matches_adding_edges_directly():
+    first = _graph([('a', 'b', 1.0, 'comment'), ('b', 'c', 0.5, 'reply')])
+    second = _graph([('c', 'a', 2.0, 'comment'), ('a', 'b', 1.0, 'comment')])
+
+    merged = InteractionGraph()
+    merged.absorb(first)
+    merged.absorb(second)
+
+    direct = _graph([
+        ('a', 'b', 1.0, 'comment'), ('b', 'c', 0.5, 'reply'),
+        ('c', 'a', 2.0, 'comment'), ('a', 'b', 1.0, 'comment'),
+    ])
+    assert merged.names == direct.names
+    assert (merged.to_sparse() != direct.to_sparse()).nnz == 0
+    assert merged.pagerank() == pytest.approx(direct.pagerank())
+
+
+def test_topic_graphs_merge_on_normalized_labels():
+    hn = nx.Graph()
+    hn.add_node('Stable Diffusion', count=3)
+    hn.add_node('ML', count=2)
+    hn.add_edge('Stable Diffusion', 'ML', weight=2)
+
+    reddit = nx.Graph()
+    reddit.add_node('stable_diffusion', count=4)
+    reddit.add_node('machine learning', count=1)
+    reddit.add_node('ml')
+    reddit.add_edge('stable_diffusion', 'machine learning', weight=1)
+    reddit.add_edge('ml', 'machine learning', weight=5)  # Same topic after aliasing
+
+    merged = merge_topic_graphs([hn, reddit])
+
+    assert dict(merged.nodes(data='count')) == {'stable-diffusion': 7, 'machine-learning': 4}
+    assert merged['stable-diffusion']['machine-learning']['weight'] == 3
+    assert not merged.has_edge('machine-learning', 'machine-learning')
@@ -0,0 +1,96 @@
+"""Guard CLI publishing results and exit codes"""
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+import guard
+import memory_manager
+import post_to_nostr
+from global_index import GlobalContentIndex
+
+DRAFT = "---\ntitle: Kernels\n---\n\n## Kernels\n\n" + "A new post about sparse attention kernels on consumer GPUs. " * 20
+
+
+@pytest.fixture
+def draft(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_manager, "MEMORY_DIR", tmp_path)
+    monkeypatch.setattr(guard, "GlobalContentIndex", lambda: GlobalContentIndex(tmp_path / "global_index.json"))
+    path = tmp_path / "draft.md"
+    path.write_text(DRAFT)
+    return path
+
+
+def _relays(article, teaser="success"):
+    async def publish_content(content, source, pubkey, private_key, runtime=None):
+        outcomes = {"wss://a": {"article": article, "teaser": teaser},
+                    "wss://b": {"article": "error", "teaser": "error"}}
+        successful = sum(v == "success" for events in outcomes.values() for v in events.values())
+        return {"total_relays": 2, "successful": successful, "failed": 4 - successful,
+                "relay_results": outcomes}
+    return publish_content
+
+
+def _request(draft, **extra):
+    return {"file": str(draft), "workflow": "ollama-pulse", "date": "2026-10-19",
+            "commit": True, "publish": True, "pubkey": "npub1test", **extra}
+
+
+def test_publish_without_private_key_fails_before_committing(draft):
+    result = asyncio.run(guard.ContentGuard().handle(_request(draft, private_key=None)))
+
+    assert not result["should_post"]
+    assert not result["committed"]
+    assert "NOSTR_PRIVATE_KEY" in result["reason"]
+    assert not memory_manager.BlogMemory("ollama-pulse").memory["post_history"]
+
+
+def test_per_relay_outcomes_are_reported(draft, monkeypatch):
+    monkeypatch.setattr(post_to_nostr, "publish_content", _relays("success"))
+
+    result = asyncio.run(guard.ContentGuard().handle(_request(draft, private_key="nsec")))
+
+    assert result["published"]["ok"]
+    assert result["published"]["relays"]["wss://b"] == {"article": "error", "teaser": "error"}
+    assert (result["published"]["successful"], result["published"]["failed"]) == (2, 2)
+
+
+def _exit_code(draft, monkeypatch, publish_content, key="nsec"):
+    monkeypatch.setattr(post_to_nostr, "publish_content", publish_content)
+    if key:
+        monkeypatch.setenv("NOSTR_PRIVATE_KEY", key)
+    else:
+        monkeypatch.delenv("NOSTR_PRIVATE_KEY", raising=False)
+    monkeypatch.setattr(sys, "argv", ["guard.py", str(draft), "ollama-pulse", "--commit",
+                                      "--date", "2026-10-19", "--publish", "--pubkey", "npub1test"])
+    with pytest.raises(SystemExit) as exit_info:
+        guard.main()
+    return exit_info.value.code
+
+
+def test_exit_code_reflects_publishing(draft, monkeypatch, capsys):
+    assert _exit_code(draft, monkeypatch, _relays("success")) == 0
+    assert json.loads(capsys.readouterr().out)["published"]["ok"]
+
+
+@pytest.mark.parametrize("publish_content", [
+    _relays("rejected"),  # Only the teaser got through
+    _relays("error", teaser="error"),
+])
+def test_exit_code_is_non_zero_when_the_article_reached_no_relay(draft, monkeypatch, capsys, publish_content):
+    assert _exit_code(draft, monkeypatch, publish_content) == 1
+    assert not json.loads(capsys.readouterr().out)["published"]["ok"]
+
+
+def test_exit_code_is_non_zero_when_publishing_raises(draft, monkeypatch, capsys):
+    async def broken(*args, **kwargs):
+        raise FileNotFoundError("config/nostr_relays.json")
+
+    assert _exit_code(draft, monkeypatch, broken) == 1
+    assert "nostr_relays" in json.loads(capsys.readouterr().out)["published"]["error"]
+
+
+def test_exit_code_is_non_zero_without_private_key(draft, monkeypatch, capsys):
+    assert _exit_code(draft, monkeypatch, _relays("success"), key=None) == 1
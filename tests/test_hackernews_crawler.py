@@ -0,0 +1,102 @@
+"""
+HN comment trees are fetched level by level and stop at the depth, node,
+reply and time limits
+"""
+
+import asyncio
+
+from hackernews_crawler import CommentBudget, HackerNewsGraphCrawler
+
+FANOUT = 5
+STORY_ID = 1
+
+
+def _fake_tree(crawler: HackerNewsGraphCrawler, delay: float = 0.0):
+    """Every item has FANOUT kids; ids encode the path (1 -> 11..15 -> 111..)"""
+    fetched = []
+
+    async def fetch_item(item_id, cached=False):
+        fetched.append(item_id)
+        if delay:
+            await asyncio.sleep(delay)
+        return {
+            'by': f"user{item_id % 7}",
+            'text': 'comment',
+            'time': 1_760_000_000,
+            'parent': item_id // 10,
+            'kids': [item_id * 10 + k for k in range(1, FANOUT + 1)]
+        }
+
+    crawler._fetch_item = fetch_item
+    return fetched
+
+
+def _depths(comments, depth=0):
+    for comment in comments:
+        yield depth
+        yield from _depths(comment.replies, depth + 1)
+
+
+def test_depth_limit():
+    crawler = HackerNewsGraphCrawler()
+    _fake_tree(crawler)
+    budget = CommentBudget(max_depth=1, max_nodes=1000, max_top_level=50, max_replies=10)
+
+    roots = asyncio.run(crawler._fetch_comments(STORY_ID, budget))
+
+    depths = list(_depths(roots))
+    assert max(depths) == 1
+    assert len(roots) == FANOUT
+    assert len(depths) == FANOUT + FANOUT * FANOUT
+
+
+def test_node_limit_caps_fetches():
+    crawler = HackerNewsGraphCrawler()
+    fetched = _fake_tree(crawler)
+    budget = CommentBudget(max_depth=5, max_nodes=12, max_top_level=50, max_replies=10)
+
+    roots = asyncio.run(crawler._fetch_comments(STORY_ID, budget))
+
+    assert len(list(_depths(roots))) == 12
+    assert len(fetched) == 1 + 12  # Story item plus the budget
+
+
+def test_top_level_and_reply_limits():
+    crawler = HackerNewsGraphCrawler()
+    _fake_tree(crawler)
+    budget = CommentBudget(max_depth=1, max_nodes=1000, max_top_level=2, max_replies=3)
+
+    roots = asyncio.run(crawler._fetch_comments(STORY_ID, budget))
+
+    assert len(roots) == 2
+    assert all(len(root.replies) == 3 for root in roots)
+
+
+def test_time_budget_returns_partial_tree():
+    crawler = HackerNewsGraphCrawler()
+    _fake_tree(crawler, delay=0.05)
+    budget = CommentBudget(max_depth=10, max_nodes=10_000, max_seconds=0.12, max_top_level=50, max_replies=10)
+
+    roots = asyncio.run(crawler._fetch_comments(STORY_ID, budget))
+
+    depths = list(_depths(roots))
+    assert roots
+    assert max(depths) < 3
+
+
+def test_levels_are_fetched_concurrently():
+    crawler = HackerNewsGraphCrawler(max_concurrency=50)
+    _fake_tree(crawler, delay=0.05)
+    budget = CommentBudget(max_depth=1, max_nodes=1000, max_top_level=50, max_replies=10)
+
+    elapsed = asyncio.run(_timed(crawler._fetch_comments(STORY_ID, budget)))
+
+    # Story + 2 levels = 3 round-trips, not 31 sequential fetches
+    assert elapsed < 0.3
+
+
+async def _timed(coro):
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await coro
+    return loop.time() - started
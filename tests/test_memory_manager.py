@@ -0,0 +1,117 @@
+"""BlogMemory duplicate checks and the content scanner"""
+
+import pytest
+
+import memory_manager
+from memory_manager import BlogMemory
+
+POST = """
+## Ollama Pulse - 2026-10-18 07:00 UTC
+
+Today's pulse covers 14 new models, including a quantized vision model
+that runs comfortably on a laptop GPU, plus three fresh releases of the
+local inference server with faster prompt caching and better batching.
+The community spent most of the day benchmarking long-context recall.
+"""
+
+
+@pytest.fixture
+def memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_manager, "MEMORY_DIR", tmp_path)
+    return BlogMemory("ollama-pulse")
+
+
+def test_near_duplicate_with_new_timestamp_is_rejected(memory):
+    memory.add_post("2026-10-18", "pulse", POST)
+
+    regenerated = POST.replace("2026-10-18 07:00", "2026-10-19 08:15")
+    should_post, reason = memory.should_post(regenerated)
+
+    assert not should_post
+    assert "2026-10-18" in reason
+
+
+def test_unrelated_post_passes(memory):
+    memory.add_post("2026-10-18", "pulse", POST)
+
+    other = "A long look at GPU prices, power draw and cooling for home inference rigs this autumn."
+    assert memory.find_near_duplicate(other) is None
+
+
+def test_scanner_finds_jokes_quotes_and_tones():
+    scan = memory_manager.CONTENT_SCANNER.scan(
+        'An optimistic, technical take. Plot twist: the GPU hype is real. '
+        '"this AI model changed everything" 💡'
+    )
+    assert scan.tone_words == ['optimistic', 'technical']
+    assert 'plot-twist' in scan.jokes
+    assert 'gpu-hype' in scan.jokes
+    assert 'this-ai-model' in scan.jokes
+
+
+def test_scanner_keeps_uppercase_escapes_in_patterns():
+    # \S must stay "non-space"; lowercasing the pattern made it \s
+    scanner = memory_manager.ContentScanner(joke_patterns=[r'MEGA\S+'])
+    assert scanner.scan("Mega-merge day").jokes == ['mega-merge']
+    assert scanner.scan("mega merge day").jokes == []
+
+
+def test_loose_threshold_rebuilds_index_with_enough_bands(memory):
+    from fingerprints import simhash, to_hex
+
+    planted = simhash(POST)
+    for bit in (0, 8, 16, 24, 32, 40, 48, 56, 1):
+        planted ^= 1 << bit
+    memory.memory["post_history"].append({"date": "2026-10-17", "simhash": to_hex(planted)})
+
+    assert memory.find_near_duplicate(POST, threshold=0.9) is None
+    date, score = memory.find_near_duplicate(POST, threshold=0.85)
+    assert date == "2026-10-17"
+    assert score == 1 - 9 / 64
+
+
+def test_already_posted_uses_the_requested_date(memory):
+    memory.add_post("2026-10-10", "pulse", POST)
+    fresh = "An entirely new post about sparse attention kernels and their memory footprint on consumer GPUs."
+
+    assert memory.should_post(fresh, date="2026-10-10") == (False, "Already posted on 2026-10-10")
+    assert memory.should_post(fresh, date="2026-10-11")[0]
+
+
+def test_guard_checks_the_date_it_was_given(tmp_path, monkeypatch):
+    import asyncio
+    import guard
+    from global_index import GlobalContentIndex
+
+    monkeypatch.setattr(memory_manager, "MEMORY_DIR", tmp_path)
+    monkeypatch.setattr(guard, "GlobalContentIndex", lambda: GlobalContentIndex(tmp_path / "global_index.json"))
+    BlogMemory("ollama-pulse").add_post("2026-10-10", "pulse", POST)
+
+    draft = tmp_path / "draft.md"
+    draft.write_text("---\ntitle: Kernels\n---\n\n## Kernels\n\n" + "An entirely new post about sparse attention kernels on consumer GPUs. " * 20)
+
+    result = asyncio.run(guard.ContentGuard().handle({"file": str(draft), "workflow": "ollama-pulse", "date": "2026-10-10"}))
+    assert not result["should_post"]
+    assert result["reason"] == "Already posted on 2026-10-10"
+
+
+def test_bloom_hit_alone_does_not_reject(memory):
+    memory.add_post("2026-10-18", "pulse", POST)
+    new_post = POST.replace("14 new models", "9 new models")
+    # Simulate a false positive: the filter says yes, no entry agrees
+    memory.bloom.add(f"fp:{memory.fingerprint(new_post)}")
+
+    assert not memory.is_duplicate(new_post)
+    assert memory.is_duplicate(POST)
+
+
+def test_archived_posts_still_confirm_exact_duplicates(memory, monkeypatch):
+    monkeypatch.setattr(memory_manager, "RECENT_LIMIT", 2)
+    memory.add_post("2026-10-01", "first", POST)
+    for day in range(2, 5):
+        memory.add_post(f"2026-10-0{day}", f"post-{day}", f"Unrelated post number {day}")
+
+    archived = memory.memory["archive"][0]
+    assert archived["date"] == "2026-10-01"
+    assert archived["content_fingerprint"] == memory.fingerprint(POST)
+    assert memory.is_duplicate(POST)
@@ -0,0 +1,61 @@
+"""Runtime retries only resend requests that are safe to repeat"""
+
+import asyncio
+
+import pytest
+
+from runtime import CrawlerRuntime, RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+        self.headers = {}
+
+    def release(self):
+        pass
+
+
+class FakeSession:
+    """Fails with 503 until the last call"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = []
+
+    async def request(self, method, url, **kwargs):
+        self.calls.append(method)
+        return FakeResponse(503 if len(self.calls) <= self.failures else 200)
+
+
+def _runtime(failures):
+    runtime = CrawlerRuntime(retry=RetryPolicy(attempts=3, backoff=0.0))
+    runtime.session = FakeSession(failures)
+    return runtime
+
+
+def _status(runtime, method, **kwargs):
+    async def run():
+        async with runtime.request(method, 'https://ollama.example/api/chat', **kwargs) as response:
+            return response.status
+
+    return asyncio.run(run())
+
+
+def test_get_is_retried():
+    runtime = _runtime(failures=2)
+    assert _status(runtime, 'GET') == 200
+    assert runtime.session.calls == ['GET'] * 3
+
+
+@pytest.mark.parametrize('method', ['POST', 'PATCH'])
+def test_non_idempotent_methods_are_sent_once(method):
+    runtime = _runtime(failures=2)
+    assert _status(runtime, method) == 503
+    assert runtime.session.calls == [method]
+
+
+def test_post_retries_are_opt_in_per_call():
+    runtime = _runtime(failures=2)
+    assert _status(runtime, 'POST', idempotent=True) == 200
+    assert runtime.session.calls == ['POST'] * 3
@@ -0,0 +1,57 @@
+"""SearXNG search dedup, caching and ranking"""
+
+import asyncio
+from datetime import datetime
+
+from crawl_store import CrawlStore
+from searxng_crawler import SearXNGCrawler
+
+
+def _result(url, score=1.0, published=None):
+    return {'title': url, 'url': url, 'content': '', 'platform': 'other', 'engine': 'x',
+            'publishedDate': published, 'engagement': {}, 'score': score}
+
+
+def _crawler(answers, store=None):
+    crawler = SearXNGCrawler(["https://searx.one", "https://searx.two"], store=store)
+    queue = list(answers)
+
+    async def hedged_search(instances, **search_args):
+        return instances[0], [dict(r) for r in queue.pop(0)] if queue else []
+
+    crawler._hedged_search = hedged_search
+    return crawler
+
+
+def test_mixed_and_missing_dates_sort_by_score_then_recency():
+    results = [
+        _result('https://a', 2.0, None),
+        _result('https://b', 2.0, datetime(2026, 10, 19, 9)),
+        # SearXNG 'Z' dates are parsed to naive local time
+        _result('https://c', 2.0, SearXNGCrawler([])._parse_date('2026-10-19T10:00:00Z')),
+        _result('https://d', 3.0, None),
+    ]
+    crawler = _crawler([results])
+
+    found = asyncio.run(crawler.search('llm', max_results=10, max_rounds=1))
+
+    assert found[0]['url'] == 'https://d'
+    assert found[-1]['url'] == 'https://a'
+    assert all(r['publishedDate'] is None or r['publishedDate'].tzinfo is None for r in found)
+
+
+def test_cached_results_go_through_the_same_dedup(tmp_path):
+    with CrawlStore(tmp_path / "store.sqlite") as store:
+        # Warm the search cache for one sub-query
+        warm = _crawler([[_result('https://a'), _result('https://b', published=datetime(2026, 10, 19))]], store)
+        asyncio.run(warm.search('llm twitter', engines=['twitter'], max_rounds=1))
+
+        crawler = _crawler([[_result('https://a'), _result('https://c')]], store)
+        fresh = asyncio.run(crawler.search('llm', max_rounds=1))
+        cached = asyncio.run(crawler.search('llm twitter', engines=['twitter'], max_rounds=1))
+        again = asyncio.run(crawler.search('llm twitter', engines=['twitter'], max_rounds=1))
+
+    assert [r['url'] for r in fresh] == ['https://a', 'https://c']
+    assert [r['url'] for r in cached] == ['https://b']
+    assert cached[0]['publishedDate'] == datetime(2026, 10, 19)
+    assert again == []
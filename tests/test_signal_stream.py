@@ -0,0 +1,51 @@
+"""Streaming signal pipeline: normalization, dedup and failure handling"""
+
+import asyncio
+from datetime import datetime
+
+from signal_stream import SignalPipeline, canonical_url
+
+
+async def _source(signals):
+    for signal in signals:
+        await asyncio.sleep(0)
+        yield signal
+
+
+def _signal(n, **extra):
+    return {'source': 'reddit', 'title': f'Post {n} about LLM agents', 'url': f'https://example.com/{n}',
+            'timestamp': datetime(2026, 10, 19, 9), **extra}
+
+
+def test_malformed_signal_is_dropped_without_hanging():
+    # Small queue: a dead consumer would leave the producers blocked on put()
+    pipeline = SignalPipeline(queue_depth=2)
+    signals = [_signal(n) for n in range(20)]
+    signals[3] = _signal(3, title=12345)      # re.sub on an int raises
+    signals[7] = ['not', 'a', 'dict']
+    pipeline.add_source('reddit', _source(signals))
+    pipeline.add_source('hackernews', _source([_signal(100, source='HackerNews')]))
+
+    result = asyncio.run(asyncio.wait_for(pipeline.run(), timeout=5))
+
+    assert len(result) == 19
+    assert pipeline.dropped == 2
+
+
+def test_duplicates_across_sources_are_dropped_and_topics_tagged():
+    pipeline = SignalPipeline()
+    pipeline.add_source('hackernews', _source([_signal(1, url='https://www.example.com/1?utm_source=hn')]))
+    pipeline.add_source('reddit', _source([_signal(1), _signal(2)]))
+
+    result = asyncio.run(pipeline.run())
+
+    assert len(result) == 2
+    assert pipeline.duplicates == 1
+    assert result[0]['topics'] == ['agent', 'llm']
+
+
+def test_canonical_url_folds_hosts_and_tracking():
+    assert canonical_url('https://m.youtube.com/watch?v=abc&utm_source=x') == 'youtube.com/watch?v=abc'
+    assert canonical_url('https://youtu.be/abc') == 'youtube.com/watch?v=abc'
+    assert canonical_url('https://old.reddit.com/r/ml/comments/AbC/title/') == 'reddit.com/comments/abc'
+    assert canonical_url('https://arxiv.org/pdf/2401.12345v2.pdf') == 'arxiv.org/abs/2401.12345'
@@ -0,0 +1,107 @@
+"""
+Stages run as soon as their dependencies finish, and a failure cancels
+the rest
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from stage_graph import StageGraph
+
+
+def _sleeper(name, seconds, log):
+    async def stage(**deps):
+        log.append(('start', name, sorted(deps)))
+        await asyncio.sleep(seconds)
+        log.append(('end', name))
+        return name.upper()
+    return stage
+
+
+def test_stages_wait_for_dependencies_and_receive_results():
+    log = []
+    graph = StageGraph()
+    graph.add('crawl', _sleeper('crawl', 0.01, log))
+    graph.add('report', lambda crawl: f"report of {crawl}", deps=('crawl',))
+    graph.add('post', _sleeper('post', 0.0, log), deps=('report', 'crawl'))
+
+    results = asyncio.run(graph.run())
+
+    assert results == {'crawl': 'CRAWL', 'report': 'report of CRAWL', 'post': 'POST'}
+    assert log.index(('end', 'crawl')) < log.index(('start', 'post', ['crawl', 'report']))
+
+
+def test_independent_stages_overlap():
+    log = []
+    graph = StageGraph()
+    for name in ('a', 'b', 'c'):
+        graph.add(name, _sleeper(name, 0.1, log))
+
+    started = time.monotonic()
+    asyncio.run(graph.run())
+
+    assert time.monotonic() - started < 0.25
+    assert [entry[0] for entry in log[:3]] == ['start'] * 3
+
+
+def test_critical_path_follows_the_last_dependency():
+    graph = StageGraph()
+    graph.add('fast', _sleeper('fast', 0.01, []))
+    graph.add('slow', _sleeper('slow', 0.1, []))
+    graph.add('join', _sleeper('join', 0.01, []), deps=('fast', 'slow'))
+    graph.add('side', _sleeper('side', 0.0, []), deps=('fast',))
+
+    asyncio.run(graph.run())
+
+    assert [stage.name for stage in graph.critical_path()] == ['slow', 'join']
+    timings = graph.timings()
+    assert timings['slow']['critical'] and not timings['fast']['critical']
+    assert timings['slow']['seconds'] >= 0.09
+
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    graph = StageGraph()
+    graph.add('a', lambda c: c, deps=('c',))
+    graph.add('b', lambda a: a, deps=('a',))
+    graph.add('c', lambda b: b, deps=('b',))
+    with pytest.raises(ValueError, match="Stage cycle: a -> c -> b -> a"):
+        asyncio.run(graph.run())
+
+    graph = StageGraph()
+    graph.add('a', lambda missing: missing, deps=('missing',))
+    with pytest.raises(ValueError, match="unknown stage missing"):
+        asyncio.run(graph.run())
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        graph.add('a', lambda: None)
+
+
+def test_failure_cancels_running_stages_and_propagates():
+    cancelled = []
+    ran = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append('slow')
+            raise
+
+    async def broken():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    graph = StageGraph()
+    graph.add('slow', slow)
+    graph.add('broken', broken)
+    graph.add('after', lambda broken: ran.append('after'), deps=('broken',))
+
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(graph.run())
+
+    assert time.monotonic() - started < 1
+    assert cancelled == ['slow']
+    assert ran == []
@@ -0,0 +1,81 @@
+"""Stories shared across platforms group by link or near-identical title"""
+
+from datetime import datetime, timedelta, timezone
+
+from story_matcher import match_stories, minhash_signatures, title_tokens
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+def _signal(source, title, url='', link=None, points=0, hours_ago=0.0):
+    return {
+        'source': source,
+        'title': title,
+        'url': url,
+        'link': link,
+        'engagement': {'points': points},
+        'timestamp': NOW - timedelta(hours=hours_ago)
+    }
+
+
+def test_shared_link_groups_across_platforms():
+    signals = [
+        _signal('hackernews', 'Show HN: Tiny inference server', 'https://news.ycombinator.com/item?id=1',
+                link='https://github.com/acme/tiny?utm_source=hn', points=300),
+        _signal('reddit', 'I made a thing', 'https://www.reddit.com/r/LocalLLaMA/comments/abc/x/',
+                link='https://github.com/acme/tiny/', points=40),
+        _signal('reddit', 'Unrelated', 'https://reddit.com/comments/zzz'),
+    ]
+
+    stories = match_stories(signals)
+
+    assert len(stories) == 1
+    story = stories[0]
+    assert story['platforms'] == ['hackernews', 'reddit']
+    assert story['title'] == 'Show HN: Tiny inference server'
+    assert story['total_engagement'] == 340
+    assert story['urls'] == ['github.com/acme/tiny']
+
+
+def test_near_identical_titles_group_without_links():
+    signals = [
+        _signal('hackernews', 'Mistral releases new open weights mixture of experts model'),
+        _signal('searxng', 'Mistral released open weights mixture of experts model'),
+        _signal('reddit', 'Completely different story about databases and indexes'),
+    ]
+
+    stories = match_stories(signals)
+
+    assert [s['platforms'] for s in stories] == [['hackernews', 'searxng']]
+
+
+def test_single_platform_groups_are_dropped():
+    signals = [
+        _signal('reddit', 'Same post', 'https://reddit.com/comments/abc'),
+        _signal('reddit', 'Same post', 'https://old.reddit.com/r/ml/comments/abc/same_post'),
+    ]
+
+    assert match_stories(signals) == []
+    assert len(match_stories(signals, min_platforms=1)) == 1
+
+
+def test_first_seen_mixes_aware_and_naive_timestamps():
+    aware = _signal('searxng', 'Story', 'https://example.com/story')
+    aware['timestamp'] = (NOW - timedelta(hours=3)).astimezone(timezone.utc)
+    signals = [
+        _signal('hackernews', 'Story', 'https://example.com/story', hours_ago=1),
+        aware,
+        _signal('reddit', 'Story', 'https://example.com/story', hours_ago=2),
+    ]
+
+    story = match_stories(signals)[0]
+
+    assert story['first_seen'] == NOW - timedelta(hours=3)
+    assert story['first_seen'].tzinfo is None
+
+
+def test_title_tokens_and_signatures():
+    assert title_tokens('Ask HN: How are you using embeddings?') == ['embedding', 'using']
+    signatures = minhash_signatures([['a', 'b', 'c'], ['a', 'b', 'c'], ['x', 'y']])
+    assert (signatures[0] == signatures[1]).all()
+    assert (signatures[0] != signatures[2]).any()
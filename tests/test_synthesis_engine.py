@@ -0,0 +1,84 @@
+"""Synthesis stages that don't need a live model"""
+
+import asyncio
+
+import numpy as np
+
+from synthesis_engine import SynthesisEngine
+from vector_index import VectorIndex
+
+
+def _engine(monkeypatch, replies):
+    engine = SynthesisEngine("test-key")
+
+    async def generate_many(model, prompts, max_tokens, label):
+        return replies[:len(prompts)]
+
+    monkeypatch.setattr(engine, "_generate_many", generate_many)
+    return engine
+
+
+def test_prediction_confidence_stays_within_one(monkeypatch):
+    engine = _engine(monkeypatch, ["Up.", "Down.", None])
+    trends = [
+        {'topic': 'agi', 'insight': '', 'velocity': 40.0, 'score': 410.0, 'confidence': 1.0},
+        {'topic': 'rag', 'insight': '', 'velocity': 2.0, 'score': 4.1, 'confidence': 0.336},
+        {'topic': 'jax', 'insight': '', 'velocity': 1.0, 'score': 1.0, 'confidence': 0.095},
+    ]
+
+    predictions = asyncio.run(engine._generate_predictions(trends))
+
+    assert [p['topic'] for p in predictions] == ['agi', 'rag']  # Failed one dropped
+    assert [p['confidence'] for p in predictions] == [1.0, 0.336]
+
+
+def _recurring_setup(tmp_path):
+    index = VectorIndex(tmp_path / "vector_index")
+    yesterday = np.eye(3, 8)
+    index.add(
+        ['example.com/old-0', 'example.com/old-1', 'example.com/old-2'],
+        yesterday,
+        [{'title': f'Old {i}', 'url': f'https://example.com/old-{i}', 'source': 'hackernews',
+          'date': '2026-10-18'} for i in range(3)]
+    )
+    signals = [
+        {'title': 'Back again', 'content': '', 'url': 'https://example.com/new-0', 'source': 'reddit'},
+        {'title': 'Brand new', 'content': '', 'url': 'https://example.com/new-1', 'source': 'reddit'},
+    ]
+    embeddings = np.array([yesterday[0] + 0.01, np.eye(8)[5]], dtype=np.float32)
+    return index, signals, embeddings
+
+
+def test_find_recurring_leaves_signals_alone(tmp_path):
+    index, signals, embeddings = _recurring_setup(tmp_path)
+    engine = SynthesisEngine("test-key", signal_index=index)
+
+    stories, seen_before = engine._find_recurring(signals, embeddings)
+
+    assert [s['previous_title'] for s in stories] == ['Old 0']
+    assert stories[0]['first_seen'] == '2026-10-18'
+    assert list(seen_before) == [0]
+    assert seen_before[0]['id'] == 'example.com/old-0'
+    assert all('seen_before' not in signal for signal in signals)
+    assert len(index) == 5
+
+
+def test_synthesize_merges_seen_before_after_the_graph(tmp_path, monkeypatch):
+    index, signals, embeddings = _recurring_setup(tmp_path)
+    engine = SynthesisEngine("test-key", signal_index=index)
+
+    async def embed_signals(signals):
+        return embeddings
+
+    async def generate(model, prompt, **kwargs):
+        return "HEADLINE: Same old\nSUMMARY: Things came back."
+
+    monkeypatch.setattr(engine, "_embed_signals", embed_signals)
+    monkeypatch.setattr(engine.ollama, "generate", generate)
+
+    report = asyncio.run(engine.synthesize({'signals': signals, 'total_signals': 2}))
+
+    assert report.headline == "Same old"
+    assert [s['title'] for s in report.recurring_stories] == ['Back again']
+    assert signals[0]['seen_before']['title'] == 'Old 0'
+    assert 'seen_before' not in signals[1]
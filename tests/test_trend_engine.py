@@ -0,0 +1,86 @@
+"""
+Bursting topics outrank steady ones, whatever mix of aware and naive
+timestamps the signals carry
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from crawl_store import CrawlStore
+from signal_stream import normalize_signal
+from trend_engine import BASELINE_CURSOR, TrendEngine
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+def _signal(topic, hours_ago, source='hackernews', now=NOW):
+    return {'topics': [topic], 'source': source, 'timestamp': now - timedelta(hours=hours_ago)}
+
+
+def test_aware_and_naive_timestamps_mix():
+    naive = _signal('llm', 1)
+    # A SearXNG-style 'Z' date, 30 minutes ago
+    aware = normalize_signal({
+        'source': 'searxng',
+        'title': 'LLM news',
+        'timestamp': (NOW.astimezone(timezone.utc) - timedelta(minutes=30)).isoformat().replace('+00:00', 'Z'),
+        'topics': ['llm']
+    })
+    raw_aware = {'topics': ['llm'], 'source': 'reddit',
+                 'timestamp': NOW.astimezone(timezone.utc) - timedelta(hours=2)}
+
+    assert aware['timestamp'].tzinfo is None
+    assert aware['timestamp'] == NOW - timedelta(minutes=30)
+
+    trends = TrendEngine().detect([naive, aware, raw_aware], now=NOW)
+
+    assert [t['topic'] for t in trends] == ['llm']
+    assert trends[0]['platforms'] == 3
+    assert sum(trends[0]['timeline'][-3:]) == 3  # All inside the last three hours
+
+
+def test_aware_now_is_accepted():
+    signals = [_signal('rag', 1), _signal('rag', 2, source='reddit')]
+
+    trends = TrendEngine().detect(signals, now=NOW.astimezone(timezone.utc))
+
+    assert trends[0]['topic'] == 'rag'
+
+
+def test_bursting_topic_outranks_steady_one(tmp_path):
+    with CrawlStore(tmp_path / "store.sqlite") as store:
+        # Yesterday: both topics at the same steady rate
+        steady = [_signal(topic, h, now=NOW - timedelta(days=1))
+                  for topic in ('llm', 'agent') for h in range(0, 24, 2)]
+        TrendEngine(store).detect(steady, now=NOW - timedelta(days=1))
+        assert set(store.get_cursor(BASELINE_CURSOR)['topics']) == {'llm', 'agent'}
+
+        # Today: 'agent' bursts across platforms in the last few hours
+        today = [_signal('llm', h) for h in range(0, 24, 2)]
+        today += [_signal('agent', h / 4, source=source)
+                  for h in range(12) for source in ('hackernews', 'reddit')]
+        trends = TrendEngine(store).detect(today, now=NOW)
+
+    assert trends[0]['topic'] == 'agent'
+    assert trends[0]['velocity'] > trends[0]['baseline']
+    assert trends[0]['acceleration'] > 0
+    assert trends[0]['platform_names'] == ['hackernews', 'reddit']
+    assert all(t['topic'] != 'llm' or t['score'] < trends[0]['score'] for t in trends)
+
+
+def test_old_and_rare_topics_are_ignored():
+    signals = [_signal('rag', 1), _signal('jax', 48), _signal('jax', 50), _signal('lora', 0.5)]
+
+    trends = TrendEngine().detect(signals, now=NOW)
+
+    assert trends == []
+
+
+def test_confidence_is_bounded_for_huge_scores():
+    # A brand-new topic with hundreds of mentions on many platforms
+    sources = [f'source-{n}' for n in range(8)]
+    signals = [_signal('agi', m / 60, source=source) for m in range(60) for source in sources]
+
+    trend = TrendEngine().detect(signals, now=NOW)[0]
+
+    assert trend['score'] > 100
+    assert 0.99 <= trend['confidence'] <= 1.0
@@ -0,0 +1,128 @@
+"""
+Vector search matches brute force, exact and IVF, and the on-disk index
+survives reopening and crashed writes
+"""
+
+import numpy as np
+import pytest
+
+import vector_index
+from vector_index import VectorIndex
+
+DIM = 16
+
+
+def _vectors(n, seed=0):
+    return np.random.RandomState(seed).randn(n, DIM).astype(np.float32)
+
+
+def _add(index, vectors, start=0):
+    ids = [f"item-{i}" for i in range(start, start + len(vectors))]
+    return index.add(ids, vectors, [{'title': item_id} for item_id in ids])
+
+
+def _brute_force(vectors, queries, k):
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = queries @ normed.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def test_exact_search_matches_brute_force(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index, "CHUNK_ROWS", 64)  # Several chunks
+    vectors = _vectors(300)
+    index = VectorIndex(tmp_path)
+    assert _add(index, vectors) == 300
+
+    queries = _vectors(10, seed=1)
+    hits = index.search(queries, k=5)
+
+    expected = _brute_force(vectors, queries / np.linalg.norm(queries, axis=1, keepdims=True), 5)
+    for query_hits, rows in zip(hits, expected):
+        assert [hit['title'] for hit in query_hits] == [f"item-{row}" for row in rows]
+        similarities = [hit['similarity'] for hit in query_hits]
+        assert similarities == sorted(similarities, reverse=True)
+
+
+def test_known_ids_are_skipped(tmp_path):
+    index = VectorIndex(tmp_path)
+    _add(index, _vectors(10))
+
+    assert _add(index, _vectors(10)) == 0
+    assert _add(index, _vectors(12), start=5) == 7
+    assert len(index) == 17
+
+
+def test_reopened_index_keeps_rows_and_ids(tmp_path):
+    vectors = _vectors(50)
+    _add(VectorIndex(tmp_path), vectors[:30])
+    _add(VectorIndex(tmp_path), vectors[30:], start=30)
+
+    index = VectorIndex(tmp_path)
+    assert len(index) == 50
+    assert index.search(vectors[42], k=1)[0][0]['id'] == 'item-42'
+    assert index.metadata([0, 49]) == [{'title': 'item-0', 'id': 'item-0'},
+                                       {'title': 'item-49', 'id': 'item-49'}]
+    assert _add(index, vectors[:5]) == 0
+
+
+def test_bytes_from_a_crashed_add_are_ignored_and_overwritten(tmp_path):
+    vectors = _vectors(20)
+    _add(VectorIndex(tmp_path), vectors[:10])
+
+    # Rows written, header never updated
+    for name in ("vectors.f16", "offsets.i64", "metadata.jsonl"):
+        with open(tmp_path / name, 'ab') as f:
+            f.write(b'\x7f' * 40)
+
+    index = VectorIndex(tmp_path)
+    assert len(index) == 10
+    assert index.search(vectors[3], k=1)[0][0]['id'] == 'item-3'
+
+    _add(index, vectors[10:], start=10)
+    reopened = VectorIndex(tmp_path)
+    assert len(reopened) == 20
+    assert reopened.search(vectors[15], k=1)[0][0]['id'] == 'item-15'
+    assert reopened.metadata([10])[0]['id'] == 'item-10'
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    index = VectorIndex(tmp_path)
+    _add(index, _vectors(3))
+
+    with pytest.raises(ValueError):
+        index.add(['other'], np.ones((1, DIM + 1)), [{}])
+
+
+def test_empty_index_returns_no_hits(tmp_path):
+    assert VectorIndex(tmp_path).search(_vectors(2), k=3) == [[], []]
+
+
+def test_ivf_trains_past_threshold_and_keeps_recall(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index, "IVF_MIN_ROWS", 500)
+    monkeypatch.setattr(vector_index, "IVF_SAMPLE", 400)
+
+    # Clustered data, like real topics
+    rng = np.random.RandomState(0)
+    centers = rng.randn(20, DIM) * 4
+    vectors = (centers[rng.randint(0, 20, 1000)] + rng.randn(1000, DIM)).astype(np.float32)
+
+    index = VectorIndex(tmp_path)
+    _add(index, vectors[:400])
+    assert index.centroids is None
+    _add(index, vectors[400:], start=400)
+    assert index.centroids is not None
+    assert (tmp_path / "lists.i32").stat().st_size == 4 * 1000
+
+    queries = vectors[::50] + 0.05 * rng.randn(20, DIM).astype(np.float32)
+    expected = _brute_force(vectors, queries / np.linalg.norm(queries, axis=1, keepdims=True), 5)
+    hits = VectorIndex(tmp_path).search(queries, k=5, nprobe=8)
+
+    found = sum(
+        len({hit['id'] for hit in query_hits} & {f"item-{row}" for row in rows})
+        for query_hits, rows in zip(hits, expected)
+    )
+    assert found / expected.size >= 0.9
+
+    # Rows added after training are assigned to lists and findable
+    _add(index, vectors[:1] + 100.0, start=1000)
+    assert index.search(vectors[:1] + 100.0, k=1)[0][0]['id'] == 'item-1000'
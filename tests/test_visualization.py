@@ -0,0 +1,45 @@
+"""
+Charts build from pipeline signal dicts and a failing chart never fails
+the post
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("plotly")
+
+from visualization import IntelligenceVisualizer
+
+
+def _signals():
+    return [
+        {'source': 'hackernews', 'title': 'a', 'timestamp': datetime(2026, 10, 19, 9, 15),
+         'engagement': {'points': 10, 'comments': 4}},
+        {'source': 'reddit', 'title': 'b', 'timestamp': datetime(2026, 10, 19, 9, 45),
+         'engagement': {'score': 6, 'flair': 'News'}},
+        {'source': 'searxng', 'title': 'c', 'timestamp': datetime(2026, 10, 19, 11, 5),
+         'engagement': {}},
+    ]
+
+
+def test_engagement_timeline_reads_dict_signals():
+    fig = IntelligenceVisualizer().create_engagement_timeline(_signals())
+
+    bars, line = fig.data
+    assert list(bars.y) == [2, 1]
+    assert list(line.y) == [20, 0]
+
+
+def test_visualization_failure_degrades_to_no_charts(tmp_path, monkeypatch):
+    pytest.importorskip("pytz")
+    import generate_intelligence_blog
+
+    def broken(self, data, output_dir):
+        raise RuntimeError("kaleido exploded")
+
+    monkeypatch.setattr(IntelligenceVisualizer, "save_all_visualizations", broken)
+    generator = generate_intelligence_blog.IntelligenceBlogGenerator("test-key", output_root=tmp_path)
+
+    assert asyncio.run(generator._create_visualizations({'signals': _signals()})) == {}